@@ -0,0 +1 @@
+"""Benchmarks for the velocityai runtime; see ``python -m benchmarks --help``."""
@@ -0,0 +1,63 @@
+"""Run the micro-benchmark suite.
+
+Run from the repository root:
+
+    python -m benchmarks [-k registry] [--json results.json]
+                         [--baseline baseline.json] [--threshold 0.2]
+
+Times are medians in microseconds per operation. With ``--baseline`` each
+case is compared with the stored results and the run exits with status 1
+if any is more than ``--threshold`` slower, so CI can catch regressions.
+Save a baseline with ``--json`` on the reference machine; timings from
+different machines are not comparable.
+"""
+import argparse
+import sys
+
+from benchmarks import bench_agent, bench_tools  # noqa: F401 - registers benchmarks
+from benchmarks.harness import SUITE, compare, format_comparison, format_result, load, run, save
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose name contains this")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="Minimum seconds per round; calls per round are calibrated to it")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Compare with results previously written by --json")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline (0.2 = 20%%)")
+    parser.add_argument("--list", action="store_true", help="List cases and exit")
+    args = parser.parse_args()
+    
+    names = [name for bench in SUITE.benchmarks for name, _ in bench.cases()]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    width = max(len(name) for name in names)
+    baseline = load(args.baseline) if args.baseline else None
+    
+    results = run(
+        SUITE.benchmarks,
+        rounds=args.rounds,
+        min_time=args.min_time,
+        pattern=args.pattern,
+        progress=lambda result: print(format_result(result, width), flush=True)
+    )
+    if args.json:
+        save(args.json, results)
+    
+    if baseline is None:
+        return 0
+    comparisons = compare(results, baseline, args.threshold)
+    print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+    for comparison in comparisons:
+        print(format_comparison(comparison, width))
+    regressions = [comparison.name for comparison in comparisons if comparison.regressed]
+    if regressions:
+        print(f"FAIL: {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
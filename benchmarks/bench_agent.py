@@ -0,0 +1,85 @@
+"""Agent loop iterations, prompt rendering and step serialization."""
+import json
+import logging
+from typing import Iterator, Tuple
+
+from benchmarks.fakes import ScriptedLLM, lookup, make_tools
+from benchmarks.harness import Operation, benchmark
+from velocityai import Agent, FunctionTool, Task, ToolSet
+from velocityai.core.steps import Action
+from velocityai.observability import InMemoryCollector, Tracer, set_tracer
+from velocityai.utils.serialization import dumps
+
+STEPS = 50
+
+OBSERVATION = {
+    "type": "observation",
+    "content": [{"tool": "lookup", "result": "x" * 200}] * 4
+}
+
+@benchmark("agent.iteration", params=["speculative", "sequential"])
+def agent_iteration(mode: str) -> Tuple[Operation, int]:
+    """One LLM reply and two tool calls per iteration, against an instant LLM."""
+    return _agent_run(Agent(ScriptedLLM(STEPS), speculative_tools=mode == "speculative"))
+
+@benchmark("agent.iteration.traced", params=[1.0, 0.01])
+def agent_iteration_traced(sample_rate: float) -> Iterator[Tuple[Operation, int]]:
+    """As agent.iteration, with traces sampled at the given rate into memory."""
+    previous = set_tracer(Tracer(InMemoryCollector(maxlen=10000), sample_rate, seed=0))
+    try:
+        yield _agent_run(Agent(ScriptedLLM(STEPS)))
+    finally:
+        set_tracer(previous)
+
+def _agent_run(agent: Agent) -> Tuple[Operation, int]:
+    tools = ToolSet([FunctionTool(lookup, side_effect_free=True)])
+    
+    async def run() -> None:
+        await agent.execute_task(Task("benchmark", tools=tools, max_iterations=STEPS + 1))
+    return run, STEPS + 1
+
+@benchmark("prompt.task", params=[10, 100])
+def prompt_task(count: int) -> Operation:
+    task = Task("Summarize the weather for the week", tools=make_tools(count))
+    tools = task.relevant_tools(20)
+    tools.prompt
+    return lambda: task.to_prompt(tools)
+
+@benchmark("prompt.system", params=["toolset", "list"])
+def prompt_system(kind: str) -> Operation:
+    llm = ScriptedLLM(0)
+    tools = make_tools(20)
+    if kind == "toolset":
+        tools = ToolSet(tools)
+    return lambda: llm.get_system_prompt("Assistant", tools)
+
+@benchmark("steps.parse_action")
+def parse_action() -> Operation:
+    step = {"tool": "lookup", "parameters": {"query": "alpha", "limit": 3}}
+    return lambda: Action.from_dict(step)
+
+@benchmark("steps.dumps_observation")
+def dumps_observation() -> Operation:
+    return lambda: dumps(OBSERVATION)
+
+@benchmark("steps.json_dumps_observation")
+def json_dumps_observation() -> Operation:
+    return lambda: json.dumps(OBSERVATION)
+
+@benchmark("react.step")
+def react_step() -> Iterator[Operation]:
+    """One ReActAgent.run step from the repository root, with its logging silenced.
+    
+    Only the first (planning) step is timed: later steps call reasoning
+    helpers react_agent.py does not define yet.
+    """
+    from react_agent import ReActAgent
+    
+    context = {"initial_query": "benchmark", "objective": "benchmark"}
+    logger = logging.getLogger("react_agent")
+    level = logger.level
+    logger.setLevel(logging.CRITICAL)
+    try:
+        yield lambda: ReActAgent().run(context, max_steps=1)
+    finally:
+        logger.setLevel(level)
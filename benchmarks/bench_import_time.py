@@ -0,0 +1,85 @@
+"""Measure cold import time of velocityai modules in fresh interpreters.
+
+Run from the repository root:
+
+    python benchmarks/bench_import_time.py [--repeat 5] [--budget-ms 50]
+
+Exits with status 1 if ``import velocityai`` takes longer than the budget or
+loads any heavy dependency that should only load on first use, so it can
+guard against import-time regressions in CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+MODULES = [
+    "velocityai",
+    "velocityai.llms",
+    "velocityai.llms.gemini",
+    "velocityai.core.agent"
+]
+
+# Modules that importing these must not pull in
+LAZY_DEPENDENCIES = {
+    "velocityai": ["google.generativeai", "aiohttp", "pydantic", "velocityai.core.agent"],
+    "velocityai.llms": ["google.generativeai", "aiohttp"],
+    "velocityai.llms.gemini": ["google.generativeai", "aiohttp"]
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": sorted(sys.modules)}}))
+"""
+
+def measure(module: str, repeat: int) -> Tuple[float, List[str]]:
+    """Best-of-repeat import time in milliseconds, and the modules loaded."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    best = float("inf")
+    loaded: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            capture_output=True, text=True, check=True, env=env
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best = min(best, result["ms"])
+        loaded = result["loaded"]
+    return best, loaded
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="Maximum time for 'import velocityai'")
+    args = parser.parse_args()
+    
+    failures: List[str] = []
+    timings: Dict[str, float] = {}
+    for module in MODULES:
+        ms, loaded = measure(module, args.repeat)
+        timings[module] = ms
+        eager = [dep for dep in LAZY_DEPENDENCIES.get(module, []) if dep in loaded]
+        if eager:
+            failures.append(f"import {module} loads {', '.join(eager)}")
+    
+    width = max(len(module) for module in MODULES)
+    for module, ms in timings.items():
+        print(f"import {module:<{width}}  {ms:8.1f} ms")
+    
+    if timings["velocityai"] > args.budget_ms:
+        failures.append(
+            f"import velocityai took {timings['velocityai']:.1f} ms (budget {args.budget_ms} ms)"
+        )
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Measure the framework's per-step overhead with no real LLM or tool work.
+
+Run from the repository root:
+
+    python benchmarks/bench_step_overhead.py
+"""
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from velocityai import Agent, BaseLLM, FunctionTool, Task
+from velocityai.tools.schema import ToolResult, ToolResultModel
+from velocityai.utils.serialization import dumps, orjson
+
+ACTION = json.dumps({
+    "type": "action",
+    "content": [
+        {"tool": "lookup", "parameters": {"query": "alpha", "limit": 3}},
+        {"tool": "lookup", "parameters": {"query": "beta", "limit": 3}}
+    ]
+})
+OUTPUT = json.dumps({"type": "output", "content": "done"})
+
+def lookup(query: str, limit: int = 3) -> str:
+    """Look something up."""
+    return query
+
+class ScriptedLLM(BaseLLM):
+    """Replies with the same action for a fixed number of steps, then finishes."""
+    
+    def __init__(self, steps: int):
+        super().__init__()
+        self.steps = steps
+        self.calls = 0
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        return OUTPUT
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        self.calls += 1
+        return ACTION if self.calls <= self.steps else OUTPUT
+    
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        yield await self.chat(messages, **kwargs)
+
+def timeit(func: Callable[[], Any], number: int) -> float:
+    """Mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1e6
+
+async def atimeit(func: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        await func()
+    return (time.perf_counter() - start) / number * 1e6
+
+async def agent_step_us(steps: int) -> float:
+    """Mean microseconds per agent iteration, each running two tool calls."""
+    tool = FunctionTool(lookup, side_effect_free=True)
+    agent = Agent(ScriptedLLM(steps))
+    task = Task("benchmark", tools=[tool], max_iterations=steps + 1)
+    start = time.perf_counter()
+    await agent.execute_task(task)
+    return (time.perf_counter() - start) / (steps + 1) * 1e6
+
+async def main() -> None:
+    observation = {
+        "type": "observation",
+        "content": [{"tool": "lookup", "result": "x" * 200}] * 4
+    }
+    tool = FunctionTool(lookup)
+    rows = [
+        ("ToolResult (slots)", timeit(lambda: ToolResult(True, "x", None, {"tool_name": "t"}), 200000)),
+        ("ToolResultModel (pydantic)", timeit(
+            lambda: ToolResultModel(success=True, result="x", metadata={"tool_name": "t"}), 200000
+        )),
+        ("json.dumps observation", timeit(lambda: json.dumps(observation), 50000)),
+        ("dumps observation" + (" (orjson)" if orjson else ""), timeit(lambda: dumps(observation), 50000)),
+        ("FunctionTool call", await atimeit(lambda: tool(query="q"), 20000)),
+        ("FunctionTool construction", timeit(lambda: FunctionTool(lookup), 20000)),
+        ("Agent step (2 tool calls)", await agent_step_us(2000))
+    ]
+    width = max(len(name) for name, _ in rows)
+    for name, micros in rows:
+        print(f"{name:<{width}}  {micros:10.2f} us")
+
+if __name__ == "__main__":
+    asyncio.run(main())
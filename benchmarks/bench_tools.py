@@ -0,0 +1,99 @@
+"""Tool dispatch, results, metadata extraction and lookups."""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple, Type
+
+from benchmarks.fakes import TOPICS, EchoTool, lookup, make_tools
+from benchmarks.harness import Operation, benchmark
+from velocityai import FunctionTool, ToolRegistry, ToolSet
+from velocityai.tools import base
+from velocityai.tools.index import ToolIndex
+from velocityai.tools.schema import ToolResult, ToolResultModel
+
+SIZES = [10, 1000, 100000]
+
+QUERY = "check the weather forecast"
+
+@benchmark("tools.call.function")
+def call_function() -> Operation:
+    tool = FunctionTool(lookup)
+    return lambda: tool(query="q")
+
+@benchmark("tools.call.class")
+def call_class() -> Operation:
+    tool = EchoTool()
+    return lambda: tool(text="q")
+
+@benchmark("tools.call.cached")
+def call_cached() -> Operation:
+    tool = FunctionTool(lookup, name="cached_lookup", cacheable=True)
+    return lambda: tool(query="q")
+
+@benchmark("tools.result.slots")
+def result_slots() -> Operation:
+    return lambda: ToolResult(True, "x", None, {"tool_name": "t"})
+
+@benchmark("tools.result.pydantic")
+def result_pydantic() -> Operation:
+    return lambda: ToolResultModel(success=True, result="x", metadata={"tool_name": "t"})
+
+@benchmark("tools.metadata.extract")
+def metadata_extract() -> Operation:
+    def extract() -> None:
+        base._metadata_cache.clear()
+        EchoTool.class_metadata()
+    return extract
+
+@benchmark("tools.metadata.cached")
+def metadata_cached() -> Operation:
+    return lambda: EchoTool.class_metadata()
+
+@benchmark("tools.function_tool.construct")
+def function_tool_construct() -> Operation:
+    return lambda: FunctionTool(lookup)
+
+def _tool_classes(count: int) -> List[Tuple[str, Type[EchoTool]]]:
+    return [
+        (f"{TOPICS[i % len(TOPICS)]}_tool_{i}", type(f"Tool{i}", (EchoTool,), {
+            "__doc__": f"Handle {TOPICS[i % len(TOPICS)]} requests, variant {i}."
+        }))
+        for i in range(count)
+    ]
+
+def _swap_registry(tools: Dict[str, Any], categories: Dict[str, List[str]], index: ToolIndex) -> Tuple[Any, ...]:
+    previous = (ToolRegistry._tools, ToolRegistry._categories, ToolRegistry._index)
+    ToolRegistry._tools, ToolRegistry._categories, ToolRegistry._index = tools, categories, index
+    return previous
+
+@contextmanager
+def _registry(size: int) -> Iterator[None]:
+    """Fill a fresh registry for the duration of a benchmark, then restore the real one."""
+    previous = _swap_registry({}, {}, ToolIndex())
+    try:
+        for name, cls in _tool_classes(size):
+            ToolRegistry.register(cls, name=name, category=name.split("_", 1)[0])
+        yield
+    finally:
+        _swap_registry(*previous)
+
+@benchmark("registry.get_tool", params=SIZES)
+def registry_get_tool(size: int) -> Iterator[Operation]:
+    name = f"{TOPICS[(size // 2) % len(TOPICS)]}_tool_{size // 2}"
+    with _registry(size):
+        yield lambda: ToolRegistry.get_tool(name)
+
+@benchmark("registry.search", params=SIZES)
+def registry_search(size: int) -> Iterator[Operation]:
+    with _registry(size):
+        yield lambda: ToolRegistry.search(QUERY, 10)
+
+@benchmark("toolset.get", params=SIZES)
+def toolset_get(size: int) -> Operation:
+    tools = ToolSet(make_tools(size))
+    name = tools[size // 2].metadata.name
+    return lambda: tools.get(name)
+
+@benchmark("toolset.select", params=SIZES)
+def toolset_select(size: int) -> Operation:
+    tools = ToolSet(make_tools(size))
+    tools.index
+    return lambda: tools.select(QUERY, 20)
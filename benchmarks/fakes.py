@@ -0,0 +1,55 @@
+"""Instant LLM and tools, so benchmarks time the framework alone."""
+import json
+from typing import AsyncIterator, Dict, List
+
+from velocityai import BaseLLM, BaseTool, FunctionTool
+
+ACTION = json.dumps({
+    "type": "action",
+    "content": [
+        {"tool": "lookup", "parameters": {"query": "alpha", "limit": 3}},
+        {"tool": "lookup", "parameters": {"query": "beta", "limit": 3}}
+    ]
+})
+OUTPUT = json.dumps({"type": "output", "content": "done"})
+
+TOPICS = ["weather", "stocks", "email", "calendar", "files", "search", "math", "maps", "news", "translate"]
+
+class ScriptedLLM(BaseLLM):
+    """Replies with the same action for ``steps`` calls, then finishes, and repeats."""
+    
+    def __init__(self, steps: int):
+        super().__init__(steps=steps)
+        self.steps = steps
+        self.calls = 0
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        return OUTPUT
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        self.calls += 1
+        return ACTION if self.calls % (self.steps + 1) else OUTPUT
+    
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        yield await self.chat(messages, **kwargs)
+
+def lookup(query: str, limit: int = 3) -> str:
+    """Look something up."""
+    return query
+
+class EchoTool(BaseTool):
+    """Return the text it is given."""
+    
+    async def execute(self, text: str) -> str:
+        return text
+
+def make_tools(count: int) -> List[FunctionTool]:
+    """Distinctly named and described tools sharing one function."""
+    return [
+        FunctionTool(
+            lookup,
+            name=f"{TOPICS[i % len(TOPICS)]}_tool_{i}",
+            description=f"Look up {TOPICS[i % len(TOPICS)]} data, variant {i}."
+        )
+        for i in range(count)
+    ]
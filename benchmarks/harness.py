@@ -0,0 +1,227 @@
+"""Registration, timing, JSON results and baseline comparison for the suite."""
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+RESULTS_VERSION = 1
+
+# A benchmark setup returns (or yields, to run teardown afterwards) the
+# operation to time, optionally paired with the number of inner operations
+# one call performs so results are reported per inner operation
+Operation = Callable[[], Any]
+Case = Union[Operation, Tuple[Operation, int]]
+
+@dataclass
+class Benchmark:
+    """A named, optionally parametrized operation to time."""
+    name: str
+    setup: Callable[..., Any]
+    group: str
+    params: Sequence[Any] = (None,)
+    
+    def cases(self) -> Iterator[Tuple[str, Any]]:
+        for param in self.params:
+            yield (self.name if param is None else f"{self.name}[{param}]"), param
+
+@dataclass
+class Result:
+    """Timings of one benchmark case in microseconds per operation."""
+    name: str
+    group: str
+    number: int
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "group": self.group,
+            "unit": "us",
+            "number": self.number,
+            "rounds": self.rounds,
+            "min": self.min,
+            "median": self.median,
+            "mean": self.mean,
+            "stdev": self.stdev
+        }
+
+@dataclass
+class Comparison:
+    """A case's median against the baseline's; ratio > 1 means slower."""
+    name: str
+    baseline: float
+    current: float
+    ratio: float
+    regressed: bool
+
+@dataclass
+class Suite:
+    benchmarks: List[Benchmark] = field(default_factory=list)
+    
+    def add(self, benchmark: Benchmark) -> None:
+        if any(existing.name == benchmark.name for existing in self.benchmarks):
+            raise ValueError(f"Benchmark {benchmark.name!r} is already registered")
+        self.benchmarks.append(benchmark)
+
+SUITE = Suite()
+
+def benchmark(name: str, params: Optional[Sequence[Any]] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register a benchmark setup function.
+    
+    The setup is called once per case (with the parameter, if ``params`` is
+    given) and returns or yields the operation to time. Operations returning
+    awaitables are awaited inside an event loop. The group is taken from the
+    module name.
+    """
+    def decorator(setup: Callable[..., Any]) -> Callable[..., Any]:
+        group = setup.__module__.rsplit(".", 1)[-1].replace("bench_", "")
+        SUITE.add(Benchmark(name, setup, group, tuple(params) if params else (None,)))
+        return setup
+    return decorator
+
+def _time_sync(operation: Operation, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        operation()
+    return time.perf_counter() - start
+
+async def _time_async(operation: Operation, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        await operation()
+    return time.perf_counter() - start
+
+def _timer(operation: Operation, loop: asyncio.AbstractEventLoop) -> Callable[[int], float]:
+    # One warm-up call tells whether the operation returns something to await
+    result = operation()
+    if inspect.isawaitable(result):
+        loop.run_until_complete(result)
+        return lambda number: loop.run_until_complete(_time_async(operation, number))
+    return lambda number: _time_sync(operation, number)
+
+def _calibrate(timer: Callable[[int], float], min_time: float) -> int:
+    """Smallest number of calls, in 1-2-5 steps, taking at least min_time."""
+    number = 1
+    while True:
+        for multiple in (1, 2, 5):
+            if timer(number * multiple) >= min_time:
+                return number * multiple
+        number *= 10
+
+def run_case(benchmark: Benchmark, name: str, param: Any, rounds: int, min_time: float) -> Result:
+    setup_args = () if param is None else (param,)
+    produced = benchmark.setup(*setup_args)
+    generator = produced if inspect.isgenerator(produced) else None
+    case = next(generator) if generator else produced
+    operation, inner = case if isinstance(case, tuple) else (case, 1)
+    
+    loop = asyncio.new_event_loop()
+    try:
+        timer = _timer(operation, loop)
+        number = _calibrate(timer, min_time)
+        samples = [timer(number) / (number * inner) * 1e6 for _ in range(rounds)]
+    finally:
+        if generator:
+            generator.close()
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+    return Result(
+        name=name,
+        group=benchmark.group,
+        number=number,
+        rounds=rounds,
+        min=min(samples),
+        median=statistics.median(samples),
+        mean=statistics.mean(samples),
+        stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0
+    )
+
+def run(
+    benchmarks: Sequence[Benchmark],
+    rounds: int = 5,
+    min_time: float = 0.1,
+    pattern: Optional[str] = None,
+    progress: Optional[Callable[[Result], None]] = None
+) -> List[Result]:
+    """Run every case whose name contains pattern."""
+    results = []
+    for bench in benchmarks:
+        for name, param in bench.cases():
+            if pattern and pattern not in name:
+                continue
+            result = run_case(bench, name, param, rounds, min_time)
+            results.append(result)
+            if progress:
+                progress(result)
+    return results
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor()
+    }
+
+def to_json(results: Sequence[Result]) -> Dict[str, Any]:
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": environment(),
+        "results": {result.name: result.to_dict() for result in results}
+    }
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    if document.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a version {RESULTS_VERSION} benchmark results file")
+    return document
+
+def save(path: str, results: Sequence[Result]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_json(results), f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def compare(results: Sequence[Result], baseline: Dict[str, Any], threshold: float) -> List[Comparison]:
+    """Compare medians with a baseline document; cases missing from it are skipped.
+    
+    A case regresses when it is more than ``threshold`` (0.1 = 10%) slower.
+    """
+    previous = baseline["results"]
+    comparisons = []
+    for result in results:
+        entry = previous.get(result.name)
+        if not entry or entry["median"] <= 0:
+            continue
+        ratio = result.median / entry["median"]
+        comparisons.append(Comparison(
+            name=result.name,
+            baseline=entry["median"],
+            current=result.median,
+            ratio=ratio,
+            regressed=ratio > 1 + threshold
+        ))
+    return comparisons
+
+def format_result(result: Result, width: int) -> str:
+    return (
+        f"{result.name:<{width}}  {result.median:12.3f} us"
+        f"  (min {result.min:.3f}, stdev {result.stdev:.3f}, n={result.number}x{result.rounds})"
+    )
+
+def format_comparison(comparison: Comparison, width: int) -> str:
+    change = (comparison.ratio - 1) * 100
+    flag = "  REGRESSION" if comparison.regressed else ""
+    return (
+        f"{comparison.name:<{width}}  {comparison.baseline:12.3f} -> {comparison.current:12.3f} us"
+        f"  {change:+7.1f}%{flag}"
+    )
@@ -0,0 +1,362 @@
+"""Open-loop load test of the agent runtime against a simulated LLM.
+
+Run from the repository root:
+
+    python -m benchmarks.loadtest --rate 50 --duration 30
+    python -m benchmarks.loadtest --ramp 10:200:10 --step-duration 10 --json load.json
+
+Tasks arrive on a schedule that does not wait for earlier tasks to finish,
+Poisson by default, and each runs through ``velocityai.run`` against a
+MockLLM. When the process cannot keep up, the extra time shows up as
+queueing delay and latency instead of a lower offered rate. Latency is
+measured from each task's scheduled arrival. Everything runs offline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from benchmarks.fakes import ACTION, OUTPUT
+from velocityai import FunctionTool, run
+from velocityai.llms import MockLLM
+from velocityai.llms.mock import lognormal
+from velocityai.utils.stats import percentile
+
+# (requests per second, seconds) for each phase of the schedule
+Phase = Tuple[float, float]
+
+@dataclass
+class TaskRecord:
+    """One task, with times in seconds from the start of the test."""
+    arrival: float
+    queue_delay: float
+    latency: float
+    finished: float
+    ok: bool
+
+@dataclass
+class Sample:
+    """Process state sampled at a point in time."""
+    time: float
+    loop_lag: float
+    in_flight: int
+    rss_mb: float
+
+@dataclass
+class Window:
+    """Figures for one step of a ramp, or one window of a constant-rate test."""
+    start: float
+    end: float
+    offered_rate: float
+    throughput: float
+    arrived: int
+    completed: int
+    errors: int
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    queue_p50: float
+    queue_p99: float
+    loop_lag_p99: float
+    loop_lag_max: float
+    in_flight: int
+    rss_mb: float
+
+def arrivals(phases: Sequence[Phase], poisson: bool = True, seed: Optional[int] = None) -> List[float]:
+    """Arrival times in seconds for consecutive phases of constant rate."""
+    rng = random.Random(seed)
+    times: List[float] = []
+    phase_start = 0.0
+    for rate, duration in phases:
+        phase_end = phase_start + duration
+        if rate > 0:
+            t = phase_start
+            while True:
+                t += rng.expovariate(rate) if poisson else 1.0 / rate
+                if t >= phase_end:
+                    break
+                times.append(t)
+        phase_start = phase_end
+    return times
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (peak size where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def scripted_replies(steps: int):
+    """Reply with a two-tool action until a task has taken ``steps`` steps, then finish."""
+    def reply(request: Union[str, List[Dict[str, str]]]) -> str:
+        if isinstance(request, str):
+            return OUTPUT
+        taken = sum(1 for message in request if message["role"] == "assistant")
+        return ACTION if taken < steps else OUTPUT
+    return reply
+
+def make_tool(latency: float) -> FunctionTool:
+    async def lookup(query: str, limit: int = 3) -> str:
+        """Look something up."""
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return query * limit
+    return FunctionTool(lookup, side_effect_free=True)
+
+class LoadTest:
+    """Run tasks on an arrival schedule and record what happens to each."""
+    
+    def __init__(
+        self,
+        llm: MockLLM,
+        tools: List[FunctionTool],
+        schedule: Sequence[float],
+        max_iterations: int,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        sample_interval: float = 0.1
+    ):
+        self.llm = llm
+        self.tools = tools
+        self.schedule = schedule
+        self.max_iterations = max_iterations
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.sample_interval = sample_interval
+        self.records: List[TaskRecord] = []
+        self.samples: List[Sample] = []
+        self._in_flight = 0
+        self._start = 0.0
+    
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._start = loop.time()
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        sampler = asyncio.ensure_future(self._sample())
+        pending = set()
+        try:
+            for arrival in self.schedule:
+                delay = self._start + arrival - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                task = asyncio.ensure_future(self._one(arrival, semaphore))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            sampler.cancel()
+    
+    async def _one(self, arrival: float, semaphore: Optional[asyncio.Semaphore]) -> None:
+        loop = asyncio.get_running_loop()
+        if semaphore is not None:
+            await semaphore.acquire()
+        started = loop.time() - self._start
+        self._in_flight += 1
+        ok = False
+        try:
+            result = await asyncio.wait_for(
+                run(self.llm, "Look up alpha and beta", tools=self.tools, max_iterations=self.max_iterations),
+                self.timeout
+            )
+            ok = result.get("type") != "error"
+        except Exception:
+            pass
+        finally:
+            self._in_flight -= 1
+            if semaphore is not None:
+                semaphore.release()
+        finished = loop.time() - self._start
+        self.records.append(TaskRecord(arrival, started - arrival, finished - arrival, finished, ok))
+    
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.sample_interval)
+            now = loop.time()
+            self.samples.append(Sample(
+                time=now - self._start,
+                loop_lag=max(0.0, now - before - self.sample_interval),
+                in_flight=self._in_flight,
+                rss_mb=rss_mb()
+            ))
+    
+    def windows(self, bounds: Sequence[Tuple[float, float]]) -> List[Window]:
+        """Summarize tasks by arrival time and samples by time within each window."""
+        result = []
+        for start, end in bounds:
+            length = end - start
+            arrived = [r for r in self.records if start <= r.arrival < end]
+            completed = sum(1 for r in self.records if start <= r.finished < end)
+            latencies = sorted(r.latency for r in arrived)
+            queued = sorted(r.queue_delay for r in arrived)
+            # A stalled loop samples late; a sample covers every window its wait overlaps
+            samples = [
+                s for s in self.samples
+                if s.time >= start and s.time - s.loop_lag - self.sample_interval < end
+            ]
+            lags = sorted(s.loop_lag for s in samples)
+            inside = [s for s in samples if s.time < end]
+            last = inside[-1] if inside else (samples[0] if samples else None)
+            result.append(Window(
+                start=start,
+                end=end,
+                offered_rate=len(arrived) / length,
+                throughput=completed / length,
+                arrived=len(arrived),
+                completed=completed,
+                errors=sum(1 for r in arrived if not r.ok),
+                latency_p50=percentile(latencies, 50),
+                latency_p95=percentile(latencies, 95),
+                latency_p99=percentile(latencies, 99),
+                queue_p50=percentile(queued, 50),
+                queue_p99=percentile(queued, 99),
+                loop_lag_p99=percentile(lags, 99),
+                loop_lag_max=lags[-1] if lags else 0.0,
+                in_flight=last.in_flight if last else 0,
+                rss_mb=last.rss_mb if last else rss_mb()
+            ))
+        return result
+
+def sustained(windows: Sequence[Window], max_queue: float, slo_p99: Optional[float]) -> Optional[float]:
+    """Highest offered rate of a window that kept up.
+    
+    A window keeps up when none of its tasks failed, their p99 queueing
+    delay stayed within max_queue and, if given, p99 latency within slo_p99.
+    """
+    best = None
+    for window in windows:
+        if window.arrived == 0 or window.errors or window.queue_p99 > max_queue:
+            continue
+        if slo_p99 is not None and window.latency_p99 > slo_p99:
+            continue
+        best = max(best or 0.0, window.offered_rate)
+    return best
+
+def parse_ramp(text: str) -> Tuple[float, float, float]:
+    try:
+        start, stop, step = (float(part) for part in text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("ramp must be START:STOP:STEP in requests per second")
+    if start < 0 or stop < start or step <= 0:
+        raise argparse.ArgumentTypeError("ramp needs 0 <= START <= STOP and STEP > 0")
+    return start, stop, step
+
+def phases_for(args: argparse.Namespace) -> List[Phase]:
+    if args.ramp is None:
+        return [(args.rate, args.duration)]
+    start, stop, step = args.ramp
+    count = int(round((stop - start) / step)) + 1
+    return [(start + i * step, args.step_duration) for i in range(count)]
+
+def window_bounds(phases: Sequence[Phase], window: float, ramp: bool) -> List[Tuple[float, float]]:
+    if ramp:
+        bounds = []
+        start = 0.0
+        for _, duration in phases:
+            bounds.append((start, start + duration))
+            start += duration
+        return bounds
+    total = sum(duration for _, duration in phases)
+    count = max(1, int(round(total / window)))
+    return [(total * i / count, total * (i + 1) / count) for i in range(count)]
+
+def print_report(windows: Sequence[Window], records: Sequence[TaskRecord], best: Optional[float]) -> None:
+    header = (
+        f"{'window':>13} {'offered/s':>9} {'done/s':>8} {'err':>5} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7}"
+        f" {'queue p99':>9} {'lag p99 ms':>10} {'lag max ms':>10} {'in flight':>9} {'rss MiB':>8}"
+    )
+    print(header)
+    for w in windows:
+        print(
+            f"{w.start:6.0f}-{w.end:<6.0f} {w.offered_rate:9.1f} {w.throughput:8.1f} {w.errors:5d}"
+            f" {w.latency_p50:7.3f} {w.latency_p95:7.3f} {w.latency_p99:7.3f} {w.queue_p99:9.3f}"
+            f" {w.loop_lag_p99 * 1000:10.1f} {w.loop_lag_max * 1000:10.1f} {w.in_flight:9d} {w.rss_mb:8.1f}"
+        )
+    latencies = sorted(r.latency for r in records)
+    failed = sum(1 for r in records if not r.ok)
+    print(
+        f"\n{len(records)} tasks, {failed} failed; latency p50 {percentile(latencies, 50):.3f}s"
+        f" p95 {percentile(latencies, 95):.3f}s p99 {percentile(latencies, 99):.3f}s"
+    )
+    print("Highest sustained rate: " + ("none" if best is None else f"{best:.1f}/s"))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__.splitlines()[0])
+    load = parser.add_argument_group("arrivals")
+    load.add_argument("--rate", type=float, default=20.0, help="Tasks per second for a constant-rate test")
+    load.add_argument("--duration", type=float, default=30.0, help="Seconds of a constant-rate test")
+    load.add_argument("--ramp", type=parse_ramp, help="Step the rate START:STOP:STEP instead")
+    load.add_argument("--step-duration", type=float, default=10.0, help="Seconds per ramp step")
+    load.add_argument("--arrivals", choices=["poisson", "uniform"], default="poisson")
+    load.add_argument("--max-concurrency", type=int, help="Cap tasks in flight; the rest queue")
+    load.add_argument("--timeout", type=float, help="Per-task timeout in seconds")
+    llm = parser.add_argument_group("simulated LLM and tools")
+    llm.add_argument("--first-token-ms", type=float, default=300.0, help="Median time to first token")
+    llm.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal spread of that time")
+    llm.add_argument("--tokens-per-second", type=float, default=100.0, help="Streaming rate; 0 for instant")
+    llm.add_argument("--failure-rate", type=float, default=0.0, help="Share of LLM calls that fail")
+    llm.add_argument("--steps", type=int, default=2, help="Tool steps per task before the final answer")
+    llm.add_argument("--tool-ms", type=float, default=20.0, help="Latency of each tool call")
+    report = parser.add_argument_group("report")
+    report.add_argument("--window", type=float, default=5.0, help="Report window for constant-rate tests")
+    report.add_argument("--max-queue", type=float, default=0.1,
+                        help="p99 queueing delay in seconds a sustained window must stay within")
+    report.add_argument("--slo-p99", type=float, help="p99 latency in seconds a sustained window must meet")
+    report.add_argument("--json", help="Write windows, samples and task records to this file")
+    report.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    phases = phases_for(args)
+    schedule = arrivals(phases, poisson=args.arrivals == "poisson", seed=args.seed)
+    mock = MockLLM(
+        scripted_replies(args.steps),
+        first_token_latency=lognormal(args.first_token_ms / 1000, args.latency_sigma) if args.first_token_ms else None,
+        tokens_per_second=args.tokens_per_second or None,
+        failure_rate=args.failure_rate,
+        seed=args.seed
+    )
+    test = LoadTest(
+        mock,
+        [make_tool(args.tool_ms / 1000)],
+        schedule,
+        max_iterations=args.steps + 2,
+        max_concurrency=args.max_concurrency,
+        timeout=args.timeout
+    )
+    
+    total = sum(duration for _, duration in phases)
+    print(f"{len(schedule)} tasks over {total:.0f}s", file=sys.stderr)
+    started = time.perf_counter()
+    asyncio.run(test.run())
+    print(f"finished in {time.perf_counter() - started:.1f}s\n", file=sys.stderr)
+    
+    windows = test.windows(window_bounds(phases, args.window, args.ramp is not None))
+    best = sustained(windows, args.max_queue, args.slo_p99)
+    print_report(windows, test.records, best)
+    
+    if args.json:
+        document: Dict[str, Any] = {
+            "config": {key: value for key, value in vars(args).items() if key != "json"},
+            "sustained_rate": best,
+            "llm_calls": mock.stats.calls,
+            "windows": [asdict(window) for window in windows],
+            "samples": [asdict(sample) for sample in test.samples],
+            "tasks": [asdict(record) for record in test.records]
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
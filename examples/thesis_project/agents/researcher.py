@@ -1,7 +1,7 @@
+from typing import AsyncIterator
+
 from velocityai.core.agent import Agent
 from velocityai.llms.base import BaseLLM
-import asyncio
-import hashlib
 
 class ResearchAgent(Agent):
     """Example agent specialized in research and information gathering."""
@@ -12,18 +12,9 @@ class ResearchAgent(Agent):
             name="Research Assistant",
             description="Specialized in gathering and analyzing information for thesis research"
         )
-        self.cache = {}
-        
-    def _generate_cache_key(self, *args) -> str:
-        """Generate a unique cache key based on input arguments."""
-        return hashlib.md5("".join(args).encode()).hexdigest()
         
-    async def research_topic(self, topic: str) -> str:
+    async def research_topic(self, topic: str) -> AsyncIterator[str]:
         """Research a specific topic and provide findings."""
-        cache_key = self._generate_cache_key(topic)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-        
         prompt = f"""As a research assistant, please analyze the following topic:
 {topic}
 
@@ -35,16 +26,11 @@ Please provide:
 
 Structure your response clearly and concisely."""
         
-        async for response in self.llm.stream_generate_content(prompt):
-            self.cache[cache_key] = response
-            return response
+        async for chunk in self.llm.stream_generate_content(prompt):
+            yield chunk
     
-    async def analyze_findings(self, findings: str) -> str:
+    async def analyze_findings(self, findings: str) -> AsyncIterator[str]:
         """Analyze research findings and provide insights."""
-        cache_key = self._generate_cache_key(findings)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-        
         prompt = f"""Please analyze these research findings:
 {findings}
 
@@ -54,6 +40,5 @@ Provide:
 3. Areas needing further investigation
 4. Potential implications"""
         
-        async for response in self.llm.stream_generate_content(prompt):
-            self.cache[cache_key] = response
-            return response
\ No newline at end of file
+        async for chunk in self.llm.stream_generate_content(prompt):
+            yield chunk
\ No newline at end of file
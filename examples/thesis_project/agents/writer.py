@@ -1,6 +1,7 @@
+from typing import AsyncIterator
+
 from velocityai.core.agent import Agent
 from velocityai.llms.base import BaseLLM
-import hashlib
 
 class WriterAgent(Agent):
     """Example agent specialized in academic writing and thesis composition."""
@@ -11,17 +12,9 @@ class WriterAgent(Agent):
             name="Academic Writer",
             description="Specialized in academic writing and thesis composition"
         )
-        self.cache = {}
-    
-    def _generate_cache_key(self, *args) -> str:
-        """Generate a unique cache key based on input arguments."""
-        return hashlib.md5("".join(args).encode()).hexdigest()
     
-    async def outline_section(self, topic: str, research_findings: str) -> str:
+    async def outline_section(self, topic: str, research_findings: str) -> AsyncIterator[str]:
         """Create an outline for a thesis section."""
-        cache_key = self._generate_cache_key(topic, research_findings)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
         prompt = f"""Based on the following research findings:
 {research_findings}
 
@@ -38,16 +31,10 @@ Include:
             {"role": "user", "content": prompt}
         ]
         
-        response = await self.llm.chat(messages)
-        self.cache[cache_key] = response
-        return response
+        yield await self.llm.chat(messages)
     
-    async def write_section(self, outline: str) -> str:
+    async def write_section(self, outline: str) -> AsyncIterator[str]:
         """Write a thesis section based on an outline."""
-        cache_key = self._generate_cache_key(outline)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-        
         prompt = f"""Using this outline:
 {outline}
 
@@ -57,16 +44,11 @@ Please write a draft of this thesis section. Focus on:
 3. Proper paragraph structure
 4. Integration of research findings"""
         
-        async for response in self.llm.stream_generate_content(prompt):
-            self.cache[cache_key] = response
-            return response
+        async for chunk in self.llm.stream_generate_content(prompt):
+            yield chunk
     
-    async def review_and_edit(self, content: str) -> str:
+    async def review_and_edit(self, content: str) -> AsyncIterator[str]:
         """Review and edit written content."""
-        cache_key = self._generate_cache_key(content)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-        
         prompt = f"""Please review and improve this academic content:
 {content}
 
@@ -76,6 +58,5 @@ Focus on:
 3. Grammar and style
 4. Suggestions for improvement"""
         
-        async for response in self.llm.stream_generate_content(prompt):
-            self.cache[cache_key] = response
-            return response
\ No newline at end of file
+        async for chunk in self.llm.stream_generate_content(prompt):
+            yield chunk
\ No newline at end of file
@@ -11,6 +11,7 @@ if project_root not in os.environ.get("PYTHONPATH", "").split(os.pathsep):
     sys.path.append(project_root)
 
 from velocityai.llms.gemini import GeminiLLM
+from velocityai.llms.cache import CachedLLM, LLMCache
 from agents.researcher import ResearchAgent
 from agents.writer import WriterAgent
 
@@ -25,6 +26,9 @@ async def main():
         top_p=0.9
     )
     
+    # Share one response cache between agents and across runs
+    llm = CachedLLM(llm, LLMCache(path=".velocity_cache.db", ttl=7 * 24 * 3600))
+    
     # Create agents
     researcher = ResearchAgent(llm)
     writer = WriterAgent(llm)
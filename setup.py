@@ -7,7 +7,7 @@ setup(
     author="Your Name",
     author_email="your.email@example.com",
     url="https://github.com/yourusername/velocityai",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*", "benchmarks", "benchmarks.*"]),
     install_requires=[
         "google-generativeai>=0.3.0",
         "aiohttp>=3.8.0",
@@ -15,6 +15,10 @@ setup(
         "typing-extensions>=4.0.0",
         "python-dotenv>=0.19.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.6"],
+        "dev": ["pytest>=7.0"],
+    },
     python_requires=">=3.8",
     classifiers=[
         "Development Status :: 3 - Alpha",
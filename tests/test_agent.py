@@ -0,0 +1,163 @@
+import asyncio
+
+from velocityai.core.agent import Agent
+from velocityai.core.events import (
+    ErrorEvent, ObservationEvent, OutputEvent, TokenEvent, ToolEndEvent, ToolStartEvent
+)
+from velocityai.core.task import Task
+from velocityai.llms.mock import MockLLM
+
+OUTPUT = '{"type": "output", "content": "done"}'
+
+def echo(query: str) -> str:
+    """Return the query."""
+    return query
+
+def run_task(replies, tools=None, **agent_kwargs):
+    agent = Agent(llm=MockLLM(replies), **agent_kwargs)
+    return asyncio.run(agent.execute_task(Task("test task", tools=tools)))
+
+def collect_events(replies, tools=None, llm=None, **agent_kwargs):
+    agent = Agent(llm=llm or MockLLM(replies), **agent_kwargs)
+    
+    async def collect():
+        return [event async for event in agent.stream_task(Task("test task", tools=tools))]
+    
+    return asyncio.run(collect())
+
+def test_empty_action_list_is_reported_to_the_model():
+    result = run_task(['{"type": "action", "content": []}', OUTPUT])
+    assert result["content"] == "done"
+    assert {"type": "error", "content": "Action list was empty"} in result["history"]
+
+def test_empty_action_list_yields_non_fatal_error():
+    events = collect_events(['{"type": "action", "content": []}', OUTPUT])
+    errors = [event for event in events if isinstance(event, ErrorEvent)]
+    assert len(errors) == 1
+    assert not errors[0].fatal
+
+def test_clipped_observations_are_spilled_to_spill_dir(tmp_path):
+    from velocityai.tools.base import FunctionTool
+    
+    def dump() -> str:
+        """Return a large output."""
+        return "x" * 5000
+    
+    replies = ['{"type": "action", "content": {"tool": "dump", "parameters": {}}}', OUTPUT]
+    run_task(replies, tools=[FunctionTool(dump)], max_observation_tokens=50, spill_dir=str(tmp_path))
+    spilled = list(tmp_path.iterdir())
+    assert len(spilled) == 1
+    assert spilled[0].read_text() == "x" * 5000
+
+def test_closing_stream_cancels_speculative_tools():
+    from velocityai.tools.base import FunctionTool
+    
+    started, cancelled = [], []
+    
+    async def lookup(query: str) -> str:
+        """Slow side-effect free lookup."""
+        started.append(query)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+        return query
+    
+    reply = (
+        '{"type": "action", "content": [{"tool": "lookup", "parameters": {"query": "a"}}, '
+        '{"tool": "lookup", "parameters": {"query": "b"}}]}'
+    )
+    agent = Agent(llm=MockLLM([reply], tokens_per_second=2000, chunk_tokens=1))
+    task = Task("test task", tools=[FunctionTool(lookup, side_effect_free=True)])
+    
+    async def abandon():
+        events = agent.stream_task(task)
+        async for _ in events:
+            if started:
+                break
+        await events.aclose()
+        await asyncio.sleep(0.01)
+        # Checked before asyncio.run cancels whatever is left
+        return list(cancelled)
+    
+    assert asyncio.run(abandon()) == ["a"]
+    assert started == ["a"]
+
+def test_parallel_actions_run_together_and_report_in_order():
+    from velocityai.tools.base import FunctionTool
+    
+    async def wait(name: str, delay: float) -> str:
+        """Sleep, then return the name."""
+        await asyncio.sleep(delay)
+        return name
+    
+    reply = (
+        '{"type": "action", "content": [{"tool": "wait", "parameters": {"name": "slow", "delay": 0.05}}, '
+        '{"tool": "wait", "parameters": {"name": "fast", "delay": 0.0}}]}'
+    )
+    events = collect_events([reply, OUTPUT], tools=[FunctionTool(wait)])
+    ends = [event for event in events if isinstance(event, ToolEndEvent)]
+    assert [event.index for event in ends] == [1, 0]
+    [observation] = [event for event in events if isinstance(event, ObservationEvent)]
+    assert observation.content == [
+        {"tool": "wait", "result": "slow"},
+        {"tool": "wait", "result": "fast"}
+    ]
+
+def test_malformed_actions_become_unknown_tool_results():
+    reply = '{"type": "action", "content": ["oops", {"parameters": {}}, {"tool": "missing", "parameters": {}}]}'
+    events = collect_events([reply, OUTPUT])
+    ends = sorted((event for event in events if isinstance(event, ToolEndEvent)), key=lambda event: event.index)
+    assert [event.success for event in ends] == [False, False, False]
+    assert ends[2].result == "Unknown tool: missing"
+    assert isinstance(events[-1], OutputEvent)
+
+def test_invalid_json_is_reported_and_retried():
+    result = run_task(["not json at all", "[1, 2]", OUTPUT])
+    assert result["content"] == "done"
+    errors = [entry for entry in result["history"] if entry.get("type") == "error"]
+    assert len(errors) == 2
+
+def test_max_iterations_is_fatal():
+    reply = '{"type": "action", "content": {"tool": "missing", "parameters": {}}}'
+    agent = Agent(llm=MockLLM([reply]))
+    
+    async def collect():
+        return [event async for event in agent.stream_task(Task("test task", max_iterations=2))]
+    
+    events = asyncio.run(collect())
+    assert isinstance(events[-1], ErrorEvent)
+    assert events[-1].fatal
+    assert events[-1].content == "Task exceeded maximum iterations (2)"
+
+def test_speculative_tool_starts_before_response_ends():
+    from velocityai.tools.base import FunctionTool
+    
+    reply = (
+        '{"type": "action", "content": [{"tool": "lookup", "parameters": {"query": "a"}}], '
+        '"reasoning": "' + "padding " * 40 + '"}'
+    )
+    events = collect_events(
+        None,
+        tools=[FunctionTool(echo, name="lookup", side_effect_free=True)],
+        llm=MockLLM([reply, OUTPUT], tokens_per_second=2000, chunk_tokens=1)
+    )
+    kinds = [type(event) for event in events]
+    [tool_start] = [event for event in events if isinstance(event, ToolStartEvent)]
+    assert tool_start.speculative
+    assert kinds.index(ToolStartEvent) < max(i for i, kind in enumerate(kinds) if kind is TokenEvent)
+    [observation] = [event for event in events if isinstance(event, ObservationEvent)]
+    assert observation.content == [{"tool": "lookup", "result": "a"}]
+
+def test_speculation_can_be_turned_off():
+    from velocityai.tools.base import FunctionTool
+    
+    reply = '{"type": "action", "content": {"tool": "lookup", "parameters": {"query": "a"}}}'
+    events = collect_events(
+        [reply, OUTPUT],
+        tools=[FunctionTool(echo, name="lookup", side_effect_free=True)],
+        speculative_tools=False
+    )
+    [tool_start] = [event for event in events if isinstance(event, ToolStartEvent)]
+    assert not tool_start.speculative
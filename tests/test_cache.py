@@ -0,0 +1,95 @@
+import asyncio
+
+from velocityai.llms.cache import CachedLLM, LLMCache
+from velocityai.llms.mock import MockLLM
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+async def read(stream):
+    return "".join([chunk async for chunk in stream])
+
+def test_cached_llm_serves_repeats_from_memory():
+    backend = MockLLM(["one", "two"])
+    llm = CachedLLM(backend)
+    
+    async def calls():
+        return [
+            await llm.chat(MESSAGES),
+            await llm.chat(MESSAGES),
+            await llm.chat(MESSAGES, temperature=0.1),
+            await llm.generate("hello")
+        ]
+    
+    assert asyncio.run(calls()) == ["one", "one", "two", "one"]
+    assert backend.stats.calls == 3
+    assert llm.stats.memory_hits == 1 and llm.stats.misses == 3
+
+def test_cached_llm_persists_to_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = LLMCache(path=path)
+    asyncio.run(CachedLLM(MockLLM("stored"), first).chat(MESSAGES))
+    first.close()
+    
+    backend = MockLLM("fresh")
+    cache = LLMCache(path=path)
+    try:
+        assert asyncio.run(CachedLLM(backend, cache).chat(MESSAGES)) == "stored"
+    finally:
+        cache.close()
+    assert backend.stats.calls == 0
+    assert cache.stats.disk_hits == 1
+
+def test_cached_stream_is_stored_only_when_read_to_the_end():
+    backend = MockLLM("a fairly long streamed reply", chunk_tokens=1)
+    llm = CachedLLM(backend)
+    
+    async def calls():
+        stream = llm.stream_chat(MESSAGES)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        streamed = await read(llm.stream_chat(MESSAGES))
+        return streamed, await llm.chat(MESSAGES)
+    
+    assert asyncio.run(calls()) == ("a fairly long streamed reply",) * 2
+    assert backend.stats.calls == 2
+
+class ClosingLLM(MockLLM):
+    """Counts streams that were closed, whether finished or abandoned."""
+    
+    closed = 0
+    
+    async def stream_chat(self, messages, **kwargs):
+        try:
+            async for chunk in super().stream_chat(messages, **kwargs):
+                yield chunk
+        finally:
+            self.closed += 1
+
+def test_abandoned_stream_closes_the_backend_stream():
+    backend = ClosingLLM("a fairly long streamed reply", chunk_tokens=1)
+    llm = CachedLLM(backend)
+    
+    async def abandon():
+        stream = llm.stream_chat(MESSAGES)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        # Checked before the event loop gets a chance to finalize it
+        return backend.closed
+    
+    assert asyncio.run(abandon()) == 1
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "cache.sqlite"))
+    
+    async def scenario():
+        await cache.set("key", "value")
+        await cache.clear()
+        return await cache.get("key")
+    
+    try:
+        assert asyncio.run(scenario()) is None
+        assert len(cache.disk) == 0
+    finally:
+        cache.close()
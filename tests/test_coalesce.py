@@ -0,0 +1,116 @@
+import asyncio
+
+from velocityai.llms.coalesce import CoalescingLLM, SharedCallCancelled, SingleFlight
+from velocityai.llms.mock import MockLLM, MockLLMError, constant
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+async def read(stream):
+    return "".join([chunk async for chunk in stream])
+
+def test_coalescing_llm_merges_concurrent_calls():
+    backend = MockLLM("shared", first_token_latency=constant(0.02))
+    llm = CoalescingLLM(backend)
+    
+    async def calls():
+        return await asyncio.gather(*(llm.chat(MESSAGES) for _ in range(5)))
+    
+    assert asyncio.run(calls()) == ["shared"] * 5
+    assert backend.stats.calls == 1
+    assert llm.flights.shared == 4
+    assert len(llm.flights) == 0
+
+def test_coalescing_llm_fans_out_streams():
+    backend = MockLLM("chunked reply text", tokens_per_second=1000, chunk_tokens=1)
+    llm = CoalescingLLM(backend)
+    
+    async def calls():
+        return await asyncio.gather(*(read(llm.stream_chat(MESSAGES)) for _ in range(3)))
+    
+    assert asyncio.run(calls()) == ["chunked reply text"] * 3
+    assert backend.stats.calls == 1
+    assert llm.shared_streams == 2
+
+def test_single_flight_keeps_running_while_a_caller_remains():
+    flights = SingleFlight()
+    runs = []
+    
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.02)
+        return "done"
+    
+    async def calls():
+        leaving = asyncio.ensure_future(flights.do("key", work))
+        staying = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        return await staying
+    
+    assert asyncio.run(calls()) == "done"
+    assert runs == [1]
+
+def test_single_flight_shares_errors():
+    flights = SingleFlight()
+    
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise MockLLMError()
+    
+    async def calls():
+        return await asyncio.gather(flights.do("key", fail), flights.do("key", fail), return_exceptions=True)
+    
+    results = asyncio.run(calls())
+    assert all(isinstance(result, MockLLMError) for result in results)
+    assert flights.calls == 1
+
+def test_request_after_last_subscriber_left_starts_new_stream():
+    backend = MockLLM("a reply streamed in many small chunks", tokens_per_second=500, chunk_tokens=1)
+    llm = CoalescingLLM(backend)
+    
+    async def cancel_then_rejoin():
+        stream = llm.stream_chat(MESSAGES)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        assert len(llm._streams) == 0
+        # Arrives before the abandoned call has finished cancelling
+        return await read(llm.stream_chat(MESSAGES))
+    
+    assert asyncio.run(cancel_then_rejoin()) == "a reply streamed in many small chunks"
+    assert backend.stats.calls == 2
+    assert llm.shared_streams == 0
+
+def test_subscribers_of_a_cancelled_stream_get_an_error():
+    backend = MockLLM("a reply streamed in many small chunks", tokens_per_second=500, chunk_tokens=1)
+    llm = CoalescingLLM(backend)
+    
+    async def cancel_pump():
+        stream = llm.stream_chat(MESSAGES)
+        await stream.__anext__()
+        [broadcast] = llm._streams.values()
+        broadcast._task.cancel()
+        try:
+            await read(stream)
+        except SharedCallCancelled:
+            return True
+    
+    assert asyncio.run(cancel_pump())
+
+def test_single_flight_call_after_last_caller_left_starts_again():
+    flights = SingleFlight()
+    
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+    
+    async def cancel_then_rejoin():
+        leaving = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        assert len(flights) == 0
+        return await flights.do("key", work)
+    
+    assert asyncio.run(cancel_then_rejoin()) == "done"
+    assert flights.calls == 2
@@ -0,0 +1,80 @@
+import asyncio
+
+from velocityai.core.context import ContextWindow, summarize_steps
+
+def fill(window, steps, size=200):
+    async def add_all():
+        for step in range(steps):
+            await window.add("assistant", f"step {step} " + "a" * size)
+            await window.add("user", f"result {step} " + "r" * size)
+    
+    asyncio.run(add_all())
+
+def test_no_compaction_under_budget():
+    window = ContextWindow("system", "task", max_tokens=10000)
+    fill(window, 3)
+    assert window.summary == ""
+    assert len(window.messages) == 8
+
+def test_oldest_steps_fold_into_summary():
+    window = ContextWindow("system", "task", max_tokens=600, keep_recent=4)
+    fill(window, 10)
+    assert window.tokens() <= 600
+    assert window.folded > 0 and window.folded % 2 == 0
+    assert "- Step: step " in window.summary
+    assert "step 9 " not in window.summary
+    messages = window.messages
+    assert messages[0] == {"role": "system", "content": "system"}
+    assert messages[1]["content"].startswith("task\n\nSummary of earlier steps:\n")
+    # The newest steps are kept verbatim and roles still alternate
+    assert messages[-1]["content"].startswith("result 9 ")
+    assert [m["role"] for m in messages[2:]] == ["assistant", "user"] * ((len(messages) - 2) // 2)
+    assert len(messages) - 2 >= 4
+
+def test_compaction_goes_below_the_budget():
+    window = ContextWindow("system", "task", max_tokens=1000, compact_ratio=0.5, keep_recent=2)
+    fill(window, 10)
+    # Compacted with room to spare, so the next small step fits without another fold
+    folded = window.folded
+    assert folded > 0
+    assert window.tokens() <= 1000
+    asyncio.run(window.add("assistant", "short"))
+    assert window.folded == folded
+
+def test_hard_cap_truncates_recent_steps():
+    window = ContextWindow("system", "task", max_tokens=300, keep_recent=4)
+    fill(window, 2, size=2000)
+    assert window.tokens() <= 300
+    assert "characters omitted" in window.messages[-1]["content"]
+
+def test_custom_summarizer_receives_folded_pairs():
+    calls = []
+    
+    async def summarizer(summary, messages):
+        calls.append([message["role"] for message in messages])
+        return summary + "x"
+    
+    window = ContextWindow("system", "task", max_tokens=600, keep_recent=2, summarizer=summarizer)
+    fill(window, 10)
+    assert calls and all(roles[0] == "assistant" and len(roles) % 2 == 0 for roles in calls)
+    assert window.summary == "x" * len(calls)
+
+def test_clip_keeps_head_and_tail(tmp_path):
+    window = ContextWindow("system", "task", max_observation_tokens=100, spill_dir=str(tmp_path))
+    text = "head" + "m" * 5000 + "tail"
+    clipped = window.clip(text)
+    assert clipped.startswith("head") and clipped.endswith("tail")
+    assert len(clipped) < 600
+    [spilled] = tmp_path.iterdir()
+    assert str(spilled) in clipped
+    assert window.clip("short") == "short"
+
+def test_default_summary_lines_are_clipped():
+    summary = asyncio.run(summarize_steps("earlier", [
+        {"role": "assistant", "content": "x" * 1000},
+        {"role": "user", "content": "line\n\n  breaks"}
+    ]))
+    lines = summary.split("\n")
+    assert lines[0] == "earlier"
+    assert lines[1].endswith("...") and len(lines[1]) < 300
+    assert lines[2] == "- Result: line breaks"
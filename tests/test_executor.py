@@ -0,0 +1,120 @@
+import asyncio
+
+from velocityai.core.executor import BatchExecutor
+from velocityai.llms.mock import MockLLM, constant
+
+def test_results_are_yielded_while_async_source_is_idle():
+    async def scenario():
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        
+        async def specs():
+            while True:
+                spec = await queue.get()
+                if spec is None:
+                    return
+                yield spec
+        
+        executor = BatchExecutor(MockLLM(), concurrency=4)
+        stream = executor.stream(specs())
+        queue.put_nowait("first")
+        # The source stays idle until the first result has been seen
+        first = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        queue.put_nowait(None)
+        rest = [result async for result in stream]
+        return first, rest
+    
+    first, rest = asyncio.run(scenario())
+    assert first.success and first.spec == "first"
+    assert rest == []
+
+def test_results_keep_input_order_in_run():
+    executor = BatchExecutor(MockLLM(), concurrency=3)
+    results = asyncio.run(executor.run([f"task {i}" for i in range(10)]))
+    assert [result.index for result in results] == list(range(10))
+    assert all(result.success for result in results)
+
+def test_summary_counts_only_time_spent_streaming():
+    async def scenario():
+        executor = BatchExecutor(MockLLM(first_token_latency=constant(0.01)), concurrency=2)
+        await executor.run(["a", "b"])
+        await asyncio.sleep(0.2)
+        await executor.run(["c", "d"])
+        return executor.summary()
+    
+    summary = asyncio.run(scenario())
+    assert summary.total == 4
+    assert 0.02 <= summary.elapsed < 0.2
+    assert summary.throughput > 4 / 0.2
+
+def test_timeouts_are_reported():
+    executor = BatchExecutor(MockLLM(first_token_latency=constant(1)), timeout=0.01)
+    results = asyncio.run(executor.run(["slow"]))
+    assert results[0].timed_out and not results[0].success
+
+def test_closing_stream_cancels_and_awaits_running_tasks():
+    async def scenario():
+        executor = BatchExecutor(MockLLM(first_token_latency=constant(10)), concurrency=3)
+        stream = executor.stream(["a", "b", "c"])
+        next_result = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.01)
+        next_result.cancel()
+        await asyncio.gather(next_result, return_exceptions=True)
+        await stream.aclose()
+        others = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return others, executor.summary()
+    
+    others, summary = asyncio.run(scenario())
+    assert others == []
+    assert summary.total == 0
+
+def test_concurrency_is_bounded():
+    executor = BatchExecutor(MockLLM(first_token_latency=constant(0.02)), concurrency=2)
+    
+    async def timed():
+        start = asyncio.get_running_loop().time()
+        await executor.run([f"task {i}" for i in range(4)])
+        return asyncio.get_running_loop().time() - start
+    
+    assert asyncio.run(timed()) >= 0.04
+
+def test_spec_kinds_and_failures_are_summarised():
+    from velocityai.core.task import Task
+    
+    executor = BatchExecutor(MockLLM(), concurrency=4)
+    specs = ["plain", {"task_description": "from dict"}, Task("task object"), 42]
+    results = asyncio.run(executor.run(specs))
+    assert [result.success for result in results] == [True, True, True, False]
+    assert results[3].error == "Unsupported task spec type: int"
+    summary = executor.summary()
+    assert (summary.total, summary.succeeded, summary.failed) == (4, 3, 1)
+
+def test_run_many_yields_every_result():
+    from velocityai.core.executor import run_many
+    
+    async def collect():
+        return [result async for result in run_many(MockLLM(), ["a", "b", "c"], concurrency=2)]
+    
+    results = asyncio.run(collect())
+    assert sorted(result.spec for result in results) == ["a", "b", "c"]
+
+def test_agent_errors_count_as_failures():
+    action = '{"type": "action", "content": {"tool": "missing", "parameters": {}}}'
+    executor = BatchExecutor(MockLLM(action), max_iterations=2)
+    [result] = asyncio.run(executor.run(["never finishes"]))
+    assert not result.success
+    assert result.error == "Task exceeded maximum iterations (2)"
+    assert result.result["type"] == "error"
+    summary = executor.summary()
+    assert (summary.succeeded, summary.failed, summary.timed_out) == (0, 1, 0)
+
+def test_run_many_uses_given_executor():
+    from velocityai.core.executor import run_many
+    
+    llm = MockLLM()
+    executor = BatchExecutor(llm, concurrency=2)
+    
+    async def collect():
+        return [result async for result in run_many(llm, ["a", "b"], executor=executor)]
+    
+    assert len(asyncio.run(collect())) == 2
+    assert executor.summary().succeeded == 2
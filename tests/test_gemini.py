@@ -0,0 +1,264 @@
+import asyncio
+import json
+
+import pytest
+
+from velocityai.llms.gemini import GeminiLLM
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+class FakeChat:
+    """Stands in for an SDK chat session, recording what is sent."""
+    
+    def __init__(self, history):
+        self.history = list(history)
+        self.sent = []
+    
+    async def send_message_async(self, parts, stream=False):
+        self.sent.append(parts)
+        reply = f"reply {len(self.history) // 2 + 1}"
+        self.history += [{"role": "user", "parts": parts}, {"role": "model", "parts": [reply]}]
+        if stream:
+            return _chunks([reply[:3], reply[3:]])
+        return FakeResponse(reply)
+
+async def _chunks(texts):
+    for text in texts:
+        yield FakeResponse(text)
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel, recording the calls it gets."""
+    
+    def __init__(self, system=None):
+        self.system = system
+        self.active = 0
+        self.peak = 0
+        self.prompts = []
+        self.chats = []
+    
+    def start_chat(self, history):
+        chat = FakeChat(history)
+        self.chats.append(chat)
+        return chat
+    
+    async def generate_content_async(self, prompt):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        return FakeResponse(f"reply to {prompt}")
+    
+    def generate_content(self, prompt):
+        raise AssertionError("the blocking SDK call must not be used")
+
+class FakeGeminiLLM(GeminiLLM):
+    def __init__(self, **kwargs):
+        super().__init__(api_key="test-key", **kwargs)
+        self.models = []
+    
+    def _new_model(self, system=None):
+        model = FakeModel(system)
+        self.models.append(model)
+        return model
+
+def test_requests_in_flight_are_capped():
+    llm = FakeGeminiLLM(max_concurrent_requests=2)
+    
+    async def calls():
+        return await asyncio.gather(*(llm.generate(f"prompt {i}") for i in range(6)))
+    
+    assert asyncio.run(calls()) == [f"reply to prompt {i}" for i in range(6)]
+    assert llm.model.peak == 2
+    assert len(llm.model.prompts) == 6
+
+def test_cap_can_be_disabled():
+    llm = FakeGeminiLLM(max_concurrent_requests=None)
+    
+    async def calls():
+        await asyncio.gather(*(llm.generate(f"prompt {i}") for i in range(6)))
+    
+    asyncio.run(calls())
+    assert llm.model.peak == 6
+
+def conversation(*turns):
+    messages = [{"role": "system", "content": "Be brief."}]
+    for i, content in enumerate(turns):
+        messages.append({"role": "user" if i % 2 == 0 else "assistant", "content": content})
+    return messages
+
+def test_session_is_reused_and_only_new_turns_are_sent():
+    llm = FakeGeminiLLM()
+    
+    async def calls():
+        first = await llm.chat(conversation("hello"))
+        second = await llm.chat(conversation("hello", first, "and then?"))
+        third = await llm.chat(conversation("hello", first, "and then?", second, "thanks"))
+        return first, second, third
+    
+    assert asyncio.run(calls()) == ("reply 1", "reply 2", "reply 3")
+    [model] = llm.models
+    assert model.system == "Be brief."
+    [chat] = model.chats
+    assert chat.sent == [["hello"], ["and then?"], ["thanks"]]
+
+def test_diverged_history_opens_new_session():
+    llm = FakeGeminiLLM()
+    
+    async def calls():
+        await llm.chat(conversation("hello"))
+        await llm.chat(conversation("hello", "an edited reply", "and then?"))
+    
+    asyncio.run(calls())
+    first, _, rebuilt = llm.models[0].chats
+    assert first.sent == [["hello"]]
+    # The whole conversation so far becomes the new session's history
+    assert rebuilt.history[:2] == [
+        {"role": "user", "parts": ["hello"]},
+        {"role": "model", "parts": ["an edited reply"]}
+    ]
+    assert rebuilt.sent == [["and then?"]]
+
+def test_least_recently_used_session_is_evicted():
+    llm = FakeGeminiLLM(max_chat_sessions=1)
+    
+    async def calls():
+        a = await llm.chat(conversation("topic a"))
+        await llm.chat(conversation("topic b"))
+        await llm.chat(conversation("topic a", a, "more on a"))
+    
+    asyncio.run(calls())
+    chats = llm.models[0].chats
+    # topic a was evicted by topic b, so continuing it starts over
+    assert [chat.sent for chat in chats[:2]] == [[["topic a"]], [["topic b"]]]
+    assert chats[-1].sent == [["more on a"]]
+    assert chats[-1].history[:2] == [
+        {"role": "user", "parts": ["topic a"]},
+        {"role": "model", "parts": ["reply 1"]}
+    ]
+
+def test_stream_chat_files_session_only_when_fully_read():
+    llm = FakeGeminiLLM()
+    
+    async def calls():
+        stream = llm.stream_chat(conversation("hello"))
+        async for _ in stream:
+            break
+        await stream.aclose()
+        reply = "".join([chunk async for chunk in llm.stream_chat(conversation("hello"))])
+        await llm.chat(conversation("hello", reply, "next"))
+        return reply
+    
+    assert asyncio.run(calls()) == "reply 1"
+    chats = llm.models[0].chats
+    # The abandoned stream's session is not reused; the complete one is
+    assert len(chats) == 2
+    assert chats[1].sent == [["hello"], ["next"]]
+
+class FakeHTTPResponse:
+    def __init__(self, body, status=200, chunk_size=7):
+        self.body = body
+        self.status = status
+        self.chunk_size = chunk_size
+        self.released = False
+        self.content = self
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.released = True
+    
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+    
+    async def iter_any(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            await asyncio.sleep(0)
+            yield self.body[start:start + self.chunk_size]
+
+class FakeHTTPSession:
+    closed = False
+    
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+    
+    def post(self, url, headers, data):
+        self.requests.append((url, json.loads(data)))
+        return self.response
+
+def sse_chunk(text):
+    return "data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+def stream_llm(body, **kwargs):
+    llm = FakeGeminiLLM(**kwargs)
+    response = FakeHTTPResponse(body.encode("utf-8"))
+    llm._http = FakeHTTPSession(response)
+    return llm, response
+
+def test_stream_generate_content_parses_sse():
+    body = (
+        ": keep-alive\r\n\r\n"
+        + sse_chunk("Hel") + "\r\n\r\n"
+        + sse_chunk("lo, ") + "\n\n"
+        + 'data: {"candidates": []}\n\n'
+        + sse_chunk("world")
+    )
+    llm, response = stream_llm(body)
+    
+    async def read():
+        return [chunk async for chunk in llm.stream_generate_content("greet")]
+    
+    assert asyncio.run(read()) == ["Hel", "lo, ", "world"]
+    [(url, request)] = llm._http.requests
+    assert url.endswith(":streamGenerateContent?alt=sse")
+    assert request["contents"] == [{"role": "user", "parts": [{"text": "greet"}]}]
+    assert response.released
+
+def test_stream_error_event_raises():
+    body = sse_chunk("partial") + "\n\n" + 'data: {"error": {"message": "quota exceeded"}}\n\n'
+    llm, response = stream_llm(body)
+    
+    async def read():
+        chunks = []
+        try:
+            async for chunk in llm.stream_generate_content("greet"):
+                chunks.append(chunk)
+        except RuntimeError as e:
+            return chunks, str(e)
+    
+    assert asyncio.run(read()) == (["partial"], "quota exceeded")
+    assert response.released
+
+def test_stream_http_error_raises():
+    llm, response = stream_llm("")
+    response.status = 503
+    
+    async def read():
+        return [chunk async for chunk in llm.stream_generate_content("greet")]
+    
+    with pytest.raises(RuntimeError, match="HTTP 503"):
+        asyncio.run(read())
+    assert response.released
+
+def test_closing_stream_early_releases_response_and_slot():
+    body = "".join(sse_chunk(f"part {i}") + "\n\n" for i in range(20))
+    llm, response = stream_llm(body, max_concurrent_requests=1)
+    
+    async def read_one():
+        stream = llm.stream_generate_content("greet")
+        async for chunk in stream:
+            break
+        await stream.aclose()
+        # The only slot must be free again
+        await asyncio.wait_for(llm.generate("next"), timeout=1)
+        return chunk
+    
+    assert asyncio.run(read_one()) == "part 0"
+    assert response.released
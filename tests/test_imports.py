@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import velocityai
+import velocityai.llms
+
+HEAVY_MODULES = ("google.generativeai", "aiohttp", "velocityai.llms.gemini")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def loaded_after(statement):
+    code = (
+        "import sys\n"
+        f"{statement}\n"
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return [name for name in output.strip().split(",") if name]
+
+def test_importing_the_package_does_not_load_backend_sdks():
+    assert loaded_after("import velocityai") == []
+    assert loaded_after("import velocityai.llms") == []
+    assert loaded_after("from velocityai import Agent, Task, run_many") == []
+    # Even the backend module defers its SDKs until a model or stream is needed
+    assert loaded_after("from velocityai.llms import GeminiLLM") == ["velocityai.llms.gemini"]
+
+@pytest.mark.parametrize("package", [velocityai, velocityai.llms])
+def test_every_export_resolves(package):
+    for name in package.__all__:
+        value = getattr(package, name)
+        assert getattr(value, "__name__", name) == name
+        assert name in dir(package)
+    # A star import resolves everything too
+    namespace = {}
+    exec(f"from {package.__name__} import *", namespace)
+    assert set(package.__all__) <= set(namespace)
+
+@pytest.mark.parametrize("package", [velocityai, velocityai.llms])
+def test_unknown_attribute_raises(package):
+    with pytest.raises(AttributeError, match="no_such_name"):
+        package.no_such_name
+    with pytest.raises(ImportError):
+        exec(f"from {package.__name__} import no_such_name", {})
@@ -0,0 +1,71 @@
+import asyncio
+import urllib.request
+
+import pytest
+
+from velocityai.llms.base import LLM_ERRORS, LLM_FIRST_TOKEN, LLM_REQUESTS
+from velocityai.llms.mock import MockLLM, MockLLMError
+from velocityai.llms.resilience import ResilientLLM, RetryPolicy
+from velocityai.observability.metrics import MetricsRegistry, start_metrics_server
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+class MeteredMock(MockLLM):
+    """Own class so its label is not shared with other tests."""
+
+def requests() -> float:
+    return LLM_REQUESTS.labels("MeteredMock").value
+
+def test_every_llm_entry_point_counts_one_request():
+    llm = MeteredMock()
+    
+    async def scenario():
+        await llm.generate("hi")
+        await llm.chat(MESSAGES)
+        [chunk async for chunk in llm.stream_generate_content("hi")]
+        [chunk async for chunk in llm.stream_chat(MESSAGES)]
+    
+    before = requests()
+    first_tokens = LLM_FIRST_TOKEN.labels("MeteredMock").sum
+    asyncio.run(scenario())
+    assert requests() - before == 4
+    assert LLM_FIRST_TOKEN.labels("MeteredMock").sum > first_tokens
+
+def test_wrappers_count_each_backend_request():
+    llm = ResilientLLM(MeteredMock(failure_rate=1.0), retry=RetryPolicy(max_attempts=2, base_delay=0))
+    before = requests()
+    errors = LLM_ERRORS.labels("MeteredMock", "MockLLMError").value
+    with pytest.raises(MockLLMError):
+        asyncio.run(llm.chat(MESSAGES))
+    assert requests() - before == 2
+    assert LLM_ERRORS.labels("MeteredMock", "MockLLMError").value - errors == 2
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs run.", ("queue",)).labels('a"b').inc(2)
+    histogram = registry.histogram("job_seconds", "Job time.", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    text = registry.render()
+    assert '# TYPE jobs_total counter\njobs_total{queue="a\\"b"} 2\n' in text
+    assert 'job_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'job_seconds_bucket{le="1"} 2\n' in text
+    assert 'job_seconds_bucket{le="+Inf"} 2\n' in text
+    assert "job_seconds_count 2\n" in text
+
+def test_register_rejects_conflicting_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("a_total", "A.") is registry.counter("a_total", "A.")
+    with pytest.raises(ValueError):
+        registry.gauge("a_total", "A.")
+
+def test_metrics_server():
+    registry = MetricsRegistry()
+    registry.gauge("up", "Up.").set(1)
+    server = start_metrics_server(port=0, registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode()
+    finally:
+        server.shutdown()
+    assert body == registry.render()
@@ -0,0 +1,36 @@
+import json
+
+from velocityai.core.parsing import IncrementalActionParser
+
+def feed_all(parser, chunks):
+    return [item for chunk in chunks for item in parser.feed(chunk)]
+
+def test_actions_are_returned_as_they_close():
+    response = json.dumps({
+        "type": "action",
+        "content": [
+            {"tool": "a", "parameters": {"text": "} ] \" {"}},
+            {"tool": "b", "parameters": {"nested": {"tool": "not an action"}}}
+        ]
+    })
+    parser = IncrementalActionParser()
+    first_end = response.index("}}, ") + 2
+    assert parser.feed(response[:first_end]) == [
+        (0, {"tool": "a", "parameters": {"text": "} ] \" {"}})
+    ]
+    assert parser.feed(response[first_end:]) == [
+        (1, {"tool": "b", "parameters": {"nested": {"tool": "not an action"}}})
+    ]
+
+def test_single_action_and_code_fence():
+    response = '```json\n{"type": "action", "content": {"tool": "a", "parameters": {}}}\n```'
+    parser = IncrementalActionParser()
+    assert feed_all(parser, list(response)) == [(0, {"tool": "a", "parameters": {}})]
+
+def test_objects_outside_content_are_ignored():
+    response = '{"metadata": {"tool": "x"}, "type": "output", "content": "done"}'
+    assert IncrementalActionParser().feed(response) == []
+
+def test_entries_without_tool_keep_their_position():
+    response = '{"type": "action", "content": [{"name": "a"}, {"tool": "b", "parameters": {}}]}'
+    assert IncrementalActionParser().feed(response) == [(1, {"tool": "b", "parameters": {}})]
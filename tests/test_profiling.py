@@ -0,0 +1,46 @@
+import asyncio
+import os
+import pstats
+
+from velocityai.observability.profiling import TaskProfiler
+
+async def busy_task():
+    total = 0
+    for _ in range(5):
+        deadline = asyncio.get_running_loop().time() + 0.01
+        while asyncio.get_running_loop().time() < deadline:
+            total += sum(range(100))
+        await asyncio.sleep(0.005)
+    return {"type": "output", "content": total}
+
+def test_sampling_profile_is_written(tmp_path):
+    profiler = TaskProfiler(output_dir=str(tmp_path), sample_every=1, interval=0.001)
+    result = asyncio.run(profiler.profile(busy_task(), name="busy task"))
+    
+    report = result["profile"]
+    assert set(report) == {"mode", "path", "wall_seconds", "active_seconds", "samples", "memory"}
+    assert report["mode"] == "sampling"
+    assert os.path.basename(report["path"]).startswith("busy_task-")
+    assert os.path.exists(report["path"])
+    assert 0 < report["active_seconds"] <= report["wall_seconds"]
+    assert report["samples"] > 0
+    with open(report["path"], encoding="utf-8") as f:
+        assert any("busy_task" in line for line in f)
+    assert set(report["memory"]) == {"net_bytes", "peak_bytes", "top"}
+
+def test_cprofile_stats_are_written(tmp_path):
+    profiler = TaskProfiler(output_dir=str(tmp_path), mode="cprofile", memory=False)
+    report = asyncio.run(profiler.profile(busy_task()))["profile"]
+    assert "memory" not in report and "samples" not in report
+    stats = pstats.Stats(report["path"])
+    assert any(name == "busy_task" for _, _, name in stats.stats)
+
+def test_only_sampled_tasks_are_profiled(tmp_path):
+    profiler = TaskProfiler(output_dir=str(tmp_path), sample_every=2, memory=False)
+    
+    async def tasks():
+        return [await profiler.profile(busy_task()) for _ in range(4)]
+    
+    results = asyncio.run(tasks())
+    assert ["profile" in result for result in results] == [True, False, True, False]
+    assert len(os.listdir(tmp_path)) == 2
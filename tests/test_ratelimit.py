@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import pytest
+
+from velocityai.llms.mock import MockLLM, MockLLMError, constant
+from velocityai.llms.ratelimit import AdaptiveConcurrency, RateLimitedLLM, RateLimiter, TokenBucket
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=600, capacity=1)
+    
+    async def take():
+        return [await bucket.acquire() for _ in range(3)]
+    
+    waits = asyncio.run(take())
+    assert waits[0] == 0.0
+    assert waits[1] == pytest.approx(0.1, abs=0.02)
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+
+def test_adaptive_concurrency_limits_and_backs_off():
+    concurrency = AdaptiveConcurrency(initial=2, minimum=1)
+    
+    async def run():
+        first = await concurrency.acquire()
+        second = await concurrency.acquire()
+        third = asyncio.ensure_future(concurrency.acquire())
+        await asyncio.sleep(0)
+        assert not third.done() and concurrency.queued == 1
+        concurrency.release(first, overloaded=True)
+        # Overloaded: the limit halves to 1, so the waiter still cannot start
+        await asyncio.sleep(0)
+        assert concurrency.limit == 1.0 and not third.done()
+        # A second overload from a call started before the decrease is ignored
+        concurrency.release(second, overloaded=True)
+        assert concurrency.limit == 1.0
+        await third
+        assert concurrency.in_flight == 1
+    
+    asyncio.run(run())
+
+def test_rate_limited_llm_caps_concurrency():
+    backend = MockLLM("ok", first_token_latency=constant(0.02))
+    llm = RateLimitedLLM(backend, RateLimiter(initial_concurrency=2, max_concurrency=2))
+    
+    async def calls():
+        start = time.perf_counter()
+        await asyncio.gather(*(llm.chat(MESSAGES) for _ in range(4)))
+        return time.perf_counter() - start
+    
+    elapsed = asyncio.run(calls())
+    # Four calls two at a time take two rounds
+    assert 0.04 <= elapsed < 0.2
+    assert llm.limiter.stats.requests == 4
+    assert llm.limiter.stats.throttled == 2
+
+def test_rate_limiter_counts_overloads():
+    backend = MockLLM("ok", failure_rate=1.0)
+    llm = RateLimitedLLM(backend, initial_concurrency=4)
+    with pytest.raises(MockLLMError):
+        asyncio.run(llm.chat(MESSAGES))
+    assert llm.limiter.stats.overloaded == 1
+    assert llm.limiter.concurrency.limit == 2.0
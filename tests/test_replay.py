@@ -0,0 +1,85 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from velocityai.llms.mock import MockLLM
+from velocityai.llms.replay import RecordingLLM, ReplayError, ReplayLLM
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+async def read(stream):
+    return [chunk async for chunk in stream]
+
+def test_recording_replays_in_order(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    recorder = RecordingLLM(MockLLM(["first reply", "second reply", "a streamed reply"], chunk_tokens=1), path)
+    
+    async def record():
+        return [
+            await recorder.chat(MESSAGES),
+            await recorder.chat(MESSAGES),
+            await read(recorder.stream_generate_content("stream please"))
+        ]
+    
+    first, second, chunks = asyncio.run(record())
+    assert (first, second) == ("first reply", "second reply")
+    
+    replay = ReplayLLM(path, timing="instant")
+    assert len(replay) == 3
+    
+    async def play():
+        return [
+            await replay.chat(MESSAGES),
+            await replay.chat(MESSAGES),
+            # Once the recordings run out the last one is repeated
+            await replay.chat(MESSAGES),
+            await read(replay.stream_generate_content("stream please")),
+            await replay.generate("stream please")
+        ]
+    
+    assert asyncio.run(play()) == [first, second, second, chunks, "".join(chunks)]
+
+def test_recorded_failure_is_raised_again(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    recorder = RecordingLLM(MockLLM(failure_rate=1.0), path)
+    with pytest.raises(Exception):
+        asyncio.run(recorder.generate("hi"))
+    
+    with open(path, encoding="utf-8") as f:
+        [record] = [json.loads(line) for line in f]
+    assert record["error"]["status"] == 503
+    
+    with pytest.raises(ReplayError) as info:
+        asyncio.run(ReplayLLM(path, timing="instant").generate("hi"))
+    assert info.value.status == 503 and info.value.type == "MockLLMError"
+
+def test_missing_request(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    asyncio.run(RecordingLLM(MockLLM("recorded"), path).generate("known"))
+    
+    with pytest.raises(KeyError):
+        asyncio.run(ReplayLLM(path, timing="instant").generate("unknown"))
+    lenient = ReplayLLM(path, timing="instant", strict=False, fallback="fallback")
+    assert asyncio.run(lenient.generate("unknown")) == "fallback"
+    assert asyncio.run(lenient.generate("known")) == "recorded"
+
+class ThreadNoting(RecordingLLM):
+    threads = []
+    
+    def _append(self, line):
+        self.threads.append(threading.get_ident())
+        super()._append(line)
+
+def test_recording_writes_off_the_event_loop(tmp_path):
+    recorder = ThreadNoting(MockLLM("reply"), str(tmp_path / "run.jsonl"))
+    
+    async def record():
+        await asyncio.gather(*(recorder.generate(f"prompt {i}") for i in range(5)))
+        return threading.get_ident()
+    
+    loop_thread = asyncio.run(record())
+    assert len(recorder.threads) == 5
+    assert loop_thread not in recorder.threads
+    assert len(ReplayLLM(recorder.path)) == 5
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from velocityai.llms.mock import MockLLM, MockLLMError, constant
+from velocityai.llms.resilience import HedgePolicy, LatencyTracker, ResilientLLM, RetryPolicy
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+class FailingFirst(MockLLM):
+    """Fails the first `failures` calls with a retryable error."""
+    
+    def __init__(self, failures: int, status: int = 503, **kwargs):
+        super().__init__(**kwargs)
+        self.remaining = failures
+        self.status = status
+    
+    async def _stream(self, request):
+        if self.remaining:
+            self.remaining -= 1
+            raise MockLLMError(status=self.status)
+        async for chunk in super()._stream(request):
+            yield chunk
+
+def test_retries_retryable_errors():
+    llm = ResilientLLM(FailingFirst(2, responses="ok"), retry=RetryPolicy(max_attempts=3, base_delay=0))
+    assert asyncio.run(llm.chat(MESSAGES)) == "ok"
+    assert llm.stats.retries == 2
+
+def test_does_not_retry_client_errors():
+    llm = ResilientLLM(FailingFirst(1, status=400), retry=RetryPolicy(max_attempts=3, base_delay=0))
+    with pytest.raises(MockLLMError):
+        asyncio.run(llm.chat(MESSAGES))
+    assert llm.stats.retries == 0 and llm.stats.failures == 1
+
+def test_deadline_covers_the_call():
+    llm = ResilientLLM(MockLLM(first_token_latency=constant(1)), timeout=0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(llm.chat(MESSAGES))
+    assert llm.stats.timeouts == 1
+
+def test_calls_and_streams_keep_separate_latencies():
+    async def scenario(llm):
+        await llm.chat(MESSAGES)
+        return [chunk async for chunk in llm.stream_chat(MESSAGES)]
+    
+    llm = ResilientLLM(MockLLM(responses="x" * 40, tokens_per_second=1000, chunk_tokens=1), hedge=HedgePolicy())
+    chunks = asyncio.run(scenario(llm))
+    assert "".join(chunks) == "x" * 40
+    assert len(llm.call_latencies) == 1
+    assert len(llm.first_chunk_latencies) == 1
+    # A whole response takes longer than the first chunk of one
+    assert llm.call_latencies.quantile(50) > llm.first_chunk_latencies.quantile(50)
+
+def test_hedges_slow_calls():
+    delays = iter([0.0] * 20 + [1.0, 0.0])
+    llm = ResilientLLM(
+        MockLLM(first_token_latency=lambda rng: next(delays)),
+        hedge=HedgePolicy(min_samples=20, min_delay=0.01, budget_burst=1)
+    )
+    
+    async def scenario():
+        for _ in range(20):
+            await llm.chat(MESSAGES)
+        await asyncio.wait_for(llm.chat(MESSAGES), timeout=0.5)
+    
+    asyncio.run(scenario())
+    assert llm.stats.hedges == 1 and llm.stats.hedge_wins == 1
+
+def test_latency_tracker_matches_sorted_window():
+    import random
+    
+    from velocityai.utils.stats import percentile
+    
+    tracker = LatencyTracker(window=50)
+    assert tracker.quantile(95) is None
+    rng = random.Random(3)
+    added = []
+    for _ in range(500):
+        latency = round(rng.expovariate(10), 3)
+        added.append(latency)
+        tracker.add(latency)
+        window = sorted(added[-50:])
+        assert tracker.quantile(95) == percentile(window, 95)
+    assert len(tracker) == 50
@@ -0,0 +1,33 @@
+from velocityai.llms.sse import SSEEvent, SSEParser
+
+def feed_all(parser, chunks):
+    return [item for chunk in chunks for item in parser.feed(chunk)]
+
+def test_sse_events_split_across_chunks():
+    body = b"event: delta\nid: 1\ndata: hel"
+    parser = SSEParser()
+    assert parser.feed(body) == []
+    assert parser.feed(b"lo\ndata: world\n\n") == [SSEEvent("hello\nworld", "delta", "1")]
+    assert parser.last_event_id == "1"
+
+def test_sse_line_endings_and_comments():
+    body = b": keep-alive\r\ndata: a\r\n\r\ndata: b\r\rdata: c\n\n"
+    parser = SSEParser()
+    # Feed one byte at a time, splitting every \r\n
+    events = feed_all(parser, [body[i:i + 1] for i in range(len(body))])
+    assert [event.data for event in events] == ["a", "b", "c"]
+
+def test_sse_split_utf8_sequence():
+    body = "data: café\n\n".encode("utf-8")
+    split = body.index(b"\xc3") + 1
+    parser = SSEParser()
+    assert feed_all(parser, [body[:split], body[split:]]) == [SSEEvent("café")]
+
+def test_sse_flush_dispatches_unterminated_event():
+    parser = SSEParser()
+    assert parser.feed(b"data: {\"done\": true}") == []
+    assert parser.flush() == [SSEEvent('{"done": true}')]
+
+def test_sse_event_without_data_is_dropped():
+    parser = SSEParser()
+    assert parser.feed(b"event: ping\n\ndata: x\n\n") == [SSEEvent("x")]
@@ -0,0 +1,319 @@
+import asyncio
+import gc
+import logging
+import os
+import threading
+import time
+
+from velocityai.tools import base
+from velocityai.tools.base import FunctionTool
+from velocityai.tools.cache import ToolCache, get_tool_cache, set_tool_cache
+from velocityai.tools.executors import shutdown_pools
+from velocityai.tools.index import ToolIndex, tokenize
+from velocityai.tools.toolset import ToolSet
+
+def lookup(query: str) -> str:
+    """Look something up."""
+    return query.upper()
+
+class CachedLookup(FunctionTool):
+    side_effect_free = True
+    cacheable = True
+    cache_ttl = 60.0
+    execution_mode = "thread"
+
+def test_function_tool_subclass_keeps_class_options():
+    tool = CachedLookup(lookup)
+    assert tool.side_effect_free and tool.cacheable
+    assert tool.cache_ttl == 60.0
+    assert tool.execution_mode == "thread"
+
+def test_function_tool_arguments_override_class_options():
+    tool = CachedLookup(lookup, side_effect_free=False, cacheable=False, execution_mode="inline")
+    assert not tool.side_effect_free and not tool.cacheable
+    assert tool.execution_mode == "inline"
+
+def test_function_tool_defaults():
+    tool = FunctionTool(lookup)
+    assert not tool.side_effect_free and not tool.cacheable
+    assert tool.cache_ttl is None
+
+def test_function_tool_call():
+    result = asyncio.run(FunctionTool(lookup)(query="abc"))
+    assert result.success and result.result == "ABC"
+
+def test_cacheable_tool_serves_repeat_calls():
+    previous = get_tool_cache()
+    set_tool_cache(ToolCache())
+    calls = []
+    
+    def square(n: int) -> int:
+        """Square a number, failing on negatives."""
+        calls.append(n)
+        if n < 0:
+            raise ValueError("negative")
+        return n * n
+    
+    try:
+        tool = FunctionTool(square, cacheable=True)
+        first = asyncio.run(tool(n=3))
+        second = asyncio.run(tool(n=3))
+        assert first.result == second.result == 9
+        assert second.metadata["cached"] and not first.metadata.get("cached")
+        # Failures are not cached
+        assert not asyncio.run(tool(n=-1)).success
+        assert not asyncio.run(tool(n=-1)).success
+        assert calls == [3, -1, -1]
+        get_tool_cache().invalidate("square")
+        asyncio.run(tool(n=3))
+        assert calls == [3, -1, -1, 3]
+    finally:
+        set_tool_cache(previous)
+
+def test_tools_sharing_a_name_keep_separate_cache_entries():
+    previous = get_tool_cache()
+    set_tool_cache(ToolCache())
+    
+    def metric(n: int) -> int:
+        return n * 2
+    
+    def imperial(n: int) -> int:
+        return n * 3
+    
+    try:
+        first = FunctionTool(metric, name="convert", cacheable=True)
+        second = FunctionTool(imperial, name="convert", cacheable=True)
+        assert asyncio.run(first(n=5)).result == 10
+        result = asyncio.run(second(n=5))
+        assert result.result == 15 and not result.metadata.get("cached")
+        # Another tool wrapping the same function still shares its entries
+        assert asyncio.run(FunctionTool(metric, name="convert", cacheable=True)(n=5)).metadata["cached"]
+    finally:
+        set_tool_cache(previous)
+
+def test_cached_results_are_isolated_from_mutation():
+    previous = get_tool_cache()
+    set_tool_cache(ToolCache())
+    
+    def profile(user: str) -> dict:
+        return {"user": user, "tags": ["new"]}
+    
+    try:
+        tool = FunctionTool(profile, cacheable=True)
+        first = asyncio.run(tool(user="ada")).result
+        first["tags"].append("changed")
+        second = asyncio.run(tool(user="ada")).result
+        second["user"] = "changed"
+        third = asyncio.run(tool(user="ada"))
+        assert third.metadata["cached"]
+        assert third.result == {"user": "ada", "tags": ["new"]}
+    finally:
+        set_tool_cache(previous)
+
+def test_tools_built_from_one_function_share_metadata():
+    assert FunctionTool(lookup).metadata is FunctionTool(lookup).metadata
+    assert FunctionTool(lookup, name="other").metadata.name == "other"
+    [parameter] = FunctionTool(lookup).metadata.parameters
+    assert (parameter.name, parameter.type, parameter.required) == ("query", "str", True)
+
+def test_metadata_cache_does_not_keep_closures_alive():
+    def make():
+        def scoped(query: str) -> str:
+            return query
+        return scoped
+    
+    before = len(base._metadata_cache)
+    tools = [FunctionTool(make()) for _ in range(5)]
+    assert len(base._metadata_cache) == before + 5
+    del tools
+    gc.collect()
+    assert len(base._metadata_cache) == before
+
+class Unhashable:
+    __hash__ = None
+    
+    def __call__(self, query: str) -> str:
+        return query
+
+def test_unhashable_callable_can_be_a_tool():
+    tool = FunctionTool(Unhashable(), name="echo")
+    assert [p.name for p in tool.metadata.parameters] == ["query"]
+    assert asyncio.run(tool(query="hi")).result == "hi"
+
+def test_metadata_is_hashable():
+    metadata = FunctionTool(lookup).metadata
+    assert hash(metadata) == hash(metadata.model_copy())
+    assert {metadata: 1}[metadata.model_copy()] == 1
+
+def test_metadata_copy_renders_its_own_prompt_and_schema():
+    metadata = FunctionTool(lookup).metadata
+    assert metadata.prompt_line == "- lookup: Look something up."
+    assert '"lookup"' in metadata.schema_json and metadata.json_schema["name"] == "lookup"
+    renamed = metadata.model_copy(update={"name": "find"})
+    assert renamed.prompt_line == "- find: Look something up."
+    assert renamed.json_schema["name"] == "find"
+    assert '"find"' in renamed.schema_json
+    assert metadata.prompt_line == "- lookup: Look something up."
+
+def make_tool(name, description):
+    return FunctionTool(lookup, name=name, description=description)
+
+WEATHER = make_tool("get_weather", "Current weather forecast for a city.")
+STOCKS = make_tool("stockQuote", "Latest stock price for a ticker symbol.")
+EMAIL = make_tool("send_email", "Send an email message to a recipient.")
+
+def test_index_splits_names_and_ranks_name_matches_first():
+    index = ToolIndex()
+    for tool in (WEATHER, STOCKS, EMAIL):
+        index.add_tool(tool)
+    assert tokenize("getWeather for_city") == ["get", "weather", "city"]
+    assert [tool for tool, _ in index.search("quote")] == [STOCKS]
+    assert index.search("unrelated words") == []
+    ranked = [tool.metadata.name for tool, _ in index.search("send weather email")]
+    assert ranked[0] == "send_email"
+
+def test_index_remove_and_replace():
+    index = ToolIndex()
+    index.add("a", ["alpha", "beta"])
+    index.add("b", ["beta"])
+    index.add("a", ["gamma"])
+    assert [name for name, _ in index.search("alpha")] == []
+    assert [name for name, _ in index.search("gamma")] == ["a"]
+    index.remove("b")
+    assert "b" not in index and len(index) == 1
+    assert index.search("beta") == []
+
+def test_toolset_lookup_and_first_name_wins():
+    duplicate = make_tool("get_weather", "Another weather tool.")
+    tools = ToolSet([WEATHER, STOCKS, duplicate])
+    assert tools.get("get_weather") is WEATHER
+    assert tools.get("missing") is None
+    assert "stockQuote" in tools and STOCKS in tools and EMAIL not in tools
+    assert tools.names() == ["get_weather", "stockQuote", "get_weather"]
+
+def test_toolset_add_leaves_original_untouched():
+    tools = ToolSet([WEATHER])
+    prompt = tools.prompt
+    added = tools.add(STOCKS)
+    assert tools.names() == ["get_weather"] and tools.prompt is prompt
+    assert added.names() == ["get_weather", "stockQuote"]
+    assert "stockQuote" in added.prompt and "stockQuote" not in prompt
+    assert ToolSet.of(added) is added
+
+def test_toolset_add_extends_a_built_index():
+    tools = ToolSet([WEATHER, STOCKS])
+    index = tools.index
+    added = tools.add(EMAIL)
+    assert added._index is not None and added._index is not index
+    assert "send_email" in added.index and "send_email" not in index
+    rebuilt = ToolSet([WEATHER, STOCKS, EMAIL]).index
+    for query in ("send weather email", "stock price", "city"):
+        assert added.index.search(query) == rebuilt.search(query)
+    # A shadowed name leaves the index as it was
+    shadowed = added.add(make_tool("stockQuote", "Another quote tool."))
+    assert shadowed.index is added.index
+    assert [tool for tool, _ in shadowed.index.search("quote")] == [STOCKS]
+
+def test_toolset_add_defers_an_unbuilt_index():
+    added = ToolSet([WEATHER]).add(STOCKS)
+    assert added._index is None
+    assert [tool for tool, _ in added.index.search("quote")] == [STOCKS]
+
+def test_index_copy_is_independent():
+    index = ToolIndex()
+    index.add("a", ["alpha", "beta"])
+    copied = index.copy()
+    copied.add("b", ["beta"])
+    copied.remove("a")
+    assert [name for name, _ in index.search("alpha beta")] == ["a"]
+    assert [name for name, _ in copied.search("alpha beta")] == ["b"]
+
+def test_toolset_equality_by_identity():
+    assert ToolSet([WEATHER, STOCKS]) == ToolSet([WEATHER, STOCKS])
+    assert hash(ToolSet([WEATHER, STOCKS])) == hash(ToolSet([WEATHER, STOCKS]))
+    assert ToolSet([WEATHER, STOCKS]) != ToolSet([STOCKS, WEATHER])
+
+def test_toolset_caches_rendered_forms():
+    tools = ToolSet([WEATHER, STOCKS])
+    assert tools.prompt is tools.prompt
+    assert tools.schema_json is tools.schema_json
+    assert tools.index is tools.index
+
+def test_toolset_select_ranks_then_fills():
+    tools = ToolSet([WEATHER, STOCKS, EMAIL])
+    assert tools.select("anything", limit=5) is tools
+    assert tools.select("stock price", limit=2).names() == ["stockQuote", "get_weather"]
+
+def test_search_tools_tool_lists_matches():
+    tools = ToolSet([WEATHER, STOCKS])
+    result = asyncio.run(tools.search_tool(query="weather"))
+    assert result.success
+    assert result.result == WEATHER.metadata.prompt_line
+    missing = asyncio.run(tools.search_tool(query="nothing"))
+    assert missing.result == "No matching tools."
+
+def process_id() -> int:
+    """Report the process the tool runs in."""
+    return os.getpid()
+
+def test_thread_mode_runs_off_the_loop():
+    def blocking_sleep() -> int:
+        """Block for a while, then report the thread."""
+        time.sleep(0.05)
+        return threading.get_ident()
+    
+    tool = FunctionTool(blocking_sleep, execution_mode="thread")
+    
+    async def scenario():
+        ticks = 0
+        
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+        
+        ticker = asyncio.ensure_future(tick())
+        result = await tool()
+        ticker.cancel()
+        return result, ticks
+    
+    result, ticks = asyncio.run(scenario())
+    assert result.success and result.result != threading.get_ident()
+    # The loop kept running while the tool blocked
+    assert ticks >= 3
+
+def test_process_mode_runs_in_another_process():
+    try:
+        result = asyncio.run(FunctionTool(process_id, execution_mode="process")())
+        assert result.success and result.result != os.getpid()
+    finally:
+        shutdown_pools()
+
+def test_process_mode_reports_unpicklable_functions():
+    def local_function() -> int:
+        """Defined inside a test, so it cannot be pickled."""
+        return 1
+    
+    try:
+        result = asyncio.run(FunctionTool(local_function, execution_mode="process")())
+        assert not result.success
+        assert result.error.startswith("Process-mode tools need a picklable function and arguments")
+        # The pool is still usable afterwards
+        assert asyncio.run(FunctionTool(process_id, execution_mode="process")()).success
+    finally:
+        shutdown_pools()
+
+def test_blocking_inline_tool_is_reported(caplog):
+    def hog() -> str:
+        """Hold the event loop."""
+        time.sleep(0.15)
+        return "done"
+    
+    tool = FunctionTool(hog, name="hog_for_blocking_test")
+    with caplog.at_level(logging.WARNING, logger="velocityai.tools.executors"):
+        assert asyncio.run(tool()).success
+        assert asyncio.run(tool()).success
+    warnings = [record for record in caplog.records if "hog_for_blocking_test" in record.getMessage()]
+    assert len(warnings) == 1
+    assert "execution_mode='thread'" in warnings[0].getMessage()
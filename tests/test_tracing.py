@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from velocityai.core.agent import Agent
+from velocityai.core.task import Task
+from velocityai.llms.mock import MockLLM
+from velocityai.observability import InMemoryCollector
+from velocityai.observability.tracing import Tracer, current_span, set_tracer
+from velocityai.tools.base import FunctionTool
+
+ACTION = '{"type": "action", "content": {"tool": "lookup", "parameters": {"query": "a"}}}'
+OUTPUT = '{"type": "output", "content": "done"}'
+
+def lookup(query: str) -> str:
+    """Look something up."""
+    return query
+
+@pytest.fixture
+def collector():
+    collector = InMemoryCollector()
+    previous = set_tracer(Tracer(collector))
+    yield collector
+    set_tracer(previous)
+
+def run(agent, task):
+    return asyncio.run(agent.execute_task(task))
+
+def test_task_span_hierarchy(collector):
+    run(Agent(llm=MockLLM([ACTION, OUTPUT])), Task("test task", tools=[FunctionTool(lookup)]))
+    [trace] = collector.traces().values()
+    by_id = {span.span_id: span for span in trace}
+    parents = {span.name: by_id[span.parent_id].name for span in trace if span.parent_id}
+    assert [span.name for span in trace if not span.parent_id] == ["agent.task"]
+    assert parents["agent.iteration"] == "agent.task"
+    assert parents["llm.chat"] == "agent.iteration"
+    assert parents["tool.call"] == "agent.iteration"
+    assert len(collector.find("agent.iteration")) == 2
+
+def test_task_span_not_started_until_iterated(collector):
+    agent = Agent(llm=MockLLM([OUTPUT]))
+    agent.stream_task(Task("test task"))
+    assert collector.spans == []
+
+def test_max_iterations_marks_task_span_as_error(collector):
+    agent = Agent(llm=MockLLM([ACTION]))
+    run(agent, Task("test task", tools=[FunctionTool(lookup)], max_iterations=2))
+    [task_span] = collector.find("agent.task")
+    assert task_span.status == 2
+
+def test_sampling_keeps_traces_whole():
+    collector = InMemoryCollector()
+    previous = set_tracer(Tracer(collector, sample_rate=0.3, seed=1))
+    try:
+        agent = Agent(llm=MockLLM([ACTION, OUTPUT]))
+        
+        async def run_all():
+            await asyncio.gather(*(
+                agent.execute_task(Task(f"task {i}", tools=[FunctionTool(lookup)]))
+                for i in range(20)
+            ))
+        
+        asyncio.run(run_all())
+    finally:
+        set_tracer(previous)
+    traces = collector.traces()
+    assert 0 < len(traces) < 20
+    for trace in traces.values():
+        ids = {span.span_id for span in trace}
+        assert all(span.parent_id in ids for span in trace if span.parent_id)
+        assert sum(1 for span in trace if span.name == "agent.task") == 1
+
+def test_early_break_leaves_no_current_span(collector):
+    agent = Agent(llm=MockLLM([ACTION, OUTPUT]))
+    
+    async def consume():
+        stream = agent.stream_task(Task("test task", tools=[FunctionTool(lookup)]))
+        async for _ in stream:
+            break
+        await stream.aclose()
+        return current_span()
+    
+    assert asyncio.run(consume()) is None
+    [task_span] = collector.find("agent.task")
+    assert task_span.end_ns is not None
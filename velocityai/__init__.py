@@ -2,14 +2,47 @@
 VelocityAI - A Modular AI Agent Framework
 """
 
+from typing import TYPE_CHECKING, Any, List
+
 __version__ = "0.1.0"
 
-from velocityai.core.agent import Agent
-from velocityai.core.task import Task
-from velocityai.tools.base import BaseTool, FunctionTool
-from velocityai.tools.registry import register_tool, ToolRegistry
-from velocityai.llms.base import BaseLLM
-from velocityai.core.executor import run
+# Public names and the modules defining them. They are imported on first
+# access so ``import velocityai`` stays cheap for short-lived processes.
+_EXPORTS = {
+    "Agent": "velocityai.core.agent",
+    "Task": "velocityai.core.task",
+    "BaseTool": "velocityai.tools.base",
+    "FunctionTool": "velocityai.tools.base",
+    "register_tool": "velocityai.tools.registry",
+    "ToolRegistry": "velocityai.tools.registry",
+    "ToolSet": "velocityai.tools.toolset",
+    "BaseLLM": "velocityai.llms.base",
+    "run": "velocityai.core.executor",
+    "run_many": "velocityai.core.executor",
+    "BatchExecutor": "velocityai.core.executor"
+}
+
+if TYPE_CHECKING:
+    from velocityai.core.agent import Agent
+    from velocityai.core.task import Task
+    from velocityai.tools.base import BaseTool, FunctionTool
+    from velocityai.tools.registry import register_tool, ToolRegistry
+    from velocityai.tools.toolset import ToolSet
+    from velocityai.llms.base import BaseLLM
+    from velocityai.core.executor import run, run_many, BatchExecutor
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_EXPORTS))
 
 __all__ = [
     "Agent",
@@ -18,6 +51,9 @@ __all__ = [
     "FunctionTool",
     "register_tool",
     "ToolRegistry",
+    "ToolSet",
     "BaseLLM",
-    "run"
-] 
\ No newline at end of file
+    "run",
+    "run_many",
+    "BatchExecutor"
+]
\ No newline at end of file
@@ -1,8 +1,45 @@
-from typing import Any, Dict, List, Optional
-import json
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import time
 
+from velocityai.core.context import ContextWindow, Summarizer
+from velocityai.core.events import (
+    ActionEvent, AgentEvent, ErrorEvent, ObservationEvent, OutputEvent,
+    TokenEvent, ToolEndEvent, ToolStartEvent
+)
+from velocityai.core.parsing import IncrementalActionParser
+from velocityai.core.steps import Action, Observation
 from velocityai.core.task import Task
 from velocityai.llms.base import BaseLLM
+from velocityai.observability.metrics import REGISTRY
+from velocityai.observability.profiling import TaskProfiler, profiled
+from velocityai.observability.tracing import NOOP_SPAN, get_tracer
+from velocityai.utils.serialization import loads
+
+T = TypeVar("T")
+
+RESPONSE_FORMAT = """Respond with a single JSON object and nothing else.
+To use a tool: {"type": "action", "content": {"tool": "<tool name>", "parameters": {...}}}
+To use several independent tools at once, give a list:
+{"type": "action", "content": [{"tool": "<tool name>", "parameters": {...}}, ...]}
+To finish: {"type": "output", "content": "<final result>"}"""
+
+AGENT_TASKS = REGISTRY.counter(
+    "velocityai_agent_tasks_total", "Finished tasks by outcome (output or max_iterations).", ("outcome",)
+)
+AGENT_ITERATIONS = REGISTRY.histogram(
+    "velocityai_agent_iterations", "Iterations a task took to finish.",
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50)
+)
+AGENT_TASK_DURATION = REGISTRY.histogram(
+    "velocityai_agent_task_duration_seconds", "Time from the start of a task to its final event."
+)
+AGENT_PARSE_FAILURES = REGISTRY.counter(
+    "velocityai_agent_parse_failures_total", "LLM responses that were not a JSON object."
+)
+
+# Speculatively started tool calls by action key, with their start times
+SpeculativeActions = Dict[str, List[Tuple["asyncio.Future[Tuple[str, bool]]", float]]]
 
 class Agent:
     """AI Agent that can execute tasks using LLMs and tools."""
@@ -11,56 +48,342 @@ class Agent:
         self,
         llm: BaseLLM,
         name: str = "Assistant",
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        max_parallel_tools: int = 4,
+        tool_timeout: Optional[float] = None,
+        speculative_tools: bool = True,
+        max_context_tokens: Optional[int] = 16000,
+        max_observation_tokens: Optional[int] = 2000,
+        summarizer: Optional[Summarizer] = None,
+        max_prompt_tools: Optional[int] = 20,
+        profiler: Optional[TaskProfiler] = None,
+        spill_dir: Optional[str] = None
     ):
+        if max_parallel_tools < 1:
+            raise ValueError("max_parallel_tools must be at least 1")
         self.llm = llm
         self.name = name
         self.description = description or f"AI Agent named {name}"
+        self.max_parallel_tools = max_parallel_tools
+        self.tool_timeout = tool_timeout
+        self.speculative_tools = speculative_tools
+        self.max_context_tokens = max_context_tokens
+        self.max_observation_tokens = max_observation_tokens
+        self.summarizer = summarizer
+        self.max_prompt_tools = max_prompt_tools
+        self.profiler = profiler
+        self.spill_dir = spill_dir
         
     async def execute_task(self, task: Task) -> Dict[str, Any]:
-        """Execute a task and return the result."""
-        messages = [
-            {"role": "system", "content": self.llm.get_system_prompt(task.tools)},
-            {"role": "user", "content": task.to_prompt()}
-        ]
+        """Execute a task and return the result.
+        
+        With a profiler, sampled tasks are profiled and their result gets a
+        "profile" entry.
+        """
+        if self.profiler is not None:
+            return await self.profiler.profile(self._execute_task(task), self.name)
+        return await self._execute_task(task)
+    
+    async def _execute_task(self, task: Task) -> Dict[str, Any]:
+        async for event in self.stream_task(task):
+            if isinstance(event, OutputEvent):
+                return {"content": event.content, "history": event.history}
+            if isinstance(event, ErrorEvent) and event.fatal:
+                return {"type": "error", "content": event.content, "history": event.history}
+        raise RuntimeError("stream_task ended without a result")
+    
+    async def stream_task(self, task: Task) -> AsyncIterator[AgentEvent]:
+        """Execute a task, yielding events as they happen.
         
-        for _ in range(task.max_iterations):
-            # Get next action from LLM
-            response = await self.llm.chat(messages)
+        Yields LLM token deltas, parsed actions, tool start/finish events and
+        observations, and ends with an OutputEvent or a fatal ErrorEvent.
+        When tracing is on, the task is an "agent.task" span with a child
+        span per iteration, under which LLM and tool calls are recorded.
+        """
+        tracer = get_tracer()
+        start = time.perf_counter()
+        # Spans are made current only while their children start (the LLM
+        # request and tool tasks), never while the caller handles an event
+        task_span = NOOP_SPAN
+        if tracer.enabled:
+            task_span = tracer.start_span("agent.task", {
+                "agent.name": self.name,
+                "task.tools": len(task.tools),
+                "task.max_iterations": task.max_iterations
+            })
+        span = NOOP_SPAN
+        parse_errors = 0
+        try:
+            # With many tools only the most relevant are listed; the rest can be
+            # found through the search meta-tool
+            tools = task.relevant_tools(self.max_prompt_tools)
+            if len(tools) < len(task.tools):
+                tools = tools.add(task.search_tool)
+            context = ContextWindow(
+                self.llm.get_system_prompt(self.name, tools) + "\n\n" + RESPONSE_FORMAT,
+                task.to_prompt(tools),
+                max_tokens=self.max_context_tokens,
+                max_observation_tokens=self.max_observation_tokens,
+                summarizer=self.summarizer,
+                spill_dir=self.spill_dir
+            )
+        
+            for iteration in range(task.max_iterations):
+                span.end()
+                span = tracer.start_span("agent.iteration", {"agent.iteration": iteration}, parent=task_span)
             
-            try:
-                step = json.loads(response)
-                task.add_to_history(step)
+                # Get next action from LLM. Side-effect free tools start as soon
+                # as their action is complete, while the response is still arriving.
+                chunks = []
+                parser = IncrementalActionParser() if self.speculative_tools else None
+                speculative: SpeculativeActions = {}
+                previous = tracer.activate(span)
+                stream = self.llm.observed_stream_chat(context.messages)
+                tracer.activate(previous)
+                try:
+                    async for chunk in stream:
+                        chunks.append(chunk)
+                        yield TokenEvent(iteration=iteration, text=chunk)
+                        if parser is not None:
+                            for _, action in parser.feed(chunk):
+                                self._speculate(task, Action.from_dict(action), speculative, span)
+                    response = "".join(chunks)
+                
+                    # The reply goes back verbatim so chat backends can continue the
+                    # same session instead of replaying the conversation.
+                    await context.add("assistant", response)
+                
+                    try:
+                        step = loads(response)
+                        if not isinstance(step, dict):
+                            raise ValueError("not a JSON object")
+                    except ValueError:
+                        self._discard(speculative)
+                        AGENT_PARSE_FAILURES.inc()
+                        parse_errors += 1
+                        error = "Failed to parse LLM response as JSON"
+                        task.add_to_history({"type": "error", "content": error})
+                        yield ErrorEvent(iteration=iteration, content=error)
+                        await context.add(
+                            "user", "Your last response was not valid JSON. Reply with a single JSON object."
+                        )
+                        continue
                 
-                if step["type"] == "output":
-                    return {"content": step["content"], "history": task.get_history()}
+                    task.add_to_history(step)
+                    if step.get("type") != "action":
+                        self._discard(speculative)
                 
-                if step["type"] == "action":
-                    # Execute tool and get observation
-                    tool_name = step["content"].get("tool")
-                    tool = task.get_tool(tool_name)
-                    if tool:
-                        result = await tool(
-                            **{k: v for k, v in step["content"].get("parameters", {}).items()}
+                    if step.get("type") == "output":
+                        _record_task("output", iteration + 1, start)
+                        # Callers stop iterating at the result, so end the spans first
+                        _end_spans(task_span, span, iteration + 1, parse_errors)
+                        yield OutputEvent(
+                            iteration=iteration, content=step.get("content"), history=task.get_history()
                         )
-                        observation = {
-                            "type": "observation",
-                            "content": str(result.result if result.success else result.error)
-                        }
-                        task.add_to_history(observation)
-                        messages.append({"role": "assistant", "content": json.dumps(observation)})
+                        return
+                
+                    if step.get("type") == "action":
+                        # Independent actions run together and report back in one turn
+                        content = step.get("content")
+                        many = isinstance(content, list)
+                        raw = content if many else [content]
+                        if not raw:
+                            self._discard(speculative)
+                            parse_errors += 1
+                            error = "Action list was empty"
+                            task.add_to_history({"type": "error", "content": error})
+                            yield ErrorEvent(iteration=iteration, content=error)
+                            await context.add(
+                                "user", "Your action list was empty. Give at least one action, or the output."
+                            )
+                            continue
+                        yield ActionEvent(iteration=iteration, actions=raw)
+                        batch = [Action.from_dict(action) for action in raw]
+                    
+                        results: List[str] = [""] * len(batch)
+                        async for event in self._run_actions(task, batch, iteration, speculative, span):
+                            if isinstance(event, ToolEndEvent):
+                                results[event.index] = event.result
+                            yield event
+                        
+                        observation = Observation(_observation(batch, results, many))
+                        task.add_to_history(observation.to_dict())
+                        yield ObservationEvent(iteration=iteration, content=observation.content)
                     
-                messages.append({"role": "assistant", "content": response})
+                        # Large outputs are clipped in the prompt only; history and
+                        # events keep them whole
+                        if self.max_observation_tokens is not None:
+                            share = max(1, self.max_observation_tokens // len(results))
+                            clipped = [context.clip(result, share) for result in results]
+                            if clipped != results:
+                                observation = Observation(_observation(batch, clipped, many))
+                        await context.add("user", observation.to_json())
+                    else:
+                        await context.add("user", "Continue with the next step.")
+                finally:
+                    # Also reached when the consumer stops iterating mid-stream
+                    self._discard(speculative)
                 
-            except json.JSONDecodeError:
-                task.add_to_history({
-                    "type": "error",
-                    "content": "Failed to parse LLM response as JSON"
-                })
-                continue
+            _record_task("max_iterations", task.max_iterations, start)
+            error = f"Task exceeded maximum iterations ({task.max_iterations})"
+            _end_spans(task_span, span, task.max_iterations, parse_errors, error)
+            yield ErrorEvent(
+                iteration=task.max_iterations,
+                content=error,
+                fatal=True,
+                history=task.get_history()
+            )
+        except Exception as e:
+            span.record_exception(e)
+            task_span.record_exception(e)
+            raise
+        finally:
+            span.end()
+            task_span.end()
+    
+    def _speculate(
+        self,
+        task: Task,
+        action: Action,
+        speculative: SpeculativeActions,
+        span: Any = NOOP_SPAN
+    ) -> None:
+        """Start a side-effect free action before the response is complete."""
+        tool = task.get_tool(action.tool)
+        if tool is None or not getattr(tool, "side_effect_free", False):
+            return
+        future = _start_under(span, self._run_action(task, action))
+        speculative.setdefault(action.key, []).append((future, time.perf_counter()))
+        
+    @staticmethod
+    def _discard(
+        speculative: SpeculativeActions
+    ) -> None:
+        """Cancel speculative actions the final response did not ask for."""
+        for started in speculative.values():
+            for future, _ in started:
+                if future.done():
+                    if not future.cancelled():
+                        future.exception()
+                else:
+                    future.cancel()
+        speculative.clear()
+        
+    async def _run_actions(
+        self,
+        task: Task,
+        actions: List[Action],
+        iteration: int,
+        speculative: Optional[SpeculativeActions] = None,
+        span: Any = NOOP_SPAN
+    ) -> AsyncIterator[AgentEvent]:
+        """Run a step's actions concurrently, at most max_parallel_tools at a time.
+        
+        Actions already started speculatively are awaited rather than run
+        again. Yields a ToolStartEvent and a ToolEndEvent per action as they
+        happen.
+        """
+        speculative = speculative if speculative is not None else {}
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+        events: "asyncio.Queue[AgentEvent]" = asyncio.Queue()
+        
+        async def run_one(index: int, action: Action) -> None:
+            tool_name = action.tool
+            started = speculative.get(action.key)
+            if started:
+                future, start = started.pop(0)
+            else:
+                future, start = None, 0.0
+            async with semaphore:
+                events.put_nowait(ToolStartEvent(
+                    iteration=iteration,
+                    tool=tool_name,
+                    parameters=action.parameters,
+                    index=index,
+                    speculative=future is not None
+                ))
+                if future is None:
+                    start = time.perf_counter()
+                try:
+                    if future is not None:
+                        result, success = await future
+                    else:
+                        result, success = await self._run_action(task, action)
+                except Exception as e:
+                    result, success = f"Tool {tool_name} failed: {e}", False
+                events.put_nowait(ToolEndEvent(
+                    iteration=iteration,
+                    tool=tool_name,
+                    result=result,
+                    success=success,
+                    duration=time.perf_counter() - start,
+                    index=index
+                ))
                 
-        return {
-            "type": "error",
-            "content": f"Task exceeded maximum iterations ({task.max_iterations})",
-            "history": task.get_history()
-        } 
\ No newline at end of file
+        runners = [
+            _start_under(span, run_one(index, action))
+            for index, action in enumerate(actions)
+        ]
+        try:
+            finished = 0
+            while finished < len(runners):
+                event = await events.get()
+                if isinstance(event, ToolEndEvent):
+                    finished += 1
+                yield event
+        finally:
+            for runner in runners:
+                runner.cancel()
+            # Whatever is left was not asked for by the final response
+            self._discard(speculative)
+    
+    async def _run_action(self, task: Task, action: Action) -> Tuple[str, bool]:
+        """Run a single action and describe its outcome."""
+        tool_name = action.tool
+        tool = task.get_tool(tool_name)
+        if tool is None:
+            return f"Unknown tool: {tool_name}", False
+        
+        try:
+            result = await asyncio.wait_for(
+                tool(**action.parameters), timeout=self.tool_timeout
+            )
+        except asyncio.TimeoutError:
+            return f"Tool {tool_name} timed out after {self.tool_timeout}s", False
+        return str(result.result if result.success else result.error), result.success
+
+def _observation(actions: List[Action], results: List[str], many: bool) -> Any:
+    """Pair results with their tools when the step asked for several."""
+    if many:
+        return [
+            {"tool": action.tool, "result": result}
+            for action, result in zip(actions, results)
+        ]
+    return results[0]
+
+def _record_task(outcome: str, iterations: int, start: float) -> None:
+    AGENT_TASKS.labels(outcome).inc()
+    AGENT_ITERATIONS.observe(iterations)
+    AGENT_TASK_DURATION.observe(time.perf_counter() - start)
+
+def _start_under(span: Any, coro: Awaitable[T]) -> "asyncio.Future[T]":
+    """Start coro as a task whose spans are children of span."""
+    tracer = get_tracer()
+    previous = tracer.activate(span)
+    try:
+        return asyncio.ensure_future(profiled(coro))
+    finally:
+        tracer.activate(previous)
+
+def _end_spans(
+    task_span: Any,
+    span: Any,
+    iterations: int,
+    parse_errors: int,
+    error: Optional[str] = None
+) -> None:
+    task_span.set_attributes({"agent.iterations": iterations, "agent.parse_errors": parse_errors})
+    if error is not None:
+        task_span.set_error(error)
+    span.end()
+    task_span.end()
@@ -0,0 +1,188 @@
+import logging
+import os
+import re
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from velocityai.utils.tokens import CHARS_PER_TOKEN, estimate_message_tokens, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Turns previous summary plus newly folded messages into the next summary
+Summarizer = Callable[[str, List[Dict[str, str]]], Awaitable[str]]
+
+# Characters of each folded message kept by the default summarizer
+SUMMARY_LINE_CHARS = 240
+
+async def summarize_steps(summary: str, messages: List[Dict[str, str]]) -> str:
+    """Default summarizer: one clipped line per folded message, no LLM call."""
+    lines = [summary] if summary else []
+    for message in messages:
+        label = "Step" if message["role"] == "assistant" else "Result"
+        text = re.sub(r"\s+", " ", message["content"]).strip()
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS] + "..."
+        lines.append(f"- {label}: {text}")
+    return "\n".join(lines)
+
+class ContextWindow:
+    """Token-budgeted conversation for an agent loop.
+    
+    The system prompt and task prompt are always sent verbatim. Large tool
+    outputs are clipped (and optionally spilled to files) before they enter
+    the conversation. Once the conversation exceeds ``max_tokens``, the
+    oldest steps are folded into a rolling summary until it is back under
+    ``compact_ratio`` of the budget, so compaction happens in occasional
+    batches and the prompt prefix stays stable in between. If the newest
+    steps alone are still too large, they are truncated: no prompt ever
+    exceeds ``max_tokens`` unless the system and task prompts alone do.
+    """
+    
+    def __init__(
+        self,
+        system_prompt: str,
+        task_prompt: str,
+        max_tokens: Optional[int] = 16000,
+        max_observation_tokens: Optional[int] = 2000,
+        keep_recent: int = 4,
+        compact_ratio: float = 0.75,
+        max_summary_tokens: int = 1000,
+        summarizer: Optional[Summarizer] = None,
+        spill_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            system_prompt: System prompt, never compacted
+            task_prompt: Task prompt, never compacted
+            max_tokens: Hard cap on estimated prompt tokens, or None for no cap
+            max_observation_tokens: Size tool outputs are clipped to, or None
+            keep_recent: Number of newest messages never folded into the summary
+            compact_ratio: Fraction of max_tokens to compact down to
+            max_summary_tokens: Size the rolling summary is kept under
+            summarizer: Async summarizer; defaults to summarize_steps
+            spill_dir: Directory to write clipped outputs to in full, or None
+        """
+        if not 0 < compact_ratio <= 1:
+            raise ValueError("compact_ratio must be between 0 and 1")
+        self.system_prompt = system_prompt
+        self.task_prompt = task_prompt
+        self.max_tokens = max_tokens
+        self.max_observation_tokens = max_observation_tokens
+        self.keep_recent = keep_recent
+        self.compact_ratio = compact_ratio
+        self.max_summary_tokens = max_summary_tokens
+        self.summarizer = summarizer or summarize_steps
+        self.spill_dir = spill_dir
+        self.summary = ""
+        self.folded = 0
+        self._recent: List[Dict[str, str]] = []
+        # Running estimate for _recent, so adding a message is O(1)
+        self._recent_tokens = 0
+        self._fixed_tokens = estimate_message_tokens([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": task_prompt}
+        ])
+        if max_tokens is not None and self._fixed_tokens > max_tokens:
+            logger.warning(
+                "System and task prompts (~%d tokens) exceed the context budget of %d",
+                self._fixed_tokens, max_tokens
+            )
+    
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        """The conversation to send for the next step."""
+        task = self.task_prompt
+        if self.summary:
+            task += "\n\nSummary of earlier steps:\n" + self.summary
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": task}
+        ] + self._recent
+    
+    def tokens(self) -> int:
+        """Estimated prompt tokens of the current conversation."""
+        summary = estimate_tokens(self.summary) + 8 if self.summary else 0
+        return self._fixed_tokens + summary + self._recent_tokens
+    
+    async def add(self, role: str, content: str) -> None:
+        """Append a message, compacting the conversation if it is over budget."""
+        message = {"role": role, "content": content}
+        self._recent.append(message)
+        self._recent_tokens += estimate_message_tokens([message])
+        if self.max_tokens is not None and self.tokens() > self.max_tokens:
+            await self._compact()
+    
+    def clip(self, text: str, max_tokens: Optional[int] = None) -> str:
+        """Shorten a tool output to the observation budget, keeping head and tail."""
+        limit = max_tokens if max_tokens is not None else self.max_observation_tokens
+        if limit is None or estimate_tokens(text) <= limit:
+            return text
+        note = ""
+        if self.spill_dir is not None:
+            note = "; full output in " + self._spill(text)
+        return _truncate(text, limit * CHARS_PER_TOKEN, note)
+    
+    async def _compact(self) -> None:
+        target = int(self.max_tokens * self.compact_ratio)
+        # Fold whole assistant/user pairs so roles keep alternating
+        folding = 0
+        tokens = self.tokens()
+        while (
+            tokens > target
+            and len(self._recent) - folding - 2 >= self.keep_recent
+        ):
+            tokens -= estimate_message_tokens(self._recent[folding:folding + 2])
+            folding += 2
+        
+        if folding:
+            folded, self._recent = self._recent[:folding], self._recent[folding:]
+            self._recent_tokens -= estimate_message_tokens(folded)
+            self.summary = await self.summarizer(self.summary, folded)
+            self.folded += folding
+            self.summary = _keep_tail(self.summary, self.max_summary_tokens * CHARS_PER_TOKEN)
+        
+        # Hard cap: truncate what is left, oldest first
+        over = self.tokens() - self.max_tokens
+        if over > 0 and self.summary:
+            allowed = max(0, len(self.summary) - over * CHARS_PER_TOKEN)
+            self.summary = _keep_tail(self.summary, allowed)
+            over = self.tokens() - self.max_tokens
+        for message in self._recent:
+            if over <= 0:
+                break
+            size = estimate_tokens(message["content"])
+            # Leave room for the truncation marker
+            allowed = max(16, size - over) * CHARS_PER_TOKEN - 64
+            message["content"] = _truncate(message["content"], allowed)
+            saved = size - estimate_tokens(message["content"])
+            self._recent_tokens -= saved
+            over -= saved
+    
+    def _spill(self, text: str) -> str:
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"observation-{uuid.uuid4().hex}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+def _truncate(text: str, max_chars: int, note: str = "") -> str:
+    """Keep the start and end of a text, marking what was cut."""
+    if len(text) <= max_chars:
+        return text
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    omitted = len(text) - head - tail
+    marker = f"\n...[{omitted} characters omitted{note}]...\n"
+    return text[:head] + marker + (text[-tail:] if tail else "")
+
+def _keep_tail(text: str, max_chars: int) -> str:
+    """Keep the newest lines of a summary within a size."""
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 0:
+        return ""
+    kept = text[-max_chars:]
+    newline = kept.find("\n")
+    if 0 <= newline < len(kept) - 1:
+        kept = kept[newline + 1:]
+    return "(earlier steps omitted)\n" + kept
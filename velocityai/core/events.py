@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+@dataclass
+class AgentEvent:
+    """Base class for events emitted while an agent works on a task."""
+    iteration: int
+
+@dataclass
+class TokenEvent(AgentEvent):
+    """A piece of the LLM response as it arrives."""
+    text: str
+
+@dataclass
+class ActionEvent(AgentEvent):
+    """The actions parsed from a complete LLM response."""
+    actions: List[Dict[str, Any]]
+
+@dataclass
+class ToolStartEvent(AgentEvent):
+    """A tool call is about to run, or is being awaited after a speculative start."""
+    tool: str
+    parameters: Dict[str, Any]
+    index: int = 0
+    speculative: bool = False
+
+@dataclass
+class ToolEndEvent(AgentEvent):
+    """A tool call finished, failed or timed out."""
+    tool: str
+    result: str
+    success: bool
+    duration: float
+    index: int = 0
+
+@dataclass
+class ObservationEvent(AgentEvent):
+    """The observation sent back to the LLM after a step's actions ran."""
+    content: Any
+
+@dataclass
+class OutputEvent(AgentEvent):
+    """The task's final output."""
+    content: Any
+    history: List[Dict[str, Any]] = field(default_factory=list)
+
+@dataclass
+class ErrorEvent(AgentEvent):
+    """Something went wrong. Fatal errors end the task."""
+    content: str
+    fatal: bool = False
+    history: Optional[List[Dict[str, Any]]] = None
@@ -1,16 +1,24 @@
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, Dict, Iterable, List, Optional, Set, Union
+)
 
 from velocityai.core.agent import Agent
 from velocityai.core.task import Task
 from velocityai.core.tool import Tool, FunctionTool
 from velocityai.llms.base import BaseLLM
+from velocityai.observability.profiling import TaskProfiler
+from velocityai.utils.stats import Reservoir
 
 async def run(
     llm: BaseLLM,
     task_description: str,
     tools: Optional[List[Union[Tool, FunctionTool]]] = None,
     context: Optional[Dict[str, Any]] = None,
-    max_iterations: int = 10
+    max_iterations: int = 10,
+    profiler: Optional[TaskProfiler] = None
 ) -> Dict[str, Any]:
     """
     Execute a task using an AI agent.
@@ -21,6 +29,7 @@ async def run(
         tools: List of tools available to the agent
         context: Additional context for the task
         max_iterations: Maximum number of iterations before giving up
+        profiler: Profiles sampled tasks, adding a "profile" entry to their result
         
     Returns:
         Dict containing the task result
@@ -34,9 +43,254 @@ async def run(
     )
     
     # Create agent
-    agent = Agent(llm=llm)
+    agent = Agent(llm=llm, profiler=profiler)
     
     # Execute task
     result = await agent.execute_task(task)
     
-    return result 
\ No newline at end of file
+    return result
+
+# A task spec is a description, a dict of ``run`` keyword arguments or a Task
+TaskSpec = Union[str, Dict[str, Any], Task]
+
+# Marks the end of a synchronous spec source
+_END: Any = object()
+
+@dataclass
+class BatchResult:
+    """Outcome of one task in a batch."""
+    index: int
+    spec: TaskSpec
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    latency: float = 0.0
+    
+    @property
+    def success(self) -> bool:
+        """Whether the task produced an output: it did not raise, time out or end in an agent error."""
+        return self.error is None
+
+@dataclass
+class BatchSummary:
+    """Throughput and latency figures for a batch run."""
+    total: int
+    succeeded: int
+    failed: int
+    timed_out: int
+    elapsed: float
+    throughput: float
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    latency_max: float
+
+class BatchExecutor:
+    """Run many tasks against one LLM with bounded concurrency.
+    
+    Specs are pulled from the input only as slots free up and results are
+    yielded as soon as each task finishes, so memory stays flat regardless
+    of how many tasks are submitted.
+    """
+    
+    def __init__(
+        self,
+        llm: BaseLLM,
+        concurrency: int = 10,
+        timeout: Optional[float] = None,
+        max_iterations: int = 10,
+        latency_sample_size: int = 10000,
+        profiler: Optional[TaskProfiler] = None
+    ):
+        """
+        Args:
+            llm: The language model shared by all tasks
+            concurrency: Maximum number of tasks running at once
+            timeout: Per-task timeout in seconds, or None for no limit
+            max_iterations: Default iteration limit for specs that don't set one
+            latency_sample_size: Number of latencies kept for percentile estimates
+            profiler: Profiles a sample of the tasks, shared by all of them
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.llm = llm
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_iterations = max_iterations
+        self.profiler = profiler
+        self._latencies = Reservoir(latency_sample_size)
+        self._max_latency = 0.0
+        self._succeeded = 0
+        self._failed = 0
+        self._timed_out = 0
+        # Time spent in finished streams, and the start of the running one
+        self._elapsed = 0.0
+        self._started: Optional[float] = None
+    
+    async def stream(
+        self,
+        specs: Union[Iterable[TaskSpec], AsyncIterable[TaskSpec]]
+    ) -> AsyncIterator[BatchResult]:
+        """Run the given task specs and yield results in completion order.
+        
+        Results are yielded as tasks finish, even while an async source is
+        waiting for its next spec.
+        """
+        self._started = time.perf_counter()
+        pending: Set["asyncio.Future[BatchResult]"] = set()
+        # An async source is awaited alongside the running tasks
+        source = specs.__aiter__() if hasattr(specs, "__aiter__") else None
+        iterator = iter(specs) if source is None else None
+        next_spec: Optional["asyncio.Future[TaskSpec]"] = None
+        exhausted = False
+        index = 0
+        try:
+            while True:
+                while not exhausted and next_spec is None and len(pending) < self.concurrency:
+                    if source is not None:
+                        next_spec = asyncio.ensure_future(source.__anext__())
+                        break
+                    spec = next(iterator, _END)
+                    if spec is _END:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(self._run_one(index, spec)))
+                        index += 1
+                
+                waiting = pending if next_spec is None else pending | {next_spec}
+                if not waiting:
+                    return
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future is not next_spec:
+                        pending.discard(future)
+                        yield future.result()
+                
+                if next_spec is not None and next_spec.done():
+                    future, next_spec = next_spec, None
+                    try:
+                        spec = future.result()
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(self._run_one(index, spec)))
+                        index += 1
+        finally:
+            # Consumer stopped early or was cancelled
+            if next_spec is not None:
+                pending.add(next_spec)
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self._elapsed += time.perf_counter() - self._started
+            self._started = None
+    
+    async def run(
+        self,
+        specs: Union[Iterable[TaskSpec], AsyncIterable[TaskSpec]]
+    ) -> List[BatchResult]:
+        """Run the given task specs and collect all results in input order."""
+        results = [result async for result in self.stream(specs)]
+        results.sort(key=lambda result: result.index)
+        return results
+    
+    def summary(self) -> BatchSummary:
+        """Summarise everything this executor has run so far.
+        
+        Throughput is over the time spent in ``stream``, so gaps between
+        batches do not count.
+        """
+        total = self._succeeded + self._failed
+        elapsed = self._elapsed
+        if self._started is not None:
+            elapsed += time.perf_counter() - self._started
+        latencies = self._latencies.percentiles(50, 95, 99)
+        return BatchSummary(
+            total=total,
+            succeeded=self._succeeded,
+            failed=self._failed,
+            timed_out=self._timed_out,
+            elapsed=elapsed,
+            throughput=total / elapsed if elapsed > 0 else 0.0,
+            latency_p50=latencies[50],
+            latency_p95=latencies[95],
+            latency_p99=latencies[99],
+            latency_max=self._max_latency
+        )
+    
+    async def _run_one(self, index: int, spec: TaskSpec) -> BatchResult:
+        start = time.perf_counter()
+        batch_result = BatchResult(index=index, spec=spec)
+        try:
+            batch_result.result = await asyncio.wait_for(
+                self._execute(spec), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            batch_result.timed_out = True
+            batch_result.error = f"Task timed out after {self.timeout}s"
+        except Exception as e:
+            batch_result.error = str(e) or type(e).__name__
+        else:
+            if batch_result.result.get("type") == "error":
+                batch_result.error = str(batch_result.result.get("content") or "Task failed")
+        batch_result.latency = time.perf_counter() - start
+        self._record(batch_result)
+        return batch_result
+    
+    def _execute(self, spec: TaskSpec) -> Awaitable[Dict[str, Any]]:
+        if isinstance(spec, Task):
+            return Agent(llm=self.llm, profiler=self.profiler).execute_task(spec)
+        if isinstance(spec, str):
+            return run(self.llm, spec, max_iterations=self.max_iterations, profiler=self.profiler)
+        if isinstance(spec, dict):
+            kwargs = dict(spec)
+            kwargs.setdefault("max_iterations", self.max_iterations)
+            kwargs.setdefault("profiler", self.profiler)
+            return run(self.llm, **kwargs)
+        raise TypeError(f"Unsupported task spec type: {type(spec).__name__}")
+    
+    def _record(self, batch_result: BatchResult) -> None:
+        self._latencies.add(batch_result.latency)
+        self._max_latency = max(self._max_latency, batch_result.latency)
+        if batch_result.success:
+            self._succeeded += 1
+        else:
+            self._failed += 1
+            if batch_result.timed_out:
+                self._timed_out += 1
+
+async def run_many(
+    llm: BaseLLM,
+    specs: Union[Iterable[TaskSpec], AsyncIterable[TaskSpec]],
+    concurrency: int = 10,
+    timeout: Optional[float] = None,
+    max_iterations: int = 10,
+    profiler: Optional[TaskProfiler] = None,
+    executor: Optional[BatchExecutor] = None
+) -> AsyncIterator[BatchResult]:
+    """
+    Execute many tasks with bounded concurrency, yielding results as they finish.
+    
+    Args:
+        llm: The language model shared by all tasks
+        specs: Task descriptions, dicts of ``run`` keyword arguments or Task objects
+        concurrency: Maximum number of tasks running at once
+        timeout: Per-task timeout in seconds, or None for no limit
+        max_iterations: Default iteration limit for specs that don't set one
+        profiler: Profiles a sample of the tasks
+        executor: Executor to run on instead of a new one, so its summary()
+            can be read afterwards; llm and the other options are then ignored
+    
+    Yields:
+        BatchResult for each task in completion order
+    """
+    if executor is None:
+        executor = BatchExecutor(
+            llm,
+            concurrency=concurrency,
+            timeout=timeout,
+            max_iterations=max_iterations,
+            profiler=profiler
+        )
+    async for result in executor.stream(specs):
+        yield result
@@ -0,0 +1,111 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+class IncrementalActionParser:
+    """Pick tool actions out of a step response while it is still streaming.
+    
+    Feed the response text chunk by chunk. As soon as an action object
+    (``{"tool": ..., "parameters": {...}}``) under the top-level
+    ``"content"`` key is syntactically closed, it is returned together with
+    its position in the action list, even though the rest of the response
+    has not arrived yet.
+    """
+    
+    def __init__(self):
+        self._text = ""
+        self._position = 0
+        self._started = False
+        self._finished = False
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        # One frame per open container: [kind, start, current key, expecting key, items seen]
+        self._stack: List[List[Any]] = []
+    
+    def feed(self, chunk: str) -> List[Tuple[int, Dict[str, Any]]]:
+        """Consume more response text and return the actions it completes."""
+        self._text += chunk
+        actions: List[Tuple[int, Dict[str, Any]]] = []
+        text = self._text
+        
+        while self._position < len(text) and not self._finished:
+            char = text[self._position]
+            
+            if not self._started:
+                # Skip anything before the top-level object, e.g. a code fence
+                if char == "{":
+                    self._started = True
+                    self._open("{")
+                self._position += 1
+                continue
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string()
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._position
+            elif char in "{[":
+                self._open(char)
+            elif char in "}]":
+                action = self._close()
+                if action is not None:
+                    actions.append(action)
+            elif char == ":" and self._stack and self._stack[-1][0] == "{":
+                self._stack[-1][3] = False
+            elif char == ",":
+                frame = self._stack[-1]
+                frame[4] += 1
+                if frame[0] == "{":
+                    frame[3] = True
+            self._position += 1
+        
+        return actions
+    
+    def _open(self, kind: str) -> None:
+        if self._stack:
+            self._stack[-1][3] = False
+        self._stack.append([kind, self._position, None, kind == "{", 0])
+    
+    def _close_string(self) -> None:
+        frame = self._stack[-1]
+        if frame[0] == "{" and frame[3]:
+            try:
+                frame[2] = json.loads(self._text[self._string_start:self._position + 1])
+            except ValueError:
+                frame[2] = None
+    
+    def _close(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        frame = self._stack.pop()
+        if not self._stack:
+            self._finished = True
+            return None
+        if frame[0] != "{":
+            return None
+        
+        parent = self._stack[-1]
+        if len(self._stack) == 1 and parent[2] == "content":
+            # {"content": {...}}
+            index = 0
+        elif (
+            len(self._stack) == 2
+            and parent[0] == "["
+            and self._stack[0][2] == "content"
+        ):
+            # {"content": [{...}, ...]}
+            index = parent[4]
+        else:
+            return None
+        
+        try:
+            action = json.loads(self._text[frame[1]:self._position + 1])
+        except ValueError:
+            return None
+        if not isinstance(action, dict) or "tool" not in action:
+            return None
+        return index, action
@@ -0,0 +1,60 @@
+from typing import Any, Dict, Optional
+
+from velocityai.utils.serialization import dumps
+
+class Action:
+    """A tool call requested by the LLM."""
+    __slots__ = ("tool", "parameters", "_key")
+    
+    def __init__(self, tool: str, parameters: Optional[Dict[str, Any]] = None):
+        self.tool = tool
+        self.parameters = parameters if parameters is not None else {}
+        self._key: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, data: Any) -> "Action":
+        """Build an action from parsed LLM output, tolerating malformed entries.
+        
+        Anything unusable becomes an action for a tool that does not exist,
+        so the model is told about it rather than the step failing.
+        """
+        if not isinstance(data, dict):
+            return cls(str(data))
+        parameters = data.get("parameters")
+        return cls(
+            str(data.get("tool")),
+            parameters if isinstance(parameters, dict) else {}
+        )
+    
+    @property
+    def key(self) -> str:
+        """Identifies the call by tool and parameters; computed once."""
+        if self._key is None:
+            self._key = dumps([self.tool, self.parameters], sort_keys=True)
+        return self._key
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"tool": self.tool, "parameters": self.parameters}
+    
+    def __repr__(self) -> str:
+        return f"Action(tool={self.tool!r}, parameters={self.parameters!r})"
+
+class Observation:
+    """Results of a step's actions as sent back to the LLM."""
+    __slots__ = ("content", "_json")
+    
+    def __init__(self, content: Any):
+        self.content = content
+        self._json: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "observation", "content": self.content}
+    
+    def to_json(self) -> str:
+        """The message text, serialized on first use."""
+        if self._json is None:
+            self._json = dumps(self.to_dict())
+        return self._json
+    
+    def __repr__(self) -> str:
+        return f"Observation(content={self.content!r})"
@@ -1,5 +1,7 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from velocityai.core.tool import Tool
+from velocityai.tools.index import SEARCH_TOOLS_NAME, SearchToolsTool
+from velocityai.tools.toolset import ToolSet
 
 class Task:
     """Represents a task to be executed by an AI agent."""
@@ -7,19 +9,28 @@ class Task:
     def __init__(
         self,
         description: str,
-        tools: Optional[List[Tool]] = None,
+        tools: Optional[Union[List[Tool], ToolSet]] = None,
         context: Optional[Dict[str, Any]] = None,
         max_iterations: int = 10
     ):
         self.description = description
-        self.tools = tools or []
+        # A ToolSet is shared as is, so many tasks can use one without copying
+        self.tools = tools
         self.context = context or {}
         self.max_iterations = max_iterations
         self.history: List[Dict[str, Any]] = []
+    
+    @property
+    def tools(self) -> ToolSet:
+        return self._tools
+    
+    @tools.setter
+    def tools(self, tools: Optional[Union[List[Tool], ToolSet]]) -> None:
+        self._tools = ToolSet.of(tools)
         
     def add_tool(self, tool: Tool) -> None:
-        """Add a tool to the task."""
-        self.tools.append(tool)
+        """Add a tool to the task, leaving any shared ToolSet unchanged."""
+        self._tools = self._tools.add(tool)
         
     def add_context(self, key: str, value: Any) -> None:
         """Add context information to the task."""
@@ -27,10 +38,20 @@ class Task:
         
     def get_tool(self, name: str) -> Optional[Tool]:
         """Get a tool by name."""
-        for tool in self.tools:
-            if tool.metadata.name == name:
-                return tool
-        return None
+        tool = self._tools.get(name)
+        if tool is None and name == SEARCH_TOOLS_NAME and self._tools:
+            return self._tools.search_tool
+        return tool
+    
+    @property
+    def search_tool(self) -> SearchToolsTool:
+        """Meta-tool letting the model find tools left out of the prompt."""
+        return self._tools.search_tool
+    
+    def relevant_tools(self, limit: Optional[int] = None) -> ToolSet:
+        """Get up to limit tools ranked by relevance to the task, or all if they fit."""
+        query = " ".join([self.description] + [str(value) for value in self.context.values()])
+        return self._tools.select(query, limit)
     
     def add_to_history(self, step: Dict[str, Any]) -> None:
         """Add a step to the task history."""
@@ -40,11 +61,9 @@ class Task:
         """Get the task execution history."""
         return self.history
     
-    def to_prompt(self) -> str:
-        """Convert task to a prompt for the LLM."""
-        tool_descriptions = "\n".join(
-            [f"- {tool.metadata.name}: {tool.metadata.description}" for tool in self.tools]
-        )
+    def to_prompt(self, tools: Optional[ToolSet] = None) -> str:
+        """Convert task to a prompt for the LLM, listing the given tools or all of them."""
+        tool_descriptions = (tools if tools is not None else self._tools).prompt
         
         context_str = "\n".join(
             [f"{key}: {value}" for key, value in self.context.items()]
@@ -0,0 +1,49 @@
+"""
+LLM backends and wrappers. Backends are imported on first access, so
+their SDKs only load when used.
+"""
+
+from typing import TYPE_CHECKING, Any, List
+
+_EXPORTS = {
+    "BaseLLM": "velocityai.llms.base",
+    "LLMWrapper": "velocityai.llms.base",
+    "LLMConfig": "velocityai.llms.config",
+    "GeminiLLM": "velocityai.llms.gemini",
+    "CachedLLM": "velocityai.llms.cache",
+    "LLMCache": "velocityai.llms.cache",
+    "CoalescingLLM": "velocityai.llms.coalesce",
+    "RateLimitedLLM": "velocityai.llms.ratelimit",
+    "RateLimiter": "velocityai.llms.ratelimit",
+    "ResilientLLM": "velocityai.llms.resilience",
+    "RetryPolicy": "velocityai.llms.resilience",
+    "HedgePolicy": "velocityai.llms.resilience",
+    "MockLLM": "velocityai.llms.mock",
+    "RecordingLLM": "velocityai.llms.replay",
+    "ReplayLLM": "velocityai.llms.replay"
+}
+
+if TYPE_CHECKING:
+    from velocityai.llms.base import BaseLLM, LLMWrapper
+    from velocityai.llms.config import LLMConfig
+    from velocityai.llms.gemini import GeminiLLM
+    from velocityai.llms.cache import CachedLLM, LLMCache
+    from velocityai.llms.coalesce import CoalescingLLM
+    from velocityai.llms.ratelimit import RateLimitedLLM, RateLimiter
+    from velocityai.llms.resilience import ResilientLLM, RetryPolicy, HedgePolicy
+    from velocityai.llms.mock import MockLLM
+    from velocityai.llms.replay import RecordingLLM, ReplayLLM
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_EXPORTS))
+
+__all__ = list(_EXPORTS)
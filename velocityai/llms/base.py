@@ -1,11 +1,67 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import inspect
+import time
+
+from velocityai.observability.metrics import REGISTRY
+from velocityai.observability.tracing import get_tracer
+from velocityai.utils.tokens import estimate_message_tokens, estimate_tokens
+
+LLM_REQUESTS = REGISTRY.counter("velocityai_llm_requests_total", "Requests that reached a backend.", ("llm",))
+LLM_ERRORS = REGISTRY.counter(
+    "velocityai_llm_errors_total", "Backend requests that raised, by exception type.", ("llm", "error")
+)
+LLM_PROMPT_TOKENS = REGISTRY.counter(
+    "velocityai_llm_prompt_tokens_total", "Estimated prompt tokens sent.", ("llm",)
+)
+LLM_COMPLETION_TOKENS = REGISTRY.counter(
+    "velocityai_llm_completion_tokens_total", "Estimated completion tokens received.", ("llm",)
+)
+LLM_DURATION = REGISTRY.histogram(
+    "velocityai_llm_request_duration_seconds", "Time from request to the end of the response.", ("llm",)
+)
+LLM_FIRST_TOKEN = REGISTRY.histogram(
+    "velocityai_llm_time_to_first_token_seconds", "Time from request to the first streamed chunk.", ("llm",)
+)
+
+# Set while a backend request is being recorded, so backend methods
+# implemented with one another are counted once
+_metering: ContextVar[bool] = ContextVar("velocityai_llm_metering", default=False)
+
+# Entry points recorded in the LLM metrics, and whether their first
+# argument is a prompt (rather than chat messages)
+_METERED = {
+    "generate": True,
+    "chat": False,
+    "stream_generate_content": True,
+    "stream_chat": False
+}
 
 class BaseLLM(ABC):
     """Base class for all Language Models in Velocity."""
     
+    # Backends record every request in the LLM metrics; wrappers leave it
+    # to the backend they wrap, so retries and hedges count and cache hits
+    # do not
+    metered = True
+    
     def __init__(self, **kwargs):
         self.config = kwargs
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not cls.metered:
+            return
+        for name, is_prompt in _METERED.items():
+            method = cls.__dict__.get(name)
+            if method is None or getattr(method, "__isabstractmethod__", False):
+                continue
+            if inspect.isasyncgenfunction(method):
+                setattr(cls, name, _metered_stream(method, is_prompt))
+            elif inspect.iscoroutinefunction(method):
+                setattr(cls, name, _metered_call(method, is_prompt))
         
     @abstractmethod
     async def generate(self, prompt: str, **kwargs) -> str:
@@ -17,15 +73,182 @@ class BaseLLM(ABC):
         """Generate a response in a chat context."""
         pass
     
+    async def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream a response for the given prompt.
+        
+        Backends without native streaming yield the whole response at once.
+        """
+        yield await self.generate(prompt, **kwargs)
+        
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Stream a response in a chat context.
+        
+        Backends without native streaming yield the whole response at once.
+        """
+        yield await self.chat(messages, **kwargs)
+    
+    def observed_stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """stream_chat recorded as an "llm.chat" span.
+        
+        The span carries estimated prompt and completion token counts and
+        the time to first token. Agents call this rather than stream_chat
+        so each request is recorded once, however many wrappers it passes.
+        """
+        span = get_tracer().start_span("llm.chat", {"llm.name": type(self).__name__})
+        if not span.recording:
+            return self.stream_chat(messages, **kwargs)
+        return self._traced_stream_chat(span, messages, **kwargs)
+    
+    async def _traced_stream_chat(self, span: Any, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        chunks: List[str] = []
+        try:
+            async for chunk in self.stream_chat(messages, **kwargs):
+                if not chunks:
+                    span.set_attribute("llm.time_to_first_token_ms", (time.perf_counter() - start) * 1000)
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.set_attributes({
+                "llm.prompt_tokens": estimate_message_tokens(messages),
+                "llm.completion_tokens": estimate_tokens("".join(chunks)),
+                "llm.chunks": len(chunks)
+            })
+            span.end()
+    
+    async def aclose(self) -> None:
+        """Release connections or other resources held by the LLM."""
+        pass
+    
+    def describe(self) -> Dict[str, Any]:
+        """Describe the model and settings that determine this LLM's output."""
+        config = self.config
+        if hasattr(config, "model_dump"):
+            config = config.model_dump()
+        return {"llm": type(self).__name__, "config": config}
+    
     def get_system_prompt(self, role: str, tools: Optional[List["BaseTool"]] = None) -> str:
         """Get the system prompt for an agent with a specific role."""
         base_prompt = f"""You are an AI assistant specialized as a {role}. You communicate naturally and clearly.
 Your responses should be informative and well-structured."""
         
         if tools:
-            tool_descriptions = "\n".join(
-                [f"- {tool.metadata.name}: {tool.metadata.description}" for tool in tools]
+            # A ToolSet carries its tool list pre-rendered
+            tool_descriptions = getattr(tools, "prompt", None) or "\n".join(
+                [tool.metadata.prompt_line for tool in tools]
             )
             base_prompt += f"\n\nYou have access to the following tools:\n{tool_descriptions}"
             
-        return base_prompt 
\ No newline at end of file
+        return base_prompt
+
+class LLMWrapper(BaseLLM):
+    """Base class for LLMs that add behaviour around another LLM.
+    
+    Every call is forwarded to the wrapped LLM; subclasses override the ones
+    they change. Attributes not defined on the wrapper resolve on the wrapped
+    LLM, so wrappers can be stacked freely.
+    """
+    
+    metered = False
+    
+    def __init__(self, llm: BaseLLM):
+        # No BaseLLM.__init__: ``config`` resolves on the wrapped LLM
+        self.llm = llm
+        
+    async def generate(self, prompt: str, **kwargs) -> str:
+        return await self.llm.generate(prompt, **kwargs)
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return await self.llm.chat(messages, **kwargs)
+    
+    async def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        async for chunk in self.llm.stream_generate_content(prompt, **kwargs):
+            yield chunk
+            
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        async for chunk in self.llm.stream_chat(messages, **kwargs):
+            yield chunk
+            
+    def get_system_prompt(self, role: str, tools: Optional[List["BaseTool"]] = None) -> str:
+        return self.llm.get_system_prompt(role, tools)
+    
+    async def aclose(self) -> None:
+        await self.llm.aclose()
+        
+    def describe(self) -> Dict[str, Any]:
+        return self.llm.describe()
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes missing on the wrapper itself
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+def _prompt_tokens(is_prompt: bool, args: tuple, kwargs: Dict[str, Any]) -> int:
+    request = args[0] if args else kwargs.get("prompt" if is_prompt else "messages")
+    if is_prompt:
+        return estimate_tokens(request or "")
+    return estimate_message_tokens(request or [])
+
+def _record_request(name: str, start: float, prompt_tokens: int, completion: str) -> None:
+    LLM_REQUESTS.labels(name).inc()
+    LLM_DURATION.labels(name).observe(time.perf_counter() - start)
+    LLM_PROMPT_TOKENS.labels(name).inc(prompt_tokens)
+    LLM_COMPLETION_TOKENS.labels(name).inc(estimate_tokens(completion))
+
+def _metered_call(method: Callable[..., Any], is_prompt: bool) -> Callable[..., Any]:
+    @wraps(method)
+    async def metered(self: BaseLLM, *args, **kwargs) -> str:
+        if _metering.get():
+            return await method(self, *args, **kwargs)
+        name = type(self).__name__
+        start = time.perf_counter()
+        token = _metering.set(True)
+        try:
+            result = await method(self, *args, **kwargs)
+        except Exception as e:
+            LLM_ERRORS.labels(name, type(e).__name__).inc()
+            _record_request(name, start, _prompt_tokens(is_prompt, args, kwargs), "")
+            raise
+        finally:
+            _metering.reset(token)
+        completion = result if isinstance(result, str) else ""
+        _record_request(name, start, _prompt_tokens(is_prompt, args, kwargs), completion)
+        return result
+    return metered
+
+def _metered_stream(method: Callable[..., Any], is_prompt: bool) -> Callable[..., Any]:
+    @wraps(method)
+    async def metered(self: BaseLLM, *args, **kwargs) -> AsyncIterator[str]:
+        if _metering.get():
+            async for chunk in method(self, *args, **kwargs):
+                yield chunk
+            return
+        name = type(self).__name__
+        start = time.perf_counter()
+        stream = method(self, *args, **kwargs)
+        chunks: List[str] = []
+        try:
+            while True:
+                # Only while the backend runs, never across a yield
+                token = _metering.set(True)
+                try:
+                    chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    _metering.reset(token)
+                if not chunks:
+                    LLM_FIRST_TOKEN.labels(name).observe(time.perf_counter() - start)
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            LLM_ERRORS.labels(name, type(e).__name__).inc()
+            raise
+        finally:
+            await stream.aclose()
+            _record_request(name, start, _prompt_tokens(is_prompt, args, kwargs), "".join(chunks))
+    return metered
@@ -0,0 +1,262 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
+
+from velocityai.llms.base import BaseLLM, LLMWrapper
+from velocityai.observability.metrics import CACHE_REQUESTS
+from velocityai.utils.lru import LRUCache
+
+_HITS = CACHE_REQUESTS.labels("llm", "hit")
+_MISSES = CACHE_REQUESTS.labels("llm", "miss")
+
+def request_key(llm: BaseLLM, kind: str, payload: Any, kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """Build a stable key for an LLM request from the model, its settings and the input."""
+    document = {
+        "model": llm.describe(),
+        "kind": kind,
+        "payload": payload,
+        "kwargs": kwargs or {}
+    }
+    encoded = json.dumps(document, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for an LLMCache."""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+    
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses
+    
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+class SQLiteCache:
+    """Persistent response store backed by a SQLite file.
+    
+    Entries expire after their TTL and the least recently read entries are
+    pruned once the store grows past ``max_entries``. Calls block, so async
+    code should run them in an executor (LLMCache does).
+    """
+    
+    # Number of writes between size checks, so a write rarely pays for a scan
+    PRUNE_INTERVAL = 100
+    
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: int = 100000):
+        """
+        Args:
+            path: Database file path
+            ttl: Default time to live in seconds, or None for no expiry
+            max_entries: Number of entries kept before the oldest are pruned
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a stored value, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(value)
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value."""
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else now + ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now)
+            )
+            self._writes += 1
+            if self._writes >= self.PRUNE_INTERVAL:
+                self._writes = 0
+                self._prune(now)
+    
+    def _prune(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,)
+            )
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        return count
+
+class LLMCache:
+    """Two-tier response cache: a bounded in-memory LRU in front of an optional SQLite store."""
+    
+    def __init__(
+        self,
+        max_memory_entries: int = 1024,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_disk_entries: int = 100000
+    ):
+        """
+        Args:
+            max_memory_entries: Number of responses kept in memory
+            path: SQLite file for the persistent tier; memory only if not given
+            ttl: Time to live in seconds for both tiers, or None for no expiry
+            max_disk_entries: Number of responses kept on disk
+        """
+        self.memory: LRUCache[Any] = LRUCache(max_memory_entries, ttl=ttl)
+        self.disk = SQLiteCache(path, ttl=ttl, max_entries=max_disk_entries) if path else None
+        self.stats = CacheStats()
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Look a key up in memory, then on disk. Returns None on a miss."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats.memory_hits += 1
+            _HITS.inc()
+            return value
+        
+        if self.disk is not None:
+            loop = asyncio.get_running_loop()
+            value = await loop.run_in_executor(None, self.disk.get, key)
+            if value is not None:
+                self.memory.set(key, value)
+                self.stats.disk_hits += 1
+                _HITS.inc()
+                return value
+        
+        self.stats.misses += 1
+        _MISSES.inc()
+        return None
+    
+    async def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers."""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.disk.set, key, value)
+    
+    async def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        self.memory.clear()
+        if self.disk is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.disk.clear)
+    
+    def close(self) -> None:
+        """Release the persistent store."""
+        if self.disk is not None:
+            self.disk.close()
+
+class CachedLLM(LLMWrapper):
+    """LLM wrapper that serves repeated requests from an LLMCache.
+    
+    Requests are keyed on the wrapped model's settings plus the prompt or
+    messages and call arguments. A streamed response is stored once it has
+    been read to the end and shares its entry with the non-streaming call
+    for the same input.
+    """
+    
+    def __init__(self, llm: BaseLLM, cache: Optional[LLMCache] = None):
+        super().__init__(llm)
+        self.cache = cache or LLMCache()
+    
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        key = request_key(self.llm, "generate", prompt, kwargs)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self.llm.generate(prompt, **kwargs)
+        await self.cache.set(key, response)
+        return response
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        key = request_key(self.llm, "chat", messages, kwargs)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self.llm.chat(messages, **kwargs)
+        await self.cache.set(key, response)
+        return response
+    
+    # Return the inner generator itself, so closing the stream reaches its cleanup
+    def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        key = request_key(self.llm, "generate", prompt, kwargs)
+        return self._stream(key, self.llm.stream_generate_content(prompt, **kwargs))
+            
+    def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        key = request_key(self.llm, "chat", messages, kwargs)
+        return self._stream(key, self.llm.stream_chat(messages, **kwargs))
+            
+    async def _stream(self, key: str, source: AsyncGenerator[str, None]) -> AsyncIterator[str]:
+        try:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+            
+            chunks = []
+            async for chunk in source:
+                chunks.append(chunk)
+                yield chunk
+            # Only reached when the stream was consumed completely
+            await self.cache.set(key, "".join(chunks))
+        finally:
+            # Release the backend's request when the consumer stops early
+            await source.aclose()
@@ -0,0 +1,175 @@
+import asyncio
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from velocityai.llms.base import BaseLLM, LLMWrapper
+from velocityai.llms.cache import request_key
+
+T = TypeVar("T")
+
+class SharedCallCancelled(RuntimeError):
+    """The call a coalesced stream was reading was cancelled by someone else."""
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers that use the same key.
+    
+    The call runs as its own task, so a caller giving up does not cancel it
+    for the others; it is only cancelled once every caller has gone.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+        self._waiters: Dict[str, int] = {}
+        self.calls = 0
+        self.shared = 0
+    
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await ``factory()``, or the identical call already in flight for ``key``."""
+        future = self._calls.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(factory())
+            self._calls[key] = future
+            self._waiters[key] = 0
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+        
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if self._calls.get(key) is future:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0:
+                    # Forget it now, so a caller arriving before the task
+                    # finishes cancelling starts a new call
+                    del self._calls[key]
+                    del self._waiters[key]
+                    future.cancel()
+            raise
+    
+    def _forget(self, key: str, future: "asyncio.Future[Any]") -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+            del self._waiters[key]
+        # Mark the outcome as retrieved even if every caller left
+        if not future.cancelled():
+            future.exception()
+    
+    def __len__(self) -> int:
+        return len(self._calls)
+
+class _Broadcast:
+    """Fan one chunk stream out to any number of subscribers.
+    
+    Subscribers that join late first receive the chunks already produced.
+    ``on_close`` is called once the broadcast stops taking subscribers.
+    """
+    
+    def __init__(self, source: AsyncIterator[str], on_close: Callable[["_Broadcast"], None]):
+        self._source = source
+        self._on_close = on_close
+        self._chunks: List[str] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._updated = asyncio.Event()
+        self._subscribers = 0
+        self._task = asyncio.ensure_future(self._pump())
+    
+    async def _pump(self) -> None:
+        try:
+            async for chunk in self._source:
+                self._chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            # Subscribers were not cancelled themselves, so they get a plain error
+            self._error = SharedCallCancelled("The shared LLM stream was cancelled")
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._on_close(self)
+            self._notify()
+    
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+    
+    async def subscribe(self) -> AsyncGenerator[str, None]:
+        self._subscribers += 1
+        index = 0
+        try:
+            while True:
+                while index < len(self._chunks):
+                    yield self._chunks[index]
+                    index += 1
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                await self._updated.wait()
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._done:
+                # Unlisted before cancelling, so identical requests arriving
+                # while the cancellation is delivered start a new stream
+                self._on_close(self)
+                self._task.cancel()
+
+class CoalescingLLM(LLMWrapper):
+    """LLM wrapper that merges identical concurrent requests into one call.
+    
+    Requests are matched with the same keys as CachedLLM. Streams are fanned
+    out chunk by chunk to every caller waiting on the same prompt. Put a
+    CachedLLM outside this wrapper to also serve requests that arrive after
+    the first has finished.
+    """
+    
+    def __init__(self, llm: BaseLLM):
+        super().__init__(llm)
+        self.flights = SingleFlight()
+        self._streams: Dict[str, _Broadcast] = {}
+        self.shared_streams = 0
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        key = request_key(self.llm, "generate", prompt, kwargs)
+        return await self.flights.do(key, lambda: self.llm.generate(prompt, **kwargs))
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        key = request_key(self.llm, "chat", messages, kwargs)
+        # Copy so later appends by the caller don't leak into the shared call
+        snapshot = list(messages)
+        return await self.flights.do(key, lambda: self.llm.chat(snapshot, **kwargs))
+    
+    # Return the inner generator itself, so closing the stream unsubscribes at once
+    def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        key = request_key(self.llm, "stream", prompt, kwargs)
+        return self._stream(key, lambda: self.llm.stream_generate_content(prompt, **kwargs))
+            
+    def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        key = request_key(self.llm, "stream_chat", messages, kwargs)
+        snapshot = list(messages)
+        return self._stream(key, lambda: self.llm.stream_chat(snapshot, **kwargs))
+            
+    async def _stream(
+        self, key: str, factory: Callable[[], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            broadcast = _Broadcast(factory(), lambda closed: self._forget_stream(key, closed))
+            self._streams[key] = broadcast
+        else:
+            self.shared_streams += 1
+            
+        subscription = broadcast.subscribe()
+        try:
+            async for chunk in subscription:
+                yield chunk
+        finally:
+            await subscription.aclose()
+    
+    def _forget_stream(self, key: str, broadcast: _Broadcast) -> None:
+        # A newer stream may already be listed under the same key
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
@@ -0,0 +1,28 @@
+import asyncio
+from typing import Optional
+
+# HTTP statuses worth retrying: timeouts, rate limiting and transient server errors
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+def error_status(error: BaseException) -> Optional[int]:
+    """Get the HTTP status carried by an LLM backend error, if any.
+    
+    Understands google.api_core errors (``code``), aiohttp errors
+    (``status``) and anything exposing ``status_code``.
+    """
+    for attribute in ("status", "status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    return None
+
+def is_overloaded(error: BaseException) -> bool:
+    """Whether an error means the backend is rate limiting or overloaded."""
+    status = error_status(error)
+    return status is not None and (status == 429 or status >= 500)
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed LLM call may succeed if sent again."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    return error_status(error) in RETRYABLE_STATUSES
@@ -1,11 +1,34 @@
 import os
 import json
-# from typing import Dict, List, Optional
-from typing import Dict, List, Optional, AsyncGenerator
+import asyncio
+import hashlib
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, AsyncGenerator, Tuple
 
-import google.generativeai as genai
 from velocityai.llms.base import BaseLLM
 from velocityai.llms.config import LLMConfig
+from velocityai.llms.sse import SSEParser
+
+if TYPE_CHECKING:
+    import aiohttp
+
+STREAM_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse"
+
+# Chat roles used by velocityai messages mapped to Gemini content roles
+_ROLE_MAP = {"user": "user", "assistant": "model"}
+
+class GeminiChatSession:
+    """A live SDK chat bound to one conversation.
+    
+    ``consumed`` counts the non-system messages the SDK chat already holds,
+    so a follow-up call only has to send what was appended since.
+    """
+    
+    def __init__(self, chat: Any, system: Optional[str], consumed: int = 0):
+        self.chat = chat
+        self.system = system
+        self.consumed = consumed
 
 class GeminiLLM(BaseLLM):
     """Gemini implementation of the LLM interface."""
@@ -18,6 +41,11 @@ class GeminiLLM(BaseLLM):
         top_p: float = 0.95,
         top_k: int = 40,
         max_output_tokens: int = 8192,
+        max_concurrent_requests: Optional[int] = 10,
+        max_chat_sessions: int = 256,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
     ):
         """
         Initialize Gemini LLM with simple configuration.
@@ -29,6 +57,13 @@ class GeminiLLM(BaseLLM):
             top_p: Controls diversity via nucleus sampling (0.0 to 1.0)
             top_k: Controls diversity via top-k sampling
             max_output_tokens: Maximum number of tokens to generate
+            max_concurrent_requests: Maximum number of requests this instance keeps
+                in flight at once. ``None`` disables the limit
+            max_chat_sessions: Number of live chat sessions kept for conversations
+                that may be continued; the least recently used are dropped first
+            connection_limit: Maximum number of pooled HTTP connections used for streaming
+            connection_limit_per_host: Per-host connection limit (0 for no limit)
+            keepalive_timeout: Seconds an idle pooled connection is kept open
         """
         super().__init__()
         
@@ -37,7 +72,8 @@ class GeminiLLM(BaseLLM):
         if not api_key:
             raise ValueError("Gemini API key is required")
         
-        genai.configure(api_key=api_key)
+        # The SDK is imported and configured when the first model is built
+        self._api_key = api_key
         
         # Create internal config
         self.config = LLMConfig(
@@ -48,50 +84,285 @@ class GeminiLLM(BaseLLM):
             max_output_tokens=max_output_tokens
         )
         
-        # Create model
-        self.model = genai.GenerativeModel(
+        if max_concurrent_requests is not None and max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1")
+        self.max_concurrent_requests = max_concurrent_requests
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
+        self.max_chat_sessions = max_chat_sessions
+        self._sessions: "OrderedDict[str, GeminiChatSession]" = OrderedDict()
+        self._system_models: "OrderedDict[str, Any]" = OrderedDict()
+        
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._http: Optional["aiohttp.ClientSession"] = None
+        
+        # Models are created on first use
+        self._generation_config = {
+            "temperature": self.config.temperature,
+            "top_p": self.config.top_p,
+            "top_k": self.config.top_k,
+            "max_output_tokens": self.config.max_output_tokens,
+        }
+        self._model: Any = None
+    
+    @property
+    def model(self) -> Any:
+        """The SDK model without a system instruction, created on first use."""
+        if self._model is None:
+            self._model = self._new_model()
+        return self._model
+    
+    def _new_model(self, system: Optional[str] = None) -> Any:
+        import google.generativeai as genai
+        # Process-wide SDK setting, applied before each model is built
+        genai.configure(api_key=self._api_key)
+        if system:
+            return genai.GenerativeModel(
+                model_name=self.config.model_name,
+                generation_config=self._generation_config,
+                system_instruction=system
+            )
+        return genai.GenerativeModel(
             model_name=self.config.model_name,
-            generation_config={
-                "temperature": self.config.temperature,
-                "top_p": self.config.top_p,
-                "top_k": self.config.top_k,
-                "max_output_tokens": self.config.max_output_tokens,
-            }
+            generation_config=self._generation_config
         )
         
+    @asynccontextmanager
+    async def _request_slot(self) -> AsyncIterator[None]:
+        """Hold one of the instance's in-flight request slots."""
+        if self.max_concurrent_requests is None:
+            yield
+            return
+        # Created lazily so the semaphore binds to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        async with self._semaphore:
+            yield
+        
     async def generate(self, prompt: str, **kwargs) -> str:
         """Generate a response for the given prompt."""
-        response = self.model.generate_content(prompt)
+        async with self._request_slot():
+            response = await self.model.generate_content_async(prompt)
         return response.text
         
     async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """Generate a response in a chat context."""
-        chat = self.model.start_chat(history=[])
+        async with self._request_slot():
+            return await self._chat(messages)
+        
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Stream a response in a chat context."""
+        async with self._request_slot():
+            session, parts, digest = self._open_session(messages)
+            response = await session.chat.send_message_async(parts, stream=True)
+            chunks = []
+            async for chunk in response:
+                text = self._chunk_text(chunk)
+                if text:
+                    chunks.append(text)
+                    yield text
+            # Only a fully read reply leaves the session in a reusable state
+            self._file_session(session, digest, "".join(chunks))
+            
+    async def _chat(self, messages: List[Dict[str, str]]) -> str:
+        session, parts, digest = self._open_session(messages)
+        response = await session.chat.send_message_async(parts)
+        text = response.text
+        self._file_session(session, digest, text)
+        return text
+    
+    def _open_session(
+        self, messages: List[Dict[str, str]]
+    ) -> Tuple[GeminiChatSession, List[str], Any]:
+        """Find or start the session for a conversation and work out what to send.
+        
+        Returns the session, the message parts to send and the digest of the
+        whole conversation.
+        """
+        system, conversation = self._split_system(messages)
+        digests = self._prefix_digests(system, conversation)
+        session = self._take_session(digests)
+        
+        if session is None:
+            session = GeminiChatSession(
+                self._model_for(system).start_chat(history=[]), system
+            )
+        
+        # Everything up to the last assistant turn becomes history; only the
+        # trailing user turns are sent.
+        pending = conversation[session.consumed:]
+        split = len(pending)
+        while split > 0 and pending[split - 1]["role"] == "user":
+            split -= 1
+        if split == len(pending):
+            raise ValueError("Conversation must end with a user message")
+        if split:
+            session.chat = self._model_for(system).start_chat(
+                history=list(session.chat.history) + self._to_contents(pending[:split])
+            )
+        session.consumed = len(conversation)
+        return session, [message["content"] for message in pending[split:]], digests[-1]
+    
+    def _file_session(self, session: GeminiChatSession, digest: Any, reply: str) -> None:
+        """Keep a session for the conversation's next call.
         
+        The caller is expected to append the reply verbatim, so the session is
+        filed under the conversation as it will look on the next call.
+        """
+        session.consumed += 1
+        reply_digest = self._extend_digest(digest, {"role": "assistant", "content": reply})
+        self._store_session(reply_digest.hexdigest(), session)
+        
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """Get the text of a streamed response chunk, which may carry none."""
+        try:
+            return chunk.text
+        except ValueError:
+            return ""
+        
+    def clear_sessions(self) -> None:
+        """Drop all live chat sessions."""
+        self._sessions.clear()
+    
+    @staticmethod
+    def _split_system(
+        messages: List[Dict[str, str]]
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        """Separate system messages from the user/assistant turns."""
+        system_parts = []
+        conversation = []
         for message in messages:
-            if message["role"] == "user":
-                response = chat.send_message(message["content"])
-            elif message["role"] == "assistant":
-                # For assistant messages, we just keep them in history
-                continue
-            elif message["role"] == "system":
-                # Prepend system message to the first user message
-                continue
-                
-        return response.text
+            role = message["role"]
+            if role == "system":
+                system_parts.append(message["content"])
+            elif role in _ROLE_MAP:
+                conversation.append(message)
+            else:
+                raise ValueError(f"Unsupported message role: {role}")
+        return ("\n\n".join(system_parts) or None), conversation
+    
+    @staticmethod
+    def _extend_digest(digest: Any, message: Dict[str, str]) -> Any:
+        digest = digest.copy()
+        digest.update(message["role"].encode("utf-8") + b"\0")
+        digest.update(message["content"].encode("utf-8") + b"\0")
+        return digest
+    
+    def _prefix_digests(
+        self, system: Optional[str], conversation: List[Dict[str, str]]
+    ) -> List[Any]:
+        """Rolling digests of every conversation prefix, shortest first."""
+        digest = hashlib.sha1((system or "").encode("utf-8") + b"\0")
+        digests = [digest]
+        for message in conversation:
+            digest = self._extend_digest(digest, message)
+            digests.append(digest)
+        return digests
+    
+    def _take_session(self, digests: List[Any]) -> Optional[GeminiChatSession]:
+        """Claim the session holding the longest known prefix of a conversation."""
+        for digest in reversed(digests[1:]):
+            session = self._sessions.pop(digest.hexdigest(), None)
+            if session is not None:
+                return session
+        return None
+    
+    def _store_session(self, key: str, session: GeminiChatSession) -> None:
+        self._sessions[key] = session
+        while len(self._sessions) > self.max_chat_sessions:
+            self._sessions.popitem(last=False)
+    
+    def _model_for(self, system: Optional[str]) -> Any:
+        """Get a model carrying the given system instruction."""
+        if not system:
+            return self.model
+        model = self._system_models.get(system)
+        if model is None:
+            model = self._new_model(system)
+            self._system_models[system] = model
+            while len(self._system_models) > self.max_chat_sessions:
+                self._system_models.popitem(last=False)
+        else:
+            self._system_models.move_to_end(system)
+        return model
+    
+    @staticmethod
+    def _to_contents(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Convert messages to Gemini contents, merging consecutive turns of one role."""
+        contents: List[Dict[str, Any]] = []
+        for message in messages:
+            role = _ROLE_MAP[message["role"]]
+            if contents and contents[-1]["role"] == role:
+                contents[-1]["parts"].append(message["content"])
+            else:
+                contents.append({"role": role, "parts": [message["content"]]})
+        return contents
 
-    async def stream_generate_content(self, prompt: str) -> AsyncGenerator[str, None]:
-        """Stream generate content for the given prompt."""
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.config.model_name}:streamGenerateContent?alt=sse&key={os.getenv('GEMINI_API_KEY')}"
-        headers = {'Content-Type': 'application/json'}
-        data = json.dumps({"contents": [{"parts": [{"text": prompt}]}]})
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, data=data) as response:
-                async for line in response.content:
-                    if line:
-                        chunk = json.loads(line.decode('utf-8'))
-                        yield chunk['candidates'][0]['content']['parts'][0]['text']
+    async def stream_generate_content(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        """Stream generate content for the given prompt.
+        
+        Chunks are read from the connection only as the consumer asks for
+        them, and closing the generator early aborts the request.
+        """
+        url = STREAM_URL.format(model=self.config.model_name)
+        headers = {"Content-Type": "application/json", "x-goog-api-key": self._api_key}
+        body = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": self.config.temperature,
+                "topP": self.config.top_p,
+                "topK": self.config.top_k,
+                "maxOutputTokens": self.config.max_output_tokens,
+            }
+        }
+        
+        async with self._request_slot():
+            session = self._http_session()
+            async with session.post(url, headers=headers, data=json.dumps(body)) as response:
+                response.raise_for_status()
+                parser = SSEParser()
+                async for data in response.content.iter_any():
+                    for event in parser.feed(data):
+                        text = self._event_text(event.data)
+                        if text:
+                            yield text
+                for event in parser.flush():
+                    text = self._event_text(event.data)
+                    if text:
+                        yield text
+                        
+    def _http_session(self) -> "aiohttp.ClientSession":
+        """Get the pooled keep-alive session, creating it on first use."""
+        if self._http is None or self._http.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._http = aiohttp.ClientSession(connector=connector)
+        return self._http
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections."""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+        
+    @staticmethod
+    def _event_text(data: str) -> str:
+        """Extract the generated text from one streamed response chunk."""
+        chunk = json.loads(data)
+        if "error" in chunk:
+            raise RuntimeError(chunk["error"].get("message", "Gemini streaming error"))
+        candidates = chunk.get("candidates") or []
+        if not candidates:
+            return ""
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
 
     def _parse_json_response(self, text: str) -> Dict:
         """Parse JSON response from the model."""
@@ -0,0 +1,130 @@
+import asyncio
+import math
+import random
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Union
+
+from velocityai.llms.base import BaseLLM
+from velocityai.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Draws a delay in seconds
+Latency = Callable[[random.Random], float]
+
+# Produces the reply for a prompt or a list of chat messages
+Responder = Callable[[Union[str, List[Dict[str, str]]]], str]
+
+DEFAULT_RESPONSE = '{"type": "output", "content": "ok"}'
+
+def constant(seconds: float) -> Latency:
+    return lambda rng: seconds
+
+def uniform(low: float, high: float) -> Latency:
+    return lambda rng: rng.uniform(low, high)
+
+def exponential(mean: float) -> Latency:
+    return lambda rng: rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+
+def lognormal(median: float, sigma: float = 0.5) -> Latency:
+    """Long-tailed delays around a median, the usual shape of LLM latency."""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+class MockLLMError(Exception):
+    """Injected failure. Carries an HTTP status so retry and rate-limit logic react to it."""
+    
+    def __init__(self, message: str = "Injected failure", status: int = 503):
+        super().__init__(message)
+        self.status = status
+
+@dataclass
+class MockStats:
+    """Counters reported by a MockLLM."""
+    calls: int = 0
+    failures: int = 0
+    tokens: int = 0
+
+class MockLLM(BaseLLM):
+    """Offline LLM with scripted replies, simulated latency and injected failures.
+    
+    Replies come from ``responses``: one string, a list used in turn
+    (cycling), or a function of the prompt or messages. Each call waits
+    ``first_token_latency`` and then streams the reply at
+    ``tokens_per_second``. With a seed, latencies and failures are
+    reproducible run to run.
+    """
+    
+    def __init__(
+        self,
+        responses: Union[str, Sequence[str], Responder, None] = None,
+        first_token_latency: Optional[Latency] = None,
+        tokens_per_second: Optional[float] = None,
+        failure_rate: float = 0.0,
+        failure: Optional[Callable[[], BaseException]] = None,
+        chunk_tokens: int = 4,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            responses: Scripted replies; defaults to a final-output step
+            first_token_latency: Delay before the first chunk, or None for none
+            tokens_per_second: Generation speed after the first chunk, or None for instant
+            failure_rate: Probability that a call fails before producing output
+            failure: Builds the exception to raise; defaults to MockLLMError (503)
+            chunk_tokens: Tokens per streamed chunk
+            seed: Seed for latencies and failures
+        """
+        super().__init__(
+            tokens_per_second=tokens_per_second,
+            failure_rate=failure_rate,
+            seed=seed
+        )
+        if responses is None:
+            responses = DEFAULT_RESPONSE
+        if isinstance(responses, str):
+            responses = [responses]
+        self._responses = responses
+        self.first_token_latency = first_token_latency
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self.failure = failure or MockLLMError
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.stats = MockStats()
+        self._rng = random.Random(seed)
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        return "".join([chunk async for chunk in self.stream_generate_content(prompt, **kwargs)])
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return "".join([chunk async for chunk in self.stream_chat(messages, **kwargs)])
+    
+    async def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        async for chunk in self._stream(prompt):
+            yield chunk
+    
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        async for chunk in self._stream(messages):
+            yield chunk
+    
+    def _reply(self, request: Union[str, List[Dict[str, str]]]) -> str:
+        if callable(self._responses):
+            return self._responses(request)
+        return self._responses[(self.stats.calls - 1) % len(self._responses)]
+    
+    async def _stream(self, request: Union[str, List[Dict[str, str]]]) -> AsyncIterator[str]:
+        self.stats.calls += 1
+        # Draw everything up front so concurrent calls do not change the sequence
+        delay = self.first_token_latency(self._rng) if self.first_token_latency else 0.0
+        fails = self.failure_rate > 0 and self._rng.random() < self.failure_rate
+        reply = self._reply(request)
+        
+        await asyncio.sleep(max(0.0, delay))
+        if fails:
+            self.stats.failures += 1
+            raise self.failure()
+        
+        size = self.chunk_tokens * CHARS_PER_TOKEN
+        for start in range(0, len(reply), size):
+            chunk = reply[start:start + size]
+            if start and self.tokens_per_second:
+                await asyncio.sleep(estimate_tokens(chunk) / self.tokens_per_second)
+            self.stats.tokens += estimate_tokens(chunk)
+            yield chunk
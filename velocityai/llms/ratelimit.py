@@ -0,0 +1,260 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from velocityai.llms.base import BaseLLM, LLMWrapper
+from velocityai.llms.errors import is_overloaded
+from velocityai.utils.tokens import estimate_message_tokens, estimate_tokens
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate.
+    
+    Callers reserve tokens up front and sleep off any shortfall, so waiters
+    are served in arrival order without a lock. ``charge`` takes tokens
+    without waiting, letting usage that is only known afterwards (such as
+    completion tokens) push later callers back.
+    """
+    
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Maximum tokens stored for bursts; defaults to one minute's worth
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    @property
+    def available(self) -> float:
+        """Tokens available right now; negative while callers are queued."""
+        self._refill()
+        return self._tokens
+    
+    async def acquire(self, amount: float = 1) -> float:
+        """Take tokens, waiting until they are available. Returns the time waited."""
+        self._refill()
+        self._tokens -= amount
+        if self._tokens >= 0:
+            return 0.0
+        wait = -self._tokens / self.rate
+        await asyncio.sleep(wait)
+        return wait
+    
+    def charge(self, amount: float) -> None:
+        """Take tokens without waiting."""
+        self._refill()
+        self._tokens -= amount
+
+class AdaptiveConcurrency:
+    """Concurrency limit tuned by additive-increase/multiplicative-decrease.
+    
+    Every successful call raises the limit by ``increase / limit`` (about
+    ``increase`` per round of calls); a call that fails because the backend
+    is overloaded multiplies it by ``decrease``. Only calls started after
+    the last decrease can trigger another, so one burst of errors shrinks
+    the limit once. Callers beyond the limit wait in a FIFO queue.
+    """
+    
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 256,
+        increase: float = 1.0,
+        decrease: float = 0.5
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Expected 1 <= minimum <= initial <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._last_decrease = float("-inf")
+    
+    @property
+    def queued(self) -> int:
+        """Number of callers waiting for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+    
+    async def acquire(self) -> float:
+        """Wait for a slot and return the time started, for ``release``."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return time.monotonic()
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.in_flight -= 1
+                self._wake()
+            raise
+        return time.monotonic()
+    
+    def release(self, started: float, overloaded: bool = False, succeeded: bool = True) -> None:
+        """Give a slot back, adjusting the limit by the call's outcome.
+        
+        Calls that neither succeeded nor hit an overload (cancellations,
+        client errors) leave the limit unchanged.
+        """
+        self.in_flight -= 1
+        if overloaded:
+            if started >= self._last_decrease:
+                self.limit = max(float(self.minimum), self.limit * self.decrease)
+                self._last_decrease = time.monotonic()
+        elif succeeded:
+            self.limit = min(float(self.maximum), self.limit + self.increase / self.limit)
+        self._wake()
+    
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+@dataclass
+class RateLimiterStats:
+    """Counters reported by a RateLimiter."""
+    requests: int = 0
+    throttled: int = 0
+    overloaded: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+class RateLimiter:
+    """Request and token quotas plus adaptive concurrency for LLM calls.
+    
+    One limiter can be shared by every agent using an LLM, or by several
+    LLM wrappers drawing on the same quota.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 256
+    ):
+        """
+        Args:
+            requests_per_minute: Request quota, or None for no limit
+            tokens_per_minute: Prompt plus completion token quota, or None for no limit
+            initial_concurrency: Starting number of calls allowed in flight
+            min_concurrency: Floor the concurrency limit never drops below
+            max_concurrency: Ceiling the concurrency limit never grows above
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrency(
+            initial=initial_concurrency,
+            minimum=min_concurrency,
+            maximum=max_concurrency
+        )
+        self.stats = RateLimiterStats()
+    
+    @asynccontextmanager
+    async def slot(self, prompt_tokens: int = 0) -> AsyncIterator[None]:
+        """Hold a concurrency slot and quota for one call."""
+        queued_at = time.monotonic()
+        started = await self.concurrency.acquire()
+        try:
+            if self.requests is not None:
+                await self.requests.acquire(1)
+            if self.tokens is not None and prompt_tokens:
+                await self.tokens.acquire(prompt_tokens)
+        except BaseException:
+            self.concurrency.release(started, succeeded=False)
+            raise
+        
+        wait = time.monotonic() - queued_at
+        self.stats.requests += 1
+        self.stats.total_wait += wait
+        self.stats.max_wait = max(self.stats.max_wait, wait)
+        if wait > 0.001:
+            self.stats.throttled += 1
+        
+        try:
+            yield
+        except Exception as e:
+            overloaded = is_overloaded(e)
+            if overloaded:
+                self.stats.overloaded += 1
+            self.concurrency.release(started, overloaded=overloaded, succeeded=False)
+            raise
+        except BaseException:
+            self.concurrency.release(started, succeeded=False)
+            raise
+        else:
+            self.concurrency.release(started)
+    
+    def charge(self, tokens: int) -> None:
+        """Count tokens used by a call against the token quota after the fact."""
+        if self.tokens is not None and tokens:
+            self.tokens.charge(tokens)
+
+class RateLimitedLLM(LLMWrapper):
+    """LLM wrapper that keeps calls within quota using a RateLimiter.
+    
+    Prompt tokens are estimated and reserved before each call; completion
+    tokens are charged once the response (or each streamed chunk) arrives.
+    """
+    
+    def __init__(self, llm: BaseLLM, limiter: Optional[RateLimiter] = None, **limiter_kwargs):
+        """
+        Args:
+            llm: The LLM to wrap
+            limiter: Limiter to use, possibly shared; built from ``limiter_kwargs`` if not given
+        """
+        super().__init__(llm)
+        self.limiter = limiter or RateLimiter(**limiter_kwargs)
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        async with self.limiter.slot(estimate_tokens(prompt)):
+            response = await self.llm.generate(prompt, **kwargs)
+        self.limiter.charge(estimate_tokens(response))
+        return response
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        async with self.limiter.slot(estimate_message_tokens(messages)):
+            response = await self.llm.chat(messages, **kwargs)
+        self.limiter.charge(estimate_tokens(response))
+        return response
+    
+    async def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        async with self.limiter.slot(estimate_tokens(prompt)):
+            async for chunk in self.llm.stream_generate_content(prompt, **kwargs):
+                self.limiter.charge(estimate_tokens(chunk))
+                yield chunk
+    
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        async with self.limiter.slot(estimate_message_tokens(messages)):
+            async for chunk in self.llm.stream_chat(messages, **kwargs):
+                self.limiter.charge(estimate_tokens(chunk))
+                yield chunk
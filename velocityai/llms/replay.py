@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Union
+
+from velocityai.llms.base import BaseLLM, LLMWrapper
+from velocityai.llms.errors import error_status
+
+ORIGINAL = "original"
+INSTANT = "instant"
+
+def replay_key(kind: str, payload: Any, kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """Key a request by its input alone, so replays work without the original model.
+    
+    Streaming and non-streaming calls for the same input share a key.
+    """
+    document = {"kind": kind, "payload": payload, "kwargs": kwargs or {}}
+    encoded = json.dumps(document, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+class ReplayError(Exception):
+    """A recorded call failed; raised again on replay with the original status."""
+    
+    def __init__(self, message: str, status: Optional[int] = None, type: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.type = type
+
+class RecordingLLM(LLMWrapper):
+    """LLM wrapper that appends every call to a JSON Lines file for ReplayLLM.
+    
+    Each line holds the request, the chunks with their offsets from the
+    start of the call, and the error if the call failed. Streams cut short
+    by the consumer are not recorded. Lines are appended from the default
+    executor so the event loop never waits on the disk.
+    """
+    
+    def __init__(self, llm: BaseLLM, path: str):
+        super().__init__(llm)
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        return await self._call("generate", prompt, kwargs, lambda: self.llm.generate(prompt, **kwargs))
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return await self._call("chat", messages, kwargs, lambda: self.llm.chat(messages, **kwargs))
+    
+    async def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        source = self.llm.stream_generate_content(prompt, **kwargs)
+        async for chunk in self._stream("generate", prompt, kwargs, source):
+            yield chunk
+    
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        source = self.llm.stream_chat(messages, **kwargs)
+        async for chunk in self._stream("chat", messages, kwargs, source):
+            yield chunk
+    
+    async def _call(
+        self, kind: str, payload: Any, kwargs: Dict[str, Any], factory: Callable[[], Awaitable[str]]
+    ) -> str:
+        started = time.monotonic()
+        try:
+            response = await factory()
+        except Exception as e:
+            await self._write(kind, payload, kwargs, [], time.monotonic() - started, e)
+            raise
+        elapsed = time.monotonic() - started
+        await self._write(kind, payload, kwargs, [[elapsed, response]], elapsed)
+        return response
+    
+    async def _stream(
+        self, kind: str, payload: Any, kwargs: Dict[str, Any], source: AsyncIterator[str]
+    ) -> AsyncIterator[str]:
+        started = time.monotonic()
+        chunks: List[List[Any]] = []
+        try:
+            async for chunk in source:
+                chunks.append([time.monotonic() - started, chunk])
+                yield chunk
+        except Exception as e:
+            await self._write(kind, payload, kwargs, chunks, time.monotonic() - started, e)
+            raise
+        await self._write(kind, payload, kwargs, chunks, time.monotonic() - started)
+    
+    async def _write(
+        self,
+        kind: str,
+        payload: Any,
+        kwargs: Dict[str, Any],
+        chunks: List[List[Any]],
+        duration: float,
+        error: Optional[BaseException] = None
+    ) -> None:
+        record = {
+            "key": replay_key(kind, payload, kwargs),
+            "kind": kind,
+            "payload": payload,
+            "kwargs": kwargs,
+            "chunks": chunks,
+            "duration": duration,
+            "error": None if error is None else {
+                "type": type(error).__name__,
+                "message": str(error),
+                "status": error_status(error)
+            }
+        }
+        line = json.dumps(record, default=str) + "\n"
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._append, line)
+    
+    def _append(self, line: str) -> None:
+        # One append per call, under a lock so lines from concurrent calls
+        # never interleave however long they are
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+class ReplayLLM(BaseLLM):
+    """Offline LLM answering from a file written by RecordingLLM.
+    
+    Identical requests are answered by their recordings in order; once
+    those run out the last one is repeated. With ``timing="original"``
+    chunks arrive at their recorded offsets, with ``"instant"`` at once.
+    Recorded failures are raised again as ReplayError.
+    """
+    
+    def __init__(self, path: str, timing: str = ORIGINAL, strict: bool = True, fallback: Optional[str] = None):
+        """
+        Args:
+            path: Recording to replay
+            timing: "original" to reproduce recorded latencies, "instant" for none
+            strict: Raise KeyError for requests missing from the recording
+            fallback: Reply used for missing requests when not strict
+        """
+        if timing not in (ORIGINAL, INSTANT):
+            raise ValueError(f"timing must be {ORIGINAL!r} or {INSTANT!r}")
+        super().__init__(path=path, timing=timing)
+        self.path = path
+        self.timing = timing
+        self.strict = strict
+        self.fallback = fallback
+        self._records: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._records.setdefault(record["key"], deque()).append(record)
+    
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        return "".join([chunk async for chunk in self._replay("generate", prompt, kwargs)])
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return "".join([chunk async for chunk in self._replay("chat", messages, kwargs)])
+    
+    async def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        async for chunk in self._replay("generate", prompt, kwargs):
+            yield chunk
+    
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        async for chunk in self._replay("chat", messages, kwargs):
+            yield chunk
+    
+    def _next_record(self, key: str) -> Optional[Dict[str, Any]]:
+        queue = self._records.get(key)
+        if queue:
+            self._last[key] = queue.popleft()
+        return self._last.get(key)
+    
+    async def _replay(
+        self, kind: str, payload: Union[str, List[Dict[str, str]]], kwargs: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        record = self._next_record(replay_key(kind, payload, kwargs))
+        if record is None:
+            if self.strict:
+                raise KeyError(f"No recorded {kind} call matches this request")
+            yield self.fallback or ""
+            return
+        
+        started = time.monotonic()
+        for offset, chunk in record["chunks"]:
+            if self.timing == ORIGINAL:
+                await asyncio.sleep(max(0.0, started + offset - time.monotonic()))
+            yield chunk
+        error = record.get("error")
+        if error:
+            if self.timing == ORIGINAL:
+                await asyncio.sleep(max(0.0, started + record["duration"] - time.monotonic()))
+            raise ReplayError(error["message"], error.get("status"), error.get("type"))
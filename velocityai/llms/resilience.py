@@ -0,0 +1,287 @@
+import asyncio
+import random
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+)
+
+from velocityai.llms.base import BaseLLM, LLMWrapper
+from velocityai.llms.errors import is_retryable
+from velocityai.utils.stats import percentile
+
+T = TypeVar("T")
+
+# Returned by _anext when a stream is exhausted
+_END = object()
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter for retryable errors."""
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    multiplier: float = 2.0
+    retry_on: Callable[[BaseException], bool] = is_retryable
+    
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retrying after the given (0-based) attempt."""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return random.uniform(0, ceiling)
+
+@dataclass
+class HedgePolicy:
+    """When to send a duplicate of a slow request.
+    
+    A hedge is sent once a call is slower than the given quantile of
+    recent call latencies, or a stream's first chunk is later than that
+    quantile of recent first-chunk latencies; the two are tracked
+    separately. Every call earns ``budget_ratio`` of a hedge (up to
+    ``budget_burst``) and every hedge spends one, so hedges stay a
+    bounded fraction of traffic even when the backend slows down.
+    """
+    quantile: float = 95.0
+    min_delay: float = 0.05
+    max_delay: Optional[float] = None
+    min_samples: int = 20
+    window: int = 1000
+    budget_ratio: float = 0.1
+    budget_burst: float = 10.0
+
+class LatencyTracker:
+    """Rolling window of recent latencies.
+    
+    A sorted copy of the window is kept up to date as samples come and go,
+    so a quantile lookup on every request does not sort the window.
+    """
+    
+    def __init__(self, window: int = 1000):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self._samples: Deque[float] = deque()
+        self._sorted: List[float] = []
+    
+    def add(self, latency: float) -> None:
+        if len(self._samples) == self.window:
+            oldest = self._samples.popleft()
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._samples.append(latency)
+        insort(self._sorted, latency)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Get the q-th percentile (0-100), or None without any samples."""
+        if not self._sorted:
+            return None
+        return percentile(self._sorted, q)
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+
+@dataclass
+class ResilienceStats:
+    """Counters reported by a ResilientLLM."""
+    calls: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    timeouts: int = 0
+    failures: int = 0
+
+class ResilientLLM(LLMWrapper):
+    """LLM wrapper adding retries, hedged requests and per-call deadlines.
+    
+    Streams are only retried or hedged until their first chunk arrives;
+    after that the chosen stream is read to the end.
+    """
+    
+    def __init__(
+        self,
+        llm: BaseLLM,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            llm: The LLM to wrap
+            retry: Retry policy; defaults to RetryPolicy(). Use max_attempts=1 to disable
+            hedge: Hedging policy, or None to never hedge
+            timeout: Deadline in seconds for each call including retries, or None
+        """
+        super().__init__(llm)
+        self.retry = retry or RetryPolicy()
+        self.hedge = hedge
+        self.timeout = timeout
+        window = hedge.window if hedge else 1000
+        # Whole responses of generate/chat, and first chunks of streams
+        self.call_latencies = LatencyTracker(window)
+        self.first_chunk_latencies = LatencyTracker(window)
+        self.stats = ResilienceStats()
+        self._hedge_budget = hedge.budget_burst if hedge else 0.0
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        return await self._call(lambda: self.llm.generate(prompt, **kwargs))
+    
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return await self._call(lambda: self.llm.chat(messages, **kwargs))
+    
+    async def stream_generate_content(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        async for chunk in self._stream(lambda: self.llm.stream_generate_content(prompt, **kwargs)):
+            yield chunk
+    
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        async for chunk in self._stream(lambda: self.llm.stream_chat(messages, **kwargs)):
+            yield chunk
+    
+    async def _call(self, factory: Callable[[], Awaitable[str]]) -> str:
+        self.stats.calls += 1
+        deadline = self._deadline()
+        try:
+            return await self._within(deadline, self._with_retries(lambda: self._hedged(factory)))
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        except Exception:
+            self.stats.failures += 1
+            raise
+    
+    async def _stream(self, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        self.stats.calls += 1
+        deadline = self._deadline()
+        try:
+            stream, first = await self._within(
+                deadline, self._with_retries(lambda: self._hedged_stream(factory))
+            )
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        except Exception:
+            self.stats.failures += 1
+            raise
+        
+        try:
+            chunk = first
+            while chunk is not _END:
+                yield chunk
+                chunk = await self._within(deadline, _anext(stream))
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            await stream.aclose()
+    
+    async def _with_retries(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        for number in range(self.retry.max_attempts):
+            try:
+                return await attempt()
+            except Exception as e:
+                if number + 1 >= self.retry.max_attempts or not self.retry.retry_on(e):
+                    raise
+                self.stats.retries += 1
+                await asyncio.sleep(self.retry.delay(number))
+        raise RuntimeError("RetryPolicy.max_attempts must be at least 1")
+    
+    async def _hedged(self, factory: Callable[[], Awaitable[str]]) -> str:
+        """Run a request, sending a duplicate if it is slower than usual."""
+        started = time.monotonic()
+        primary = asyncio.ensure_future(factory())
+        attempts = [primary]
+        try:
+            delay = self._hedge_delay(self.call_latencies)
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if not done and self._spend_hedge():
+                    attempts.append(asyncio.ensure_future(factory()))
+            
+            winner = await _first_success(attempts)
+            if winner is not primary:
+                self.stats.hedge_wins += 1
+            self.call_latencies.add(time.monotonic() - started)
+            return winner.result()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+    
+    async def _hedged_stream(
+        self, factory: Callable[[], AsyncIterator[str]]
+    ) -> Tuple[AsyncIterator[str], Any]:
+        """Open a stream and wait for its first chunk, hedging if it is slow.
+        
+        Returns the winning stream and its first chunk; the others are closed.
+        """
+        started = time.monotonic()
+        streams = [factory()]
+        attempts = [asyncio.ensure_future(_anext(streams[0]))]
+        winner: Optional["asyncio.Future[Any]"] = None
+        try:
+            delay = self._hedge_delay(self.first_chunk_latencies)
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if not done and self._spend_hedge():
+                    streams.append(factory())
+                    attempts.append(asyncio.ensure_future(_anext(streams[1])))
+            
+            winner = await _first_success(attempts)
+            if winner is not attempts[0]:
+                self.stats.hedge_wins += 1
+            self.first_chunk_latencies.add(time.monotonic() - started)
+            return streams[attempts.index(winner)], winner.result()
+        finally:
+            for attempt, stream in zip(attempts, streams):
+                if attempt is winner:
+                    continue
+                attempt.cancel()
+                await asyncio.gather(attempt, return_exceptions=True)
+                await stream.aclose()
+    
+    def _hedge_delay(self, latencies: LatencyTracker) -> Optional[float]:
+        if self.hedge is None:
+            return None
+        self._hedge_budget = min(
+            self.hedge.budget_burst, self._hedge_budget + self.hedge.budget_ratio
+        )
+        if len(latencies) < self.hedge.min_samples:
+            return None
+        delay = max(self.hedge.min_delay, latencies.quantile(self.hedge.quantile) or 0.0)
+        if self.hedge.max_delay is not None:
+            delay = min(delay, self.hedge.max_delay)
+        return delay
+    
+    def _spend_hedge(self) -> bool:
+        if self._hedge_budget < 1:
+            return False
+        self._hedge_budget -= 1
+        self.stats.hedges += 1
+        return True
+    
+    def _deadline(self) -> Optional[float]:
+        return None if self.timeout is None else time.monotonic() + self.timeout
+    
+    @staticmethod
+    async def _within(deadline: Optional[float], awaitable: Awaitable[T]) -> T:
+        if deadline is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, max(0.0, deadline - time.monotonic()))
+
+async def _anext(stream: AsyncIterator[str]) -> Any:
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+async def _first_success(attempts: List["asyncio.Future[T]"]) -> "asyncio.Future[T]":
+    """Wait for the first attempt to succeed, or raise the last error if none does."""
+    pending = set(attempts)
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for attempt in done:
+            if attempt.cancelled():
+                continue
+            if attempt.exception() is None:
+                return attempt
+            error = attempt.exception()
+    raise error or asyncio.CancelledError()
@@ -0,0 +1,105 @@
+import codecs
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+@dataclass
+class SSEEvent:
+    """A single server-sent event."""
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+
+class SSEParser:
+    """Incremental parser for a ``text/event-stream`` body.
+    
+    Feed raw bytes as they arrive; complete events are returned as soon as
+    their terminating blank line has been seen. Lines may be split across
+    chunks and may end in ``\\n``, ``\\r\\n`` or ``\\r``. Comment lines
+    (keep-alives) are ignored.
+    """
+    
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._data: List[str] = []
+        self._event = ""
+        self._id: Optional[str] = None
+        self.last_event_id: Optional[str] = None
+    
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Parse a chunk of the body and return the events it completes."""
+        self._buffer += self._decoder.decode(chunk)
+        events: List[SSEEvent] = []
+        while True:
+            end = self._line_end()
+            if end is None:
+                break
+            line_end, next_start = end
+            line = self._buffer[:line_end]
+            self._buffer = self._buffer[next_start:]
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        return events
+    
+    def flush(self) -> List[SSEEvent]:
+        """Finish parsing at end of stream, dispatching any unterminated event."""
+        self._buffer += self._decoder.decode(b"", final=True)
+        events = self.feed(b"")
+        if self._buffer:
+            event = self._process_line(self._buffer.rstrip("\r"))
+            self._buffer = ""
+            if event is not None:
+                events.append(event)
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+    
+    def _line_end(self) -> Optional[Tuple[int, int]]:
+        """Find the first complete line as (end of line, start of next line)."""
+        buffer = self._buffer
+        lf = buffer.find("\n")
+        cr = buffer.find("\r")
+        if cr == -1 or (lf != -1 and lf < cr):
+            return None if lf == -1 else (lf, lf + 1)
+        if cr + 1 == len(buffer):
+            # Might be the first half of \r\n; wait for more input
+            return None
+        if buffer[cr + 1] == "\n":
+            return cr, cr + 2
+        return cr, cr + 1
+    
+    def _process_line(self, line: str) -> Optional[SSEEvent]:
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            return None
+        
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id":
+            if "\0" not in value:
+                self._id = value
+        return None
+    
+    def _dispatch(self) -> Optional[SSEEvent]:
+        if self._id is not None:
+            self.last_event_id = self._id
+        if not self._data:
+            self._event = ""
+            return None
+        event = SSEEvent(
+            data="\n".join(self._data),
+            event=self._event or "message",
+            id=self.last_event_id
+        )
+        self._data = []
+        self._event = ""
+        return event
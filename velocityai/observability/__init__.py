@@ -0,0 +1,30 @@
+from velocityai.observability.metrics import (
+    REGISTRY, Counter, FunctionGauge, Gauge, Histogram, MetricsRegistry,
+    render_metrics, start_metrics_server
+)
+from velocityai.observability.profiling import TaskProfiler
+from velocityai.observability.tracing import (
+    InMemoryCollector, OTLPJsonFileExporter, Span, SpanExporter, Tracer,
+    configure_tracing, current_span, get_tracer, set_tracer
+)
+
+__all__ = [
+    "REGISTRY",
+    "Counter",
+    "FunctionGauge",
+    "Gauge",
+    "Histogram",
+    "InMemoryCollector",
+    "MetricsRegistry",
+    "OTLPJsonFileExporter",
+    "Span",
+    "SpanExporter",
+    "TaskProfiler",
+    "Tracer",
+    "configure_tracing",
+    "current_span",
+    "get_tracer",
+    "render_metrics",
+    "set_tracer",
+    "start_metrics_server"
+]
@@ -0,0 +1,302 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from fast tool calls to slow LLM requests
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+class CounterValue:
+    """A monotonically increasing count."""
+    __slots__ = ("value",)
+    
+    def __init__(self):
+        self.value = 0.0
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+class GaugeValue:
+    """A value that can go up and down."""
+    __slots__ = ("value",)
+    
+    def __init__(self):
+        self.value = 0.0
+    
+    def set(self, value: float) -> None:
+        self.value = value
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+    
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+class HistogramValue:
+    """Counts of observations in fixed buckets, with their sum."""
+    __slots__ = ("bounds", "counts", "sum", "count")
+    
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One slot per bound plus +Inf; cumulated only when rendered
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metric:
+    """A named metric with one value per combination of label values.
+    
+    Values are updated without locks. Updates from one thread, such as the
+    event loop that runs all built-in instrumentation, are exact; rendering
+    from another thread reads a consistent enough snapshot for monitoring.
+    """
+    type = "untyped"
+    
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, object] = {}
+        if not self.labelnames:
+            self._default = self.labels()
+    
+    def labels(self, *values: str):
+        """Get the value for these label values, in labelnames order."""
+        value = self._values.get(values)
+        if value is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            value = self._values.setdefault(tuple(str(v) for v in values), self._new_value())
+        return value
+    
+    def _new_value(self) -> object:
+        raise NotImplementedError
+    
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        """(sample name, labels, value) for every value of the metric."""
+        for values, value in list(self._values.items()):
+            yield self.name, dict(zip(self.labelnames, values)), value.value
+
+class Counter(Metric):
+    type = "counter"
+    
+    def _new_value(self) -> CounterValue:
+        return CounterValue()
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+class Gauge(Metric):
+    type = "gauge"
+    
+    def _new_value(self) -> GaugeValue:
+        return GaugeValue()
+    
+    def set(self, value: float) -> None:
+        self._default.set(value)
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+    
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+class FunctionGauge(Metric):
+    """Gauge computed when rendered, from a function returning values by label values."""
+    type = "gauge"
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        function: Callable[[], Dict[LabelValues, float]]
+    ):
+        # No stored values, so Metric.__init__ is skipped
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.function = function
+    
+    def labels(self, *values: str):
+        raise TypeError(f"{self.name} is computed by its function")
+    
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for values, value in self.function().items():
+            yield self.name, dict(zip(self.labelnames, values)), value
+
+class Histogram(Metric):
+    type = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.bounds = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        super().__init__(name, help, labelnames)
+    
+    def _new_value(self) -> HistogramValue:
+        return HistogramValue(self.bounds)
+    
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+    
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for values, value in list(self._values.items()):
+            labels = dict(zip(self.labelnames, values))
+            counts = list(value.counts)
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", dict(labels, le=_format_value(bound)), cumulative
+            yield f"{self.name}_sum", labels, value.sum
+            yield f"{self.name}_count", labels, cumulative
+
+class MetricsRegistry:
+    """Named metrics, rendered together in the Prometheus text format."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric, or return the one already registered under its name."""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name} is already registered with a different type or labels")
+        return existing
+    
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+    
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+    
+    def function_gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        function: Callable[[], Dict[LabelValues, float]]
+    ) -> FunctionGauge:
+        return self.register(FunctionGauge(name, help, labelnames, function))
+    
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+    
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+    
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                    lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+# Shared by every cache, labelled by cache kind
+CACHE_REQUESTS = REGISTRY.counter(
+    "velocityai_cache_requests_total", "Cache lookups by cache and result (hit or miss).", ("cache", "result")
+)
+
+def _cache_hit_ratios() -> Dict[LabelValues, float]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in list(CACHE_REQUESTS._values.items()):
+        counts = totals.setdefault(cache, [0.0, 0.0])
+        counts[result == "hit"] += value.value
+    return {(cache,): hits / (hits + misses) for cache, (misses, hits) in totals.items() if hits + misses}
+
+REGISTRY.function_gauge(
+    "velocityai_cache_hit_ratio", "Share of cache lookups that were hits.", ("cache",), _cache_hit_ratios
+)
+
+def render_metrics(registry: Optional[MetricsRegistry] = None) -> str:
+    """Prometheus text for the shared registry, or the given one."""
+    return (registry or REGISTRY).render()
+
+def start_metrics_server(
+    port: int = 9464,
+    host: str = "127.0.0.1",
+    registry: Optional[MetricsRegistry] = None
+):
+    """Serve the metrics at http://host:port/metrics from a background thread.
+    
+    Binds to localhost by default. Returns the server; call ``shutdown()``
+    on it to stop serving.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    source = registry or REGISTRY
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = source.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format: str, *args) -> None:
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="velocityai-metrics", daemon=True)
+    thread.start()
+    return server
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+def _escape_label(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
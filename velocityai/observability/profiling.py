@@ -0,0 +1,338 @@
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Generator, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SAMPLING = "sampling"
+CPROFILE = "cprofile"
+
+# The profile of the task being run, inherited by the tasks it starts
+_active_profile: ContextVar[Optional["_Profile"]] = ContextVar("velocityai_profile", default=None)
+
+class TaskProfiler:
+    """Profiles one task in every sample_every, writing a file per task.
+    
+    A profiled task only runs under the profiler while its own code runs:
+    time spent awaiting the LLM, tools or other tasks is left out, and so
+    is the code of unrelated tasks sharing the event loop. Tool calls the
+    agent starts as separate asyncio tasks are included.
+    
+    In "sampling" mode a background thread records the stack every
+    interval seconds and writes collapsed stacks (``frame;frame;frame
+    count`` lines, the input of flamegraph.pl, speedscope and inferno).
+    In "cprofile" mode cProfile records every call and the stats are
+    written for pstats or snakeviz, at several times the cost of
+    sampling. With memory on, allocations are traced with tracemalloc for
+    the duration of the task. Tracing is process-wide: the summary also
+    counts tasks running at the same time, and allocation-heavy code in
+    any of them runs several times slower until the task ends.
+    
+    Profiled results get a "profile" entry with the file path, wall and
+    active (on-loop) seconds, and the allocation summary. Stopping the
+    sampler, diffing allocations and writing the file happen in the
+    default executor, off the event loop.
+    """
+    
+    def __init__(
+        self,
+        output_dir: str = "profiles",
+        sample_every: int = 1,
+        mode: str = SAMPLING,
+        interval: float = 0.005,
+        memory: bool = True,
+        memory_top: int = 10
+    ):
+        """
+        Args:
+            output_dir: Directory profile files are written to
+            sample_every: Profile one task in this many (1 profiles every task)
+            mode: "sampling" for collapsed stacks or "cprofile" for pstats files
+            interval: Seconds between stack samples in sampling mode; the
+                sampler waits for the GIL, so intervals shorter than
+                sys.getswitchinterval() are not honoured under load
+            memory: Whether to attach a tracemalloc allocation summary
+            memory_top: Number of allocation sites listed in the summary
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        if mode not in (SAMPLING, CPROFILE):
+            raise ValueError(f"mode must be {SAMPLING!r} or {CPROFILE!r}, got {mode!r}")
+        self.output_dir = output_dir
+        self.sample_every = sample_every
+        self.mode = mode
+        self.interval = interval
+        self.memory = memory
+        self.memory_top = memory_top
+        self._counter = itertools.count()
+    
+    async def profile(self, coro: Awaitable[T], name: str = "task") -> T:
+        """Await coro, profiling it if it is one of the sampled tasks."""
+        sequence = next(self._counter)
+        if sequence % self.sample_every:
+            return await coro
+        
+        loop = asyncio.get_running_loop()
+        profile = _Profile(self.mode, self.interval, self.memory)
+        token = _active_profile.set(profile)
+        profile.start()
+        try:
+            result = await _Profiled(coro, profile)
+        finally:
+            _active_profile.reset(token)
+            profile.stop()
+            await loop.run_in_executor(None, profile.finish)
+        
+        stem = f"{_safe_name(name)}-{os.getpid()}-{sequence}"
+        report = await loop.run_in_executor(None, self._report, profile, stem)
+        if isinstance(result, dict):
+            result["profile"] = report
+        return result
+    
+    def _report(self, profile: "_Profile", stem: str) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            "mode": self.mode,
+            "path": None,
+            "wall_seconds": profile.wall,
+            "active_seconds": profile.active
+        }
+        if self.mode == SAMPLING:
+            report["samples"] = sum(profile.stacks.values())
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            if self.mode == SAMPLING:
+                path = os.path.join(self.output_dir, f"{stem}.collapsed")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.writelines(f"{stack} {count}\n" for stack, count in profile.collapsed())
+            else:
+                path = os.path.join(self.output_dir, f"{stem}.prof")
+                profile.cprofile.dump_stats(path)
+            report["path"] = path
+        except OSError as e:
+            logger.warning(f"Could not write task profile: {e}")
+        if profile.memory:
+            report["memory"] = profile.memory_summary(self.memory_top)
+        return report
+
+def profiled(coro: Awaitable[T]) -> Awaitable[T]:
+    """Profile coro with the current task's profile, if it has one.
+    
+    For coroutines run as separate asyncio tasks, which would otherwise
+    be left out of the profile.
+    """
+    profile = _active_profile.get()
+    if profile is None or profile.stopped:
+        return coro
+    return _drive(coro, profile)
+
+async def _drive(coro: Awaitable[T], profile: "_Profile") -> T:
+    return await _Profiled(coro, profile)
+
+class _Profiled:
+    """Awaits a coroutine, resuming the profile only while it runs."""
+    __slots__ = ("_coro", "_profile")
+    
+    def __init__(self, coro: Awaitable[Any], profile: "_Profile"):
+        self._coro = coro.__await__()
+        self._profile = profile
+    
+    def __await__(self) -> Generator[Any, Any, Any]:
+        coro = self._coro
+        profile = self._profile
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            profile.resume()
+            try:
+                if error is None:
+                    yielded = coro.send(value)
+                else:
+                    yielded = coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                profile.pause()
+            # The event loop waits on whatever the coroutine yielded
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+# Code of the frames that separate a task's stacks from the event loop's
+_DRIVER_CODE = _Profiled.__await__.__code__
+
+class _Profile:
+    """Profiling state for one task and the tasks it starts."""
+    
+    def __init__(self, mode: str, interval: float, memory: bool):
+        self.mode = mode
+        self.interval = interval
+        self.memory = memory
+        self.stopped = False
+        self.wall = 0.0
+        self.active = 0.0
+        self.stacks: Counter = Counter()
+        self.cprofile: Any = None
+        self._depth = 0
+        self._resumed = 0.0
+        self._started = 0.0
+        self._thread_id = threading.get_ident()
+        self._sampler: Optional[threading.Thread] = None
+        self._done = threading.Event()
+        self._snapshot: Any = None
+        self._memory_start = 0
+        self._memory_end = 0
+        self._memory_peak = 0
+        self._diff: List[Any] = []
+    
+    def start(self) -> None:
+        if self.memory:
+            self._memory_start = _start_memory()
+            self._snapshot = _take_snapshot()
+        if self.mode == CPROFILE:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+        else:
+            self._sampler = threading.Thread(target=self._sample, name="velocityai-profiler", daemon=True)
+            self._sampler.start()
+        self._started = time.perf_counter()
+    
+    def stop(self) -> None:
+        """Stop recording. Cheap, so it runs on the event loop."""
+        self.wall = time.perf_counter() - self._started
+        self.stopped = True
+        self._done.set()
+    
+    def finish(self) -> None:
+        """Wait for the sampler and diff allocations; blocks, so run it off the loop."""
+        if self._sampler is not None:
+            self._sampler.join()
+        if self.memory:
+            self._memory_end, self._memory_peak = tracemalloc.get_traced_memory()
+            self._diff = _take_snapshot().compare_to(self._snapshot, "lineno")
+            self._snapshot = None
+            _stop_memory()
+    
+    def resume(self) -> None:
+        self._depth += 1
+        if self._depth == 1 and not self.stopped:
+            self._resumed = time.perf_counter()
+            if self.cprofile is not None:
+                self.cprofile.enable()
+    
+    def pause(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and not self.stopped:
+            if self.cprofile is not None:
+                self.cprofile.disable()
+            self.active += time.perf_counter() - self._resumed
+    
+    def _sample(self) -> None:
+        while not self._done.wait(self.interval):
+            if not self._depth:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            codes = []
+            while frame is not None:
+                if frame.f_code is _DRIVER_CODE:
+                    break
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            else:
+                # The task finished its step before the sample was taken
+                continue
+            if codes:
+                self.stacks[tuple(reversed(codes))] += 1
+    
+    def collapsed(self) -> List[Tuple[str, int]]:
+        """Sampled stacks, outermost frame first, with their sample counts."""
+        names: Dict[Any, str] = {}
+        lines = []
+        for codes, count in self.stacks.most_common():
+            frames = []
+            for code in codes:
+                name = names.get(code)
+                if name is None:
+                    name = names[code] = _frame_name(code)
+                frames.append(name)
+            lines.append((";".join(frames), count))
+        return lines
+    
+    def memory_summary(self, top: int) -> Dict[str, Any]:
+        """Memory growth and peak during the task, and the sites that grew most."""
+        grown = [stat for stat in self._diff if stat.size_diff > 0][:top]
+        return {
+            "net_bytes": self._memory_end - self._memory_start,
+            "peak_bytes": max(0, self._memory_peak - self._memory_start),
+            "top": [
+                {
+                    "location": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                    "size_bytes": stat.size_diff,
+                    "count": stat.count_diff
+                }
+                for stat in grown
+            ]
+        }
+
+# Profiles sharing tracemalloc, and whether it was started for them. Profiles
+# start on the event loop and finish in the executor, hence the lock.
+_memory_users = 0
+_memory_owned = False
+_memory_lock = threading.Lock()
+
+def _start_memory() -> int:
+    """Start tracing allocations if no profile is, and return the current size."""
+    global _memory_users, _memory_owned
+    with _memory_lock:
+        if _memory_users == 0:
+            _memory_owned = not tracemalloc.is_tracing()
+            if _memory_owned:
+                tracemalloc.start()
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        _memory_users += 1
+        return tracemalloc.get_traced_memory()[0]
+
+def _stop_memory() -> None:
+    global _memory_users
+    with _memory_lock:
+        _memory_users -= 1
+        if _memory_users == 0 and _memory_owned:
+            tracemalloc.stop()
+
+def _take_snapshot() -> Any:
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+    ])
+
+def _frame_name(code: Any) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+def _short_path(path: str) -> str:
+    """path relative to the sys.path entry containing it, if any."""
+    best = path
+    for entry in sys.path:
+        if entry and path.startswith(entry.rstrip(os.sep) + os.sep):
+            relative = path[len(entry.rstrip(os.sep)) + 1:]
+            if len(relative) < len(best):
+                best = relative
+    return best
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name)[:40] or "task"
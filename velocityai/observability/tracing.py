@@ -0,0 +1,350 @@
+import atexit
+import json
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+# Span statuses, as in OTLP
+UNSET = 0
+OK = 1
+ERROR = 2
+
+class Span:
+    """A timed operation within a trace.
+    
+    Spans are started by a Tracer and exported when ended. Attributes are
+    plain strings, numbers and booleans.
+    """
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+        "attributes", "status", "message", "_tracer"
+    )
+    
+    recording = True
+    
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.status = UNSET
+        self.message: Optional[str] = None
+        self._tracer = tracer
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+    
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+    
+    def set_error(self, message: str) -> None:
+        self.status = ERROR
+        self.message = message
+    
+    def record_exception(self, error: BaseException) -> None:
+        self.set_error(str(error) or type(error).__name__)
+        self.attributes["exception.type"] = type(error).__name__
+    
+    def end(self) -> None:
+        """Finish the span and hand it to the exporter. Later calls do nothing."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self._tracer._export(self)
+    
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end, or to now if still open."""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """The span in OTLP/JSON form."""
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.message:
+            span["status"]["message"] = self.message
+        return span
+    
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, trace={self.trace_id[:8]}, span={self.span_id}, parent={self.parent_id})"
+
+class _NoopSpan:
+    """Stands in for spans that are not sampled; every method does nothing."""
+    __slots__ = ()
+    
+    recording = False
+    name = trace_id = span_id = parent_id = ""
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+    
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+    
+    def set_error(self, message: str) -> None:
+        pass
+    
+    def record_exception(self, error: BaseException) -> None:
+        pass
+    
+    def end(self) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+# The span new spans are parented to. NOOP_SPAN marks an unsampled trace,
+# so its descendants are skipped without sampling again.
+_current_span: ContextVar[Any] = ContextVar("velocityai_current_span", default=None)
+
+def current_span() -> Any:
+    """The active span, NOOP_SPAN inside an unsampled trace, or None."""
+    return _current_span.get()
+
+class SpanExporter:
+    """Receives finished spans."""
+    
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        self.flush()
+
+class InMemoryCollector(SpanExporter):
+    """Keeps finished spans in memory, for tests and interactive use."""
+    
+    def __init__(self, maxlen: Optional[int] = 100000):
+        """
+        Args:
+            maxlen: Most recent spans kept, or None for all
+        """
+        self._spans: Deque[Span] = deque(maxlen=maxlen)
+    
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+    
+    @property
+    def spans(self) -> List[Span]:
+        return list(self._spans)
+    
+    def find(self, name: str) -> List[Span]:
+        return [span for span in self._spans if span.name == name]
+    
+    def traces(self) -> Dict[str, List[Span]]:
+        """Spans grouped by trace ID, each group in start order."""
+        grouped: Dict[str, List[Span]] = {}
+        for span in sorted(self._spans, key=lambda span: span.start_ns):
+            grouped.setdefault(span.trace_id, []).append(span)
+        return grouped
+    
+    def clear(self) -> None:
+        self._spans.clear()
+
+class OTLPJsonFileExporter(SpanExporter):
+    """Appends spans to a file as OTLP/JSON, one export request per line.
+    
+    Spans are buffered and written batch_size at a time, on flush, on close
+    and at interpreter exit. The file can be replayed into an OpenTelemetry
+    collector or read line by line with any JSON parser.
+    """
+    
+    def __init__(self, path: str, batch_size: int = 512, service_name: str = "velocityai"):
+        self.path = path
+        self.batch_size = batch_size
+        self.service_name = service_name
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+    
+    def export(self, span: Span) -> None:
+        self._buffer.append(span)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+            if not spans:
+                return
+            request = {
+                "resourceSpans": [{
+                    "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                    "scopeSpans": [{
+                        "scope": {"name": "velocityai"},
+                        "spans": [span.to_otlp() for span in spans]
+                    }]
+                }]
+            }
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(request) + "\n")
+    
+    def close(self) -> None:
+        self.flush()
+        atexit.unregister(self.flush)
+
+class _Activation:
+    """Makes a span current for a with block and ends it on exit."""
+    __slots__ = ("span", "_token")
+    
+    def __init__(self, span: Any):
+        self.span = span
+    
+    def __enter__(self) -> Any:
+        self._token = _current_span.set(self.span)
+        return self.span
+    
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> bool:
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.span.record_exception(exc)
+        self.span.end()
+        return False
+
+class _NoopActivation:
+    __slots__ = ()
+    
+    def __enter__(self) -> Any:
+        return NOOP_SPAN
+    
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> bool:
+        return False
+
+_NOOP_ACTIVATION = _NoopActivation()
+
+# Parent argument meaning "whatever span is current"
+_CURRENT: Any = object()
+
+class Tracer:
+    """Starts spans and sends finished ones to an exporter.
+    
+    Sampling is decided once per trace, when its root span starts: a
+    sample_rate of 0.01 records one trace in a hundred, and spans of the
+    other traces cost a context variable lookup. Without an exporter the
+    tracer is disabled and every span is a no-op.
+    """
+    
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        sample_rate: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.enabled = exporter is not None and sample_rate > 0
+        self._random = random.Random(seed)
+    
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Any = _CURRENT
+    ) -> Any:
+        """Start a span under parent (the current span by default) without making it current."""
+        if not self.enabled:
+            return NOOP_SPAN
+        if parent is _CURRENT:
+            parent = _current_span.get()
+        if parent is None:
+            if self.sample_rate < 1.0 and self._random.random() >= self.sample_rate:
+                return NOOP_SPAN
+            return Span(self, name, _new_id(128), None, attributes)
+        if not parent.recording:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+    
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+        """Context manager running its block inside a new current span.
+        
+        The span ends when the block exits and records any exception.
+        """
+        if not self.enabled:
+            return _NOOP_ACTIVATION
+        parent = _current_span.get()
+        if parent is not None and not parent.recording:
+            # Already inside an unsampled trace, which stays current
+            return _NOOP_ACTIVATION
+        return _Activation(self.start_span(name, attributes, parent))
+    
+    def activate(self, span: Any) -> Any:
+        """Make span current and return the previous current span.
+        
+        For code that cannot use a with block, such as async generators,
+        which restore the previous span with another call.
+        """
+        if not self.enabled:
+            return None
+        previous = _current_span.get()
+        _current_span.set(span)
+        return previous
+    
+    def flush(self) -> None:
+        if self.exporter is not None:
+            self.exporter.flush()
+    
+    def _export(self, span: Span) -> None:
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+_tracer = Tracer()
+
+def get_tracer() -> Tracer:
+    """The tracer used by agents, LLMs and tools (disabled until configured)."""
+    return _tracer
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Replace the shared tracer and return the previous one."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+def configure_tracing(
+    exporter: Optional[SpanExporter],
+    sample_rate: float = 1.0,
+    seed: Optional[int] = None
+) -> Tracer:
+    """Trace agents, LLM calls and tool calls to exporter, or stop tracing with None."""
+    tracer = Tracer(exporter, sample_rate, seed)
+    set_tracer(tracer)
+    return tracer
+
+def _new_id(bits: int) -> str:
+    return format(random.getrandbits(bits), f"0{bits // 4}x")
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
@@ -1,16 +1,106 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Type, get_type_hints
+from typing import Any, Callable, Dict, Hashable, List, Optional, Type, get_type_hints
 import inspect
 import logging
-from functools import wraps
+import time
+from functools import partial, wraps
+from weakref import WeakKeyDictionary
 
+from velocityai.observability.metrics import REGISTRY
+from velocityai.observability.tracing import get_tracer
+from velocityai.tools.cache import MISSING, ToolCache, default_cache_key, get_tool_cache
+from velocityai.tools.executors import (
+    INLINE, run_coroutine_function, run_in_pool, validate_mode, watch_blocking
+)
 from velocityai.tools.schema import ToolMetadata, ToolParameter, ToolResult
+from velocityai.utils.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Metadata is built once per callable and constructor arguments and shared
+# by every tool instance created with them. Entries go away with their
+# callable, so tools built around short-lived closures do not pile up.
+_metadata_cache: "WeakKeyDictionary[Callable[..., Any], LRUCache[ToolMetadata]]" = WeakKeyDictionary()
+
+TOOL_CALLS = REGISTRY.counter("velocityai_tool_calls_total", "Tool calls, including cached ones.", ("tool",))
+TOOL_FAILURES = REGISTRY.counter("velocityai_tool_failures_total", "Tool calls that failed.", ("tool",))
+TOOL_DURATION = REGISTRY.histogram(
+    "velocityai_tool_duration_seconds", "Time to run a tool call or serve it from the cache.", ("tool",)
+)
+
+def _type_name(hint: Any) -> str:
+    return getattr(hint, "__name__", None) or str(hint).replace("typing.", "")
+
+def _metadata_for(
+    func: Callable[..., Any],
+    name: str,
+    description: str,
+    category: Optional[str],
+    version: Optional[str],
+    author: Optional[str]
+) -> ToolMetadata:
+    key = (name, description, category, version, author)
+    try:
+        variants = _metadata_cache.get(func)
+        if variants is None:
+            variants = _metadata_cache[func] = LRUCache(maxsize=32)
+    except TypeError:
+        # Unhashable or not weakly referenceable: build it every time
+        variants = None
+    else:
+        metadata = variants.get(key)
+        if metadata is not None:
+            return metadata
+    
+    signature = inspect.signature(func)
+    try:
+        type_hints = get_type_hints(func)
+    except Exception:
+        # Unresolvable forward references should not stop tool creation
+        type_hints = {}
+    parameters = []
+    for param_name, param in signature.parameters.items():
+        if param_name == 'self' or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        parameters.append(
+            ToolParameter(
+                name=param_name,
+                type=_type_name(type_hints.get(param_name, Any)),
+                description=None,  # Could be extracted from docstring in future
+                required=param.default == inspect.Parameter.empty,
+                default=None if param.default == inspect.Parameter.empty else param.default
+            )
+        )
+    metadata = ToolMetadata(
+        name=name,
+        description=description,
+        parameters=parameters,
+        return_type=_type_name(type_hints.get('return', Any)),
+        category=category,
+        version=version,
+        author=author
+    )
+    if variants is not None:
+        variants.set(key, metadata)
+    return metadata
+
 class BaseTool(ABC):
     """Base class for all tools in Velocity."""
     
+    # Tools without side effects may be started speculatively by an agent
+    # before the LLM has finished its response
+    side_effect_free: bool = False
+    
+    # How execute runs: "inline" on the event loop, or in the shared
+    # "thread" or "process" pool
+    execution_mode: str = INLINE
+    
+    # Deterministic tools may serve repeat calls from the shared ToolCache.
+    # Only successful results are cached, for cache_ttl seconds (None: until
+    # evicted), under the tool's name, version, identity and cache_key
+    cacheable: bool = False
+    cache_ttl: Optional[float] = None
+    
     def __init__(
         self,
         name: Optional[str] = None,
@@ -19,14 +109,13 @@ class BaseTool(ABC):
         version: Optional[str] = None,
         author: Optional[str] = None
     ):
-        self.metadata = ToolMetadata(
-            name=name or self.__class__.__name__,
-            description=description or self.__doc__ or "No description available",
-            parameters=self._get_parameters(),
-            return_type=self._get_return_type(),
-            category=category,
-            version=version,
-            author=author
+        self.metadata = _metadata_for(
+            self._signature_source(),
+            name or self.__class__.__name__,
+            description or self.__doc__ or "No description available",
+            category,
+            version,
+            author
         )
     
     @abstractmethod
@@ -34,38 +123,76 @@ class BaseTool(ABC):
         """Execute the tool with given parameters."""
         pass
     
-    def _get_parameters(self) -> List[ToolParameter]:
-        """Extract parameters from execute method signature."""
-        signature = inspect.signature(self.execute)
-        type_hints = get_type_hints(self.execute)
-        
-        parameters = []
-        for name, param in signature.parameters.items():
-            if name == 'self' or name == 'kwargs':
-                continue
-                
-            param_type = type_hints.get(name, Any).__name__
-            parameters.append(
-                ToolParameter(
-                    name=name,
-                    type=param_type,
-                    description=None,  # Could be extracted from docstring in future
-                    required=param.default == inspect.Parameter.empty,
-                    default=None if param.default == inspect.Parameter.empty else param.default
-                )
-            )
-        
-        return parameters
+    def _signature_source(self) -> Callable[..., Any]:
+        """Callable whose signature describes the tool's parameters."""
+        return type(self).execute
     
-    def _get_return_type(self) -> str:
-        """Get return type of execute method."""
-        return_hint = get_type_hints(self.execute).get('return', Any)
-        return return_hint.__name__
+    @classmethod
+    def class_metadata(cls, name: Optional[str] = None, category: Optional[str] = None) -> ToolMetadata:
+        """Metadata for the tool class without creating an instance."""
+        return _metadata_for(
+            cls.execute,
+            name or cls.__name__,
+            cls.__doc__ or "No description available",
+            category,
+            None,
+            None
+        )
+    
+    def cache_key(self, **kwargs) -> Hashable:
+        """Key identifying a call's parameters in the tool cache."""
+        return default_cache_key(**kwargs)
+    
+    def _cache_identity(self) -> Hashable:
+        """What tells this tool's cached results apart from other tools with the same name."""
+        return type(self)
     
     async def __call__(self, **kwargs) -> ToolResult:
         """Execute tool and wrap result in ToolResult."""
+        name = self.metadata.name
+        with get_tracer().span("tool.call", {"tool.name": name}) as span:
+            start = time.perf_counter()
+            result = await self._invoke(**kwargs)
+            TOOL_DURATION.labels(name).observe(time.perf_counter() - start)
+            TOOL_CALLS.labels(name).inc()
+            if not result.success:
+                TOOL_FAILURES.labels(name).inc()
+            if span.recording:
+                span.set_attributes({
+                    "tool.execution_mode": self.execution_mode,
+                    "tool.cached": bool(result.metadata.get("cached")),
+                    "tool.success": result.success
+                })
+                if not result.success:
+                    span.set_error(result.error or "Tool failed")
+            return result
+    
+    async def _invoke(self, **kwargs) -> ToolResult:
+        cache: Optional[ToolCache] = None
+        key: Hashable = None
         try:
-            result = await self.execute(**kwargs)
+            if self.cacheable:
+                cache = get_tool_cache()
+                key = cache.key(
+                    self.metadata.name,
+                    self.metadata.version,
+                    self.cache_key(**kwargs),
+                    self._cache_identity()
+                )
+                cached = cache.get(key)
+                if cached is not MISSING:
+                    return ToolResult(
+                        success=True,
+                        result=cached,
+                        metadata={"tool_name": self.metadata.name, "cached": True}
+                    )
+            
+            if self.execution_mode == INLINE:
+                result = await watch_blocking(self.execute(**kwargs), self.metadata.name)
+            else:
+                result = await run_in_pool(self.execution_mode, self._pool_target(), kwargs)
+            if cache is not None:
+                cache.set(key, result, self.cache_ttl)
             return ToolResult(
                 success=True,
                 result=result,
@@ -79,6 +206,10 @@ class BaseTool(ABC):
                 metadata={"tool_name": self.metadata.name}
             )
     
+    def _pool_target(self) -> Callable[..., Any]:
+        """Get the callable run in a worker thread or process."""
+        return partial(run_coroutine_function, self.execute)
+    
     @classmethod
     def from_function(
         cls,
@@ -98,9 +229,26 @@ class FunctionTool(BaseTool):
         func: Callable,
         name: Optional[str] = None,
         description: Optional[str] = None,
+        side_effect_free: Optional[bool] = None,
+        execution_mode: Optional[str] = None,
+        cacheable: Optional[bool] = None,
+        cache_ttl: Optional[float] = None,
+        cache_key: Optional[Callable[..., Hashable]] = None,
         **kwargs
     ):
+        # Options left as None keep the class attributes, so subclasses
+        # can set their own defaults
         self.func = func
+        if side_effect_free is not None:
+            self.side_effect_free = side_effect_free
+        if execution_mode is not None:
+            self.execution_mode = validate_mode(execution_mode)
+        if cacheable is not None:
+            self.cacheable = cacheable
+        if cache_ttl is not None:
+            self.cache_ttl = cache_ttl
+        if cache_key is not None:
+            self.cache_key = cache_key
         super().__init__(
             name=name or func.__name__,
             description=description or func.__doc__ or "No description available",
@@ -111,4 +259,21 @@ class FunctionTool(BaseTool):
         """Execute the wrapped function."""
         if inspect.iscoroutinefunction(self.func):
             return await self.func(**kwargs)
-        return self.func(**kwargs) 
\ No newline at end of file
+        return self.func(**kwargs)
+    
+    def _signature_source(self) -> Callable[..., Any]:
+        return self.func
+    
+    def _cache_identity(self) -> Hashable:
+        try:
+            hash(self.func)
+        except TypeError:
+            # Unhashable callables only share results within this tool
+            return self
+        return type(self), self.func
+    
+    def _pool_target(self) -> Callable[..., Any]:
+        # Hand workers the bare function so process mode only pickles it
+        if inspect.iscoroutinefunction(self.func):
+            return partial(run_coroutine_function, self.func)
+        return self.func 
\ No newline at end of file
@@ -0,0 +1,116 @@
+import copy
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Tuple
+
+from velocityai.observability.metrics import CACHE_REQUESTS
+from velocityai.utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Returned by ToolCache.get when there is no usable entry
+MISSING = object()
+
+# Values of these types are shared as they are; anything else is copied in
+# and out of the cache so callers cannot change what later hits see
+_IMMUTABLE = (str, bytes, int, float, complex, bool, type(None), frozenset)
+
+_HITS = CACHE_REQUESTS.labels("tool", "hit")
+_MISSES = CACHE_REQUESTS.labels("tool", "miss")
+
+def default_cache_key(**kwargs) -> str:
+    """Key tool parameters by their canonical JSON form."""
+    return json.dumps(kwargs, sort_keys=True, default=repr)
+
+def _isolated(value: Any) -> Any:
+    if isinstance(value, _IMMUTABLE):
+        return value
+    return copy.deepcopy(value)
+
+@dataclass
+class ToolCacheStats:
+    """Counters reported by a ToolCache."""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ToolCache:
+    """Bounded cache of successful tool results shared by all tools.
+    
+    Entries are keyed by tool name, tool version, the tool's identity (its
+    class, or the function a FunctionTool wraps) and the tool's cache key
+    for the call, so bumping ``ToolMetadata.version`` stops older results
+    being served; they age out of the LRU on their own. Tools that share a
+    name never see each other's results.
+    
+    Results are deep-copied when stored and when served, so mutating a
+    result never changes what later calls get. Results that cannot be
+    copied are not cached.
+    """
+    
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Maximum number of results kept
+            ttl: Default time to live in seconds for tools without their own
+        """
+        self._entries: LRUCache[Any] = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.stats = ToolCacheStats()
+    
+    @staticmethod
+    def key(
+        name: str,
+        version: Optional[str],
+        call_key: Hashable,
+        identity: Hashable = None
+    ) -> Tuple[str, str, Hashable, Hashable]:
+        return name, version or "", identity, call_key
+    
+    def get(self, key: Hashable) -> Any:
+        """Get a cached result, or MISSING."""
+        value = self._entries.get(key, MISSING)
+        if value is MISSING:
+            self.stats.misses += 1
+            _MISSES.inc()
+        else:
+            self.stats.hits += 1
+            _HITS.inc()
+            value = _isolated(value)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            value = _isolated(value)
+        except Exception as e:
+            logger.debug("Not caching %s result that cannot be copied: %s", key[0], e)
+            return
+        self._entries.set(key, value, ttl)
+        self.stats.stores += 1
+    
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop cached results for one tool, or for every tool."""
+        if name is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries.keys() if key[0] == name]:
+            self._entries.delete(key)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_shared = ToolCache()
+
+def get_tool_cache() -> ToolCache:
+    """Get the cache shared by all cacheable tools."""
+    return _shared
+
+def set_tool_cache(cache: ToolCache) -> None:
+    """Replace the shared tool cache, e.g. to change its size."""
+    global _shared
+    _shared = cache
@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import logging
+import os
+import pickle
+import time
+import types
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+EXECUTION_MODES = (INLINE, THREAD, PROCESS)
+
+# An inline tool holding the event loop longer than this (seconds) is reported
+BLOCKING_THRESHOLD = 0.1
+
+_pools: Dict[str, Executor] = {}
+_pool_sizes: Dict[str, Optional[int]] = {THREAD: None, PROCESS: None}
+_warned: Set[str] = set()
+
+def configure_pools(
+    thread_workers: Optional[int] = None,
+    process_workers: Optional[int] = None
+) -> None:
+    """Set the size of the shared tool pools. Takes effect for pools not yet created."""
+    _pool_sizes[THREAD] = thread_workers
+    _pool_sizes[PROCESS] = process_workers
+
+def get_pool(mode: str) -> Executor:
+    """Get the shared pool for an execution mode, creating it on first use."""
+    pool = _pools.get(mode)
+    if pool is None:
+        if mode == THREAD:
+            workers = _pool_sizes[THREAD] or min(32, (os.cpu_count() or 1) + 4)
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="velocity-tool")
+        elif mode == PROCESS:
+            pool = ProcessPoolExecutor(max_workers=_pool_sizes[PROCESS])
+        else:
+            raise ValueError(f"No pool for execution mode: {mode}")
+        _pools[mode] = pool
+    return pool
+
+def shutdown_pools(wait: bool = True) -> None:
+    """Shut the shared pools down. They are recreated on next use."""
+    for pool in _pools.values():
+        pool.shutdown(wait=wait)
+    _pools.clear()
+
+def validate_mode(mode: str) -> str:
+    if mode not in EXECUTION_MODES:
+        raise ValueError(
+            f"Unknown execution mode {mode!r}; expected one of {', '.join(EXECUTION_MODES)}"
+        )
+    return mode
+
+async def run_in_pool(mode: str, func: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+    """Run a callable in the shared thread or process pool."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_pool(mode), functools.partial(func, **kwargs))
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        # The pool pickles the call off the loop and reports failures as
+        # whichever of these the pickler raised
+        if mode == PROCESS and "pickle" in str(e).lower():
+            raise TypeError(
+                f"Process-mode tools need a picklable function and arguments: {e}"
+            ) from e
+        raise
+
+def run_coroutine_function(func: Callable[..., Any], **kwargs) -> Any:
+    """Run an async callable to completion on a fresh loop in a worker."""
+    return asyncio.run(func(**kwargs))
+
+@types.coroutine
+def _timed_steps(coro: Any, record: Callable[[float], None]) -> Any:
+    """Drive a coroutine, reporting how long each step held the event loop."""
+    steps = coro.__await__()
+    value: Any = None
+    error: Optional[BaseException] = None
+    while True:
+        start = time.perf_counter()
+        try:
+            if error is not None:
+                yielded = steps.throw(error)
+            else:
+                yielded = steps.send(value)
+        except StopIteration as stop:
+            record(time.perf_counter() - start)
+            return stop.value
+        record(time.perf_counter() - start)
+        try:
+            value, error = (yield yielded), None
+        except BaseException as e:
+            value, error = None, e
+
+async def watch_blocking(coro: Any, tool_name: str) -> Any:
+    """Await an inline tool's coroutine, warning once if it blocks the loop."""
+    longest = 0.0
+    
+    def record(duration: float) -> None:
+        nonlocal longest
+        longest = max(longest, duration)
+    
+    try:
+        return await _timed_steps(coro, record)
+    finally:
+        if longest > BLOCKING_THRESHOLD and tool_name not in _warned:
+            _warned.add(tool_name)
+            logger.warning(
+                "Tool %s blocked the event loop for %.3fs; consider "
+                "execution_mode='thread' (I/O) or 'process' (CPU-bound)",
+                tool_name, longest
+            )
@@ -0,0 +1,141 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from velocityai.tools.base import BaseTool
+from velocityai.tools.schema import ToolMetadata
+
+SEARCH_TOOLS_NAME = "search_tools"
+
+# Words too common in tool descriptions to tell tools apart
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or that the this to with "
+    "use used uses using tool tools given returns return".split()
+)
+
+# Name tokens count this many times, so a match on the name outranks one in the prose
+NAME_WEIGHT = 3
+
+_CAMEL = re.compile(r"([a-z0-9])([A-Z])")
+_WORD = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, breaking up camelCase and snake_case."""
+    text = _CAMEL.sub(r"\1 \2", text).lower()
+    return [word for word in _WORD.findall(text) if word not in STOP_WORDS]
+
+def tool_terms(metadata: ToolMetadata) -> List[str]:
+    """Terms indexed for a tool: its name, description, category and parameters."""
+    terms = tokenize(metadata.name) * NAME_WEIGHT + tokenize(metadata.description)
+    if metadata.category:
+        terms += tokenize(metadata.category)
+    for parameter in metadata.parameters:
+        terms += tokenize(parameter.name)
+        if parameter.description:
+            terms += tokenize(parameter.description)
+    return terms
+
+class ToolIndex:
+    """BM25 inverted index over tools, updated one tool at a time.
+    
+    Only term frequencies and document lengths are stored; collection
+    statistics are computed at query time, so adding or removing a tool
+    never requires a rebuild.
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+        self._items: Dict[str, Any] = {}
+    
+    def add(self, name: str, terms: List[str], item: Any = None) -> None:
+        """Index a tool under its name, replacing any earlier entry."""
+        if name in self._lengths:
+            self.remove(name)
+        counts = Counter(terms)
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[name] = count
+        self._terms[name] = list(counts)
+        self._lengths[name] = len(terms)
+        self._total_length += len(terms)
+        self._items[name] = item if item is not None else name
+    
+    def add_tool(self, tool: BaseTool) -> None:
+        """Index a tool instance by its metadata."""
+        self.add(tool.metadata.name, tool_terms(tool.metadata), tool)
+    
+    def remove(self, name: str) -> None:
+        length = self._lengths.pop(name, None)
+        if length is None:
+            return
+        self._total_length -= length
+        self._items.pop(name, None)
+        for term in self._terms.pop(name):
+            postings = self._postings[term]
+            del postings[name]
+            if not postings:
+                del self._postings[term]
+    
+    def copy(self) -> "ToolIndex":
+        """Independent copy, to extend without re-tokenizing the tools already indexed."""
+        copied = ToolIndex(self.k1, self.b)
+        copied._postings = {term: dict(postings) for term, postings in self._postings.items()}
+        copied._lengths = dict(self._lengths)
+        # Term lists are replaced, never changed in place, so they can be shared
+        copied._terms = dict(self._terms)
+        copied._total_length = self._total_length
+        copied._items = dict(self._items)
+        return copied
+    
+    def clear(self) -> None:
+        self._postings.clear()
+        self._lengths.clear()
+        self._terms.clear()
+        self._items.clear()
+        self._total_length = 0
+    
+    def search(self, query: str, k: int = 10) -> List[Tuple[Any, float]]:
+        """Get up to k indexed items matching the query, best first, with scores."""
+        count = len(self._lengths)
+        if not count:
+            return []
+        average = self._total_length / count
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for name, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[name] / average)
+                scores[name] = scores.get(name, 0.0) + (
+                    idf * frequency * (self.k1 + 1) / (frequency + norm)
+                )
+        ranked = sorted(scores.items(), key=lambda entry: -entry[1])[:k]
+        return [(self._items[name], score) for name, score in ranked]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._lengths
+    
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+class SearchToolsTool(BaseTool):
+    """Search for more tools by what you need them to do. Returns matching tool names and descriptions."""
+    
+    side_effect_free = True
+    
+    def __init__(self, index: ToolIndex):
+        self.index = index
+        super().__init__(name=SEARCH_TOOLS_NAME)
+    
+    async def execute(self, query: str, limit: int = 5) -> str:
+        matches = self.index.search(query, limit)
+        if not matches:
+            return "No matching tools."
+        return "\n".join(tool.metadata.prompt_line for tool, _ in matches)
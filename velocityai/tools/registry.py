@@ -1,5 +1,6 @@
-from typing import Dict, List, Optional, Type
+from typing import Callable, Dict, Hashable, List, Optional, Type
 from velocityai.tools.base import BaseTool
+from velocityai.tools.index import ToolIndex, tool_terms
 
 class ToolRegistry:
     """Registry for managing and discovering tools."""
@@ -7,6 +8,8 @@ class ToolRegistry:
     _instance = None
     _tools: Dict[str, Type[BaseTool]] = {}
     _categories: Dict[str, List[str]] = {}
+    # Kept up to date as tools register, for search()
+    _index = ToolIndex()
     
     def __new__(cls):
         if cls._instance is None:
@@ -23,6 +26,7 @@ class ToolRegistry:
         """Register a tool class."""
         tool_name = name or tool_cls.__name__
         cls._tools[tool_name] = tool_cls
+        cls._index.add(tool_name, tool_terms(tool_cls.class_metadata(tool_name, category)))
         
         if category:
             if category not in cls._categories:
@@ -34,6 +38,11 @@ class ToolRegistry:
         """Get a tool class by name."""
         return cls._tools.get(name)
     
+    @classmethod
+    def search(cls, query: str, k: int = 10) -> List[str]:
+        """Get the names of up to k registered tools most relevant to a query."""
+        return [name for name, _ in cls._index.search(query, k)]
+    
     @classmethod
     def list_tools(cls) -> List[str]:
         """List all registered tools."""
@@ -54,11 +63,28 @@ class ToolRegistry:
         """Clear all registered tools."""
         cls._tools.clear()
         cls._categories.clear()
+        cls._index.clear()
 
 # Decorator for registering tools
-def register_tool(name: Optional[str] = None, category: Optional[str] = None):
-    """Decorator to register a tool class."""
+def register_tool(
+    name: Optional[str] = None,
+    category: Optional[str] = None,
+    cacheable: Optional[bool] = None,
+    cache_ttl: Optional[float] = None,
+    cache_key: Optional[Callable[..., Hashable]] = None
+):
+    """Decorator to register a tool class.
+    
+    ``cacheable``, ``cache_ttl`` and ``cache_key`` (called with the call's
+    parameters) override the class's result caching settings.
+    """
     def decorator(cls: Type[BaseTool]) -> Type[BaseTool]:
+        if cacheable is not None:
+            cls.cacheable = cacheable
+        if cache_ttl is not None:
+            cls.cache_ttl = cache_ttl
+        if cache_key is not None:
+            cls.cache_key = lambda self, **kwargs: cache_key(**kwargs)
         ToolRegistry.register(cls, name=name, category=category)
         return cls
     return decorator 
\ No newline at end of file
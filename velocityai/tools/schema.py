@@ -1,16 +1,42 @@
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+import json
+from pydantic import BaseModel, ConfigDict, Field
+
+from velocityai.utils.serialization import dumps
+
+# JSON schema types for the Python type names recorded in ToolParameter.type
+JSON_TYPES = {
+    "str": "string",
+    "int": "integer",
+    "float": "number",
+    "bool": "boolean",
+    "list": "array",
+    "dict": "object"
+}
 
 class ToolParameter(BaseModel):
     """Schema for tool parameter definition."""
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(..., description="Name of the parameter")
     type: str = Field(..., description="Type of the parameter")
     description: Optional[str] = Field(None, description="Description of the parameter")
     required: bool = Field(True, description="Whether the parameter is required")
     default: Optional[Any] = Field(None, description="Default value for the parameter")
 
+# ToolMetadata properties rendered on first use and dropped by model_copy
+_RENDERED = ("prompt_line", "json_schema", "schema_json")
+
 class ToolMetadata(BaseModel):
-    """Schema for tool metadata."""
+    """Schema for tool metadata.
+    
+    Frozen and hashable, since tools built from the same class or function
+    share one instance. Prompt and schema fragments are rendered on first
+    use; ``model_copy`` renders them again for the copy.
+    """
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(..., description="Name of the tool")
     description: str = Field(..., description="Description of what the tool does")
     parameters: List[ToolParameter] = Field(default_factory=list, description="Parameters accepted by the tool")
@@ -18,10 +44,110 @@ class ToolMetadata(BaseModel):
     category: Optional[str] = Field(None, description="Category of the tool (e.g., 'IO', 'Math', 'API')")
     version: Optional[str] = Field(None, description="Version of the tool")
     author: Optional[str] = Field(None, description="Author of the tool")
+    
+    def __hash__(self) -> int:
+        # Parameters hold lists and arbitrary defaults, so only their names
+        # are hashed; equal metadata still hashes equally
+        return hash((
+            self.name,
+            self.description,
+            tuple(parameter.name for parameter in self.parameters),
+            self.return_type,
+            self.category,
+            self.version,
+            self.author
+        ))
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "ToolMetadata":
+        copied = super().model_copy(update=update, deep=deep)
+        for name in _RENDERED:
+            copied.__dict__.pop(name, None)
+        return copied
+    
+    @cached_property
+    def prompt_line(self) -> str:
+        """The tool's entry in a prompt's tool list."""
+        return f"- {self.name}: {self.description}"
+    
+    @cached_property
+    def json_schema(self) -> Dict[str, Any]:
+        """Function-calling style JSON schema for the tool."""
+        properties: Dict[str, Any] = {}
+        for parameter in self.parameters:
+            prop: Dict[str, Any] = {}
+            if parameter.type in JSON_TYPES:
+                prop["type"] = JSON_TYPES[parameter.type]
+            if parameter.description:
+                prop["description"] = parameter.description
+            if not parameter.required and parameter.default is not None:
+                prop["default"] = parameter.default
+            properties[parameter.name] = prop
+        return {
+            "name": self.name,
+            "description": self.description,
+            "parameters": {
+                "type": "object",
+                "properties": properties,
+                "required": [p.name for p in self.parameters if p.required]
+            }
+        }
+    
+    @cached_property
+    def schema_json(self) -> str:
+        """``json_schema`` serialized once."""
+        return json.dumps(self.json_schema, default=str)
 
-class ToolResult(BaseModel):
-    """Schema for tool execution result."""
+class ToolResultModel(BaseModel):
+    """Schema for tool execution result, used to validate external data."""
     success: bool = Field(..., description="Whether the tool execution was successful")
     result: Optional[Any] = Field(None, description="Result of the tool execution")
     error: Optional[str] = Field(None, description="Error message if execution failed")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata about the execution") 
\ No newline at end of file
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata about the execution")
+
+class ToolResult:
+    """Tool execution result.
+    
+    A slotted object rather than a pydantic model since one is built for
+    every tool call. Data from outside is validated by ``model_validate``;
+    ``model_dump`` and ``model_dump_json`` mirror the pydantic API.
+    """
+    __slots__ = ("success", "result", "error", "metadata")
+    
+    def __init__(
+        self,
+        success: bool,
+        result: Optional[Any] = None,
+        error: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.success = success
+        self.result = result
+        self.error = error
+        self.metadata = metadata if metadata is not None else {}
+    
+    @classmethod
+    def model_validate(cls, data: Any) -> "ToolResult":
+        model = ToolResultModel.model_validate(data)
+        return cls(model.success, model.result, model.error, model.metadata)
+    
+    def model_dump(self) -> Dict[str, Any]:
+        return {
+            "success": self.success,
+            "result": self.result,
+            "error": self.error,
+            "metadata": self.metadata
+        }
+    
+    def model_dump_json(self) -> str:
+        return dumps(self.model_dump())
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ToolResult):
+            return NotImplemented
+        return self.model_dump() == other.model_dump()
+    
+    def __repr__(self) -> str:
+        return (
+            f"ToolResult(success={self.success!r}, result={self.result!r}, "
+            f"error={self.error!r}, metadata={self.metadata!r})"
+        )
@@ -0,0 +1,137 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from velocityai.tools.base import BaseTool
+from velocityai.tools.index import SearchToolsTool, ToolIndex
+from velocityai.utils.serialization import dumps
+
+class ToolSet:
+    """Immutable, hashable collection of tools that tasks can share.
+    
+    The name map is built once; the prompt section, schema JSON and search
+    index are built on first use and then reused by every task holding the
+    set. ``add`` returns a new set and leaves this one untouched; if this
+    set's index is built, the new set's index is a copy with just the new
+    tool added. When two tools share a name, the first one wins, as with a
+    list lookup, both in ``get`` and in the index.
+    """
+    __slots__ = ("_tools", "_by_name", "_hash", "_prompt", "_schema_json", "_index", "_search_tool")
+    
+    def __init__(self, tools: Iterable[BaseTool] = ()):
+        self._tools: Tuple[BaseTool, ...] = tuple(tools)
+        self._by_name: Dict[str, BaseTool] = {}
+        for tool in self._tools:
+            self._by_name.setdefault(tool.metadata.name, tool)
+        self._hash: Optional[int] = None
+        self._prompt: Optional[str] = None
+        self._schema_json: Optional[str] = None
+        self._index: Optional[ToolIndex] = None
+        self._search_tool: Optional[SearchToolsTool] = None
+    
+    @classmethod
+    def of(cls, tools: Optional[Iterable[BaseTool]]) -> "ToolSet":
+        """Use a ToolSet as is, or build one from any iterable of tools."""
+        if isinstance(tools, ToolSet):
+            return tools
+        return cls(tools or ())
+    
+    def get(self, name: str) -> Optional[BaseTool]:
+        return self._by_name.get(name)
+    
+    def add(self, tool: BaseTool) -> "ToolSet":
+        """Return a new set with the tool appended."""
+        added = ToolSet.__new__(ToolSet)
+        added._tools = self._tools + (tool,)
+        added._by_name = self._by_name
+        added._hash = None
+        added._prompt = None
+        added._schema_json = None
+        added._index = None
+        added._search_tool = None
+        if tool.metadata.name in self._by_name:
+            # Shadowed by the earlier tool, so lookups and search are unchanged
+            added._index = self._index
+            added._search_tool = self._search_tool
+        else:
+            added._by_name = dict(self._by_name)
+            added._by_name[tool.metadata.name] = tool
+            if self._index is not None:
+                added._index = self._index.copy()
+                added._index.add_tool(tool)
+        return added
+    
+    @property
+    def prompt(self) -> str:
+        """The tool list as rendered in prompts."""
+        if self._prompt is None:
+            self._prompt = "\n".join(tool.metadata.prompt_line for tool in self._tools)
+        return self._prompt
+    
+    @property
+    def schema_json(self) -> str:
+        """JSON schemas of all tools, serialized once."""
+        if self._schema_json is None:
+            self._schema_json = dumps([tool.metadata.json_schema for tool in self._tools])
+        return self._schema_json
+    
+    @property
+    def index(self) -> ToolIndex:
+        """BM25 index over the tools, built on first use."""
+        if self._index is None:
+            index = ToolIndex()
+            for tool in self._by_name.values():
+                index.add_tool(tool)
+            self._index = index
+        return self._index
+    
+    @property
+    def search_tool(self) -> SearchToolsTool:
+        """Meta-tool letting the model find tools left out of the prompt."""
+        if self._search_tool is None:
+            self._search_tool = SearchToolsTool(self.index)
+        return self._search_tool
+    
+    def select(self, query: str, limit: Optional[int] = None) -> "ToolSet":
+        """Get up to limit tools ranked by relevance to the query, or this set if all fit."""
+        if limit is None or len(self._tools) <= limit:
+            return self
+        ranked = [tool for tool, _ in self.index.search(query, limit)]
+        # Fill up with unranked tools in their listed order
+        chosen = {id(tool) for tool in ranked}
+        for tool in self._tools:
+            if len(ranked) >= limit:
+                break
+            if id(tool) not in chosen:
+                ranked.append(tool)
+        return ToolSet(ranked)
+    
+    def names(self) -> List[str]:
+        return [tool.metadata.name for tool in self._tools]
+    
+    def __iter__(self) -> Iterator[BaseTool]:
+        return iter(self._tools)
+    
+    def __len__(self) -> int:
+        return len(self._tools)
+    
+    def __getitem__(self, position: int) -> BaseTool:
+        return self._tools[position]
+    
+    def __contains__(self, item: Any) -> bool:
+        if isinstance(item, str):
+            return item in self._by_name
+        return any(tool is item for tool in self._tools)
+    
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(id(tool) for tool in self._tools))
+        return self._hash
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ToolSet):
+            return NotImplemented
+        return len(self._tools) == len(other._tools) and all(
+            a is b for a, b in zip(self._tools, other._tools)
+        )
+    
+    def __repr__(self) -> str:
+        return f"ToolSet({[tool.metadata.name for tool in self._tools]!r})"
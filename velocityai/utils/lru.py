@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+class LRUCache(Generic[V]):
+    """Bounded least-recently-used cache with optional per-entry expiry."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Default time to live in seconds, or None for no expiry
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[V, Optional[float]]]" = OrderedDict()
+        
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, refreshing its recency. Expired entries count as missing."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        self._data.pop(key, None)
+        
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+        
+    def keys(self) -> List[Hashable]:
+        """Snapshot of the keys, least recently used first (may include expired)."""
+        return list(self._data)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,32 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize to JSON, using orjson when it is installed.
+    
+    Values JSON cannot represent are serialized with ``str``.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits; the standard library copes
+            pass
+    return json.dumps(obj, sort_keys=sort_keys, default=str)
+
+def loads(text: str) -> Any:
+    """Parse JSON, using orjson when it is installed.
+    
+    Raises json.JSONDecodeError (which orjson's error subclasses) on bad input.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
@@ -0,0 +1,49 @@
+import random
+from typing import Dict, List, Optional, Sequence
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Get the q-th percentile (0-100) of already sorted values by linear interpolation."""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return float(sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction)
+
+class Reservoir:
+    """Fixed-size uniform sample of a stream of values.
+    
+    Keeps memory constant however many values are added while still giving
+    unbiased percentile estimates.
+    """
+    
+    def __init__(self, size: int = 10000, seed: Optional[int] = None):
+        if size < 1:
+            raise ValueError("Reservoir size must be at least 1")
+        self.size = size
+        self.count = 0
+        self._values: List[float] = []
+        self._random = random.Random(seed)
+        
+    def add(self, value: float) -> None:
+        """Add a value to the sample."""
+        self.count += 1
+        if len(self._values) < self.size:
+            self._values.append(value)
+            return
+        slot = self._random.randrange(self.count)
+        if slot < self.size:
+            self._values[slot] = value
+            
+    def percentiles(self, *qs: float) -> Dict[float, float]:
+        """Get several percentiles of the sampled values at once."""
+        ordered = sorted(self._values)
+        return {q: percentile(ordered, q) for q in qs}
+    
+    def clear(self) -> None:
+        """Drop all sampled values."""
+        self.count = 0
+        self._values.clear()
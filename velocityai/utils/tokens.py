@@ -0,0 +1,15 @@
+from typing import Dict, Iterable
+
+# Average characters per token for English text with common LLM tokenizers
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """Cheaply estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def estimate_message_tokens(messages: Iterable[Dict[str, str]]) -> int:
+    """Estimate the number of prompt tokens a list of chat messages costs."""
+    # A few tokens of framing per message for the role and separators
+    return sum(estimate_tokens(message["content"]) + 4 for message in messages)